@@ -1,11 +1,28 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .routes import router as api_router
+from ..core.utils import shutdown_executor
+from ..core.metrics_tracker import metrics_tracker
+from ..core.paperless_tasks import task_poller
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Resolve Paperless tasks left outstanding by previous runs
+    task_poller.start()
+    yield
+    task_poller.stop()
+    # Let in-flight blocking jobs finish before the process exits
+    shutdown_executor(wait=True)
+    metrics_tracker.close()
+
 
 app = FastAPI(
     title="arXiv Importer Platform",
     description="Import and manage scientific papers via arXiv.",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # (Optional) CORS if frontend is on different domain/port during dev
@@ -1,15 +1,25 @@
-from fastapi import APIRouter, HTTPException, Query
+import json
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response, StreamingResponse
 from datetime import date
-from ..core import import_manager, search_manager
+from typing import List, Literal, Optional, get_args
+from ..core import arxiv_client, import_manager, search_manager
 from ..core.keyword_manager import keyword_manager
 from ..core.paperless_integration import paperless_integration
 from ..core.metrics_tracker import metrics_tracker
+from ..core.paperless_tasks import task_poller
+from ..core.response_cache import response_cache, make_etag, etag_matches
+from ..core.utils import run_blocking
 from ..api.schemas.import_models import (
     ImportRequest, ImportResponse,
     SearchRequest, SearchResponse,
     PaperlessUploadRequest, PaperlessUploadResponse,
+    PaperlessBatchUploadRequest, PaperlessBatchUploadResponse,
     KeywordExtractionRequest, KeywordExtractionResponse,
-    KeywordValidationRequest, KeywordValidationResponse
+    KeywordValidationRequest, KeywordValidationResponse,
+    KeywordCacheInvalidationRequest, KeywordCacheInvalidationResponse,
+    BatchKeywordExtractionRequest, BatchKeywordExtractionResponse
 )
 
 router = APIRouter()
@@ -22,7 +32,8 @@ async def import_papers(payload: ImportRequest):
     """
     metadata = [m.model_dump()
                 for m in payload.metadata] if payload.metadata else []
-    results = import_manager.import_ids_or_urls(payload.inputs, metadata)
+    results = await run_blocking(
+        import_manager.import_ids_or_urls, payload.inputs, metadata)
 
     # Track successful imports
     for result in results:
@@ -41,7 +52,8 @@ async def search_papers(payload: SearchRequest):
     Search arXiv by query and return multiple matching papers, enriched with shared metadata.
     """
     metadata = payload.metadata.model_dump() if payload.metadata else {}
-    results = search_manager.search_with_metadata(
+    results = await run_blocking(
+        search_manager.search_with_metadata,
         query=payload.query,
         sort_by=payload.sort_by,
         max_results=payload.max_results,
@@ -50,6 +62,50 @@ async def search_papers(payload: SearchRequest):
     return {"results": results}
 
 
+@router.post("/search/stream")
+async def search_papers_stream(payload: SearchRequest, request: Request):
+    """
+    Stream search results as they arrive from arXiv.
+    Sends NDJSON by default, or server-sent events when the client accepts text/event-stream.
+    Stops paging arXiv as soon as the client disconnects.
+    """
+    metadata = payload.metadata.model_dump() if payload.metadata else {}
+    use_sse = "text/event-stream" in request.headers.get("accept", "")
+    results = search_manager.iter_search_with_metadata(
+        query=payload.query,
+        sort_by=payload.sort_by,
+        max_results=payload.max_results,
+        metadata=metadata
+    )
+
+    def encode(item):
+        line = json.dumps(item, default=str)
+        return f"data: {line}\n\n" if use_sse else f"{line}\n"
+
+    async def stream():
+        done = object()
+        try:
+            while not await request.is_disconnected():
+                # Each next() may fetch a new arXiv page, so keep it off the event loop
+                item = await run_blocking(next, results, done)
+                if item is done:
+                    break
+                yield encode(item)
+            if use_sse:
+                yield "event: end\ndata: {}\n\n"
+        except Exception as e:
+            yield encode({"error": f"Search failed: {str(e)}"})
+        finally:
+            try:
+                results.close()
+            except ValueError:
+                # A page fetch is still running; the generator is dropped without further paging
+                pass
+
+    media_type = "text/event-stream" if use_sse else "application/x-ndjson"
+    return StreamingResponse(stream(), media_type=media_type)
+
+
 @router.post("/paperless/upload", response_model=PaperlessUploadResponse)
 async def upload_to_paperless(payload: PaperlessUploadRequest):
     """
@@ -74,6 +130,8 @@ async def upload_to_paperless(payload: PaperlessUploadRequest):
             )
         )
 
+        task_poller.notify()
+
         return {"task_id": task_id, "status": "queued"}
     except Exception as e:
         # Track failed upload
@@ -92,13 +150,50 @@ async def upload_to_paperless(payload: PaperlessUploadRequest):
             status_code=500, detail=f"Failed to upload to Paperless: {str(e)}")
 
 
+@router.post("/paperless/upload/batch", response_model=PaperlessBatchUploadResponse)
+async def upload_batch_to_paperless(payload: PaperlessBatchUploadRequest):
+    """
+    Upload several papers to Paperless-ngx, downloading and uploading concurrently.
+    Returns a task ID or an error for each paper, in request order.
+    """
+    try:
+        results = await paperless_integration.upload_papers_to_paperless(
+            [(item.paper, item.metadata) for item in payload.papers]
+        )
+
+        # Track each upload
+        from ..core.metrics_tracker import PaperlessUpload
+        from datetime import datetime
+        for item, result in zip(payload.papers, results):
+            succeeded = result["task_id"] is not None
+            metrics_tracker.track_paperless_upload(
+                PaperlessUpload(
+                    timestamp=datetime.now().isoformat(),
+                    paper_title=item.paper.title,
+                    task_id=result["task_id"] or "",
+                    status="success" if succeeded else "error",
+                    metadata=(item.metadata.model_dump() if item.metadata else {})
+                    if succeeded else {"error": result["error"]}
+                )
+            )
+
+        queued = sum(1 for result in results if result["task_id"] is not None)
+        if queued:
+            task_poller.notify()
+        return {"results": results, "queued": queued, "failed": len(results) - queued}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to upload batch to Paperless: {str(e)}")
+
+
 @router.post("/keywords/extract", response_model=KeywordExtractionResponse)
 async def extract_keywords(payload: KeywordExtractionRequest):
     """
     Extract keywords from paper data using AI and statistical methods.
     """
     try:
-        result = keyword_manager.suggest_keywords_for_paper(payload.paper_data)
+        result = await run_blocking(
+            keyword_manager.suggest_keywords_for_paper, payload.paper_data)
 
         # Track keyword extraction
         from ..core.metrics_tracker import KeywordExtraction
@@ -129,6 +224,51 @@ async def extract_keywords(payload: KeywordExtractionRequest):
             status_code=500, detail=f"Failed to extract keywords: {str(e)}")
 
 
+@router.post("/keywords/extract/batch", response_model=BatchKeywordExtractionResponse)
+async def extract_keywords_batch(payload: BatchKeywordExtractionRequest):
+    """
+    Extract keywords for many papers at once, packing several papers into each AI request.
+    """
+    try:
+        results = await run_blocking(
+            keyword_manager.suggest_keywords_for_papers, payload.papers)
+
+        # Track all extractions together
+        from ..core.metrics_tracker import KeywordExtraction
+        from datetime import datetime
+        now = datetime.now().isoformat()
+        metrics_tracker.track_keyword_extractions([
+            KeywordExtraction(
+                timestamp=now,
+                paper_title=paper.title,
+                primary_keywords=result.primary_keywords,
+                secondary_keywords=result.secondary_keywords,
+                technical_terms=result.technical_terms,
+                domain_tags=result.domain_tags,
+                confidence_score=result.confidence_score,
+                extraction_method=result.extraction_method
+            ) for paper, result in zip(payload.papers, results)
+        ])
+
+        return {
+            "results": [
+                {
+                    "paper_id": paper.id,
+                    "title": paper.title,
+                    "primary_keywords": result.primary_keywords,
+                    "secondary_keywords": result.secondary_keywords,
+                    "technical_terms": result.technical_terms,
+                    "domain_tags": result.domain_tags,
+                    "confidence_score": result.confidence_score,
+                    "extraction_method": result.extraction_method
+                } for paper, result in zip(payload.papers, results)
+            ]
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to extract keywords: {str(e)}")
+
+
 @router.post("/keywords/validate", response_model=KeywordValidationResponse)
 async def validate_keywords(payload: KeywordValidationRequest):
     """
@@ -147,6 +287,20 @@ async def validate_keywords(payload: KeywordValidationRequest):
             status_code=500, detail=f"Failed to validate keywords: {str(e)}")
 
 
+@router.post("/keywords/cache/invalidate", response_model=KeywordCacheInvalidationResponse)
+async def invalidate_keyword_cache(payload: KeywordCacheInvalidationRequest):
+    """
+    Drop cached AI keyword extractions for one paper, or all of them.
+    """
+    try:
+        invalidated = await run_blocking(
+            keyword_manager.invalidate_cached_keywords, payload.paper_data)
+        return {"invalidated": invalidated}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to invalidate keyword cache: {str(e)}")
+
+
 @router.get("/keywords/domains")
 async def get_available_domains():
     """
@@ -158,64 +312,194 @@ async def get_available_domains():
     }
 
 
+@router.get("/keywords/search")
+async def search_keywords(
+    request: Request,
+    keywords: Optional[str] = Query(
+        None, description="Comma-separated keywords, matched exactly against the primary keywords"),
+    match: Literal["all", "any"] = Query(
+        "all", description="Require all keywords (AND) or any of them (OR)"),
+    title: Optional[str] = Query(
+        None, min_length=3, description="Case-insensitive substring of the paper title"),
+    domains: Optional[str] = Query(
+        None, description="Comma-separated domain tags that must all be present"),
+    start_date: Optional[str] = Query(None, description="Start date in YYYY-MM-DD format"),
+    end_date: Optional[str] = Query(None, description="End date in YYYY-MM-DD format"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=200, description="Results per page")
+):
+    """
+    Search stored keyword extractions, newest first.
+    Results are keyset-paginated: pass next_cursor back to get the following page.
+    """
+    keyword_list = _parse_fields(keywords)
+    domain_list = _parse_fields(domains)
+    if not (keyword_list or domain_list or title):
+        raise HTTPException(
+            status_code=400, detail="Provide keywords, domains or title to search")
+    try:
+        start_parsed = date.fromisoformat(start_date) if start_date else None
+        end_parsed = date.fromisoformat(end_date) if end_date else None
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    if start_parsed and end_parsed and start_parsed > end_parsed:
+        raise HTTPException(
+            status_code=400, detail="Start date must be before end date")
+
+    try:
+        results = await _cached(
+            ("keyword_search", tuple(keyword_list or ()), match, title, tuple(domain_list or ()),
+             start_parsed, end_parsed, cursor, limit),
+            metrics_tracker.search_keyword_extractions,
+            keyword_list, match, title, domain_list, start_parsed, end_parsed, limit, cursor)
+        return _json_response(request, results)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to search keywords: {str(e)}")
+
+
+# ---------- Response Caching ----------
+
+async def _cached(key: tuple, func, *args):
+    """
+    Return func(*args) from the response cache, computing it on the executor on a miss.
+    Entries are tied to the metrics data version (and today's date, which
+    moves the dashboard windows), so any newly written event invalidates them.
+    """
+    version = metrics_tracker.data_version
+    key = (*key, date.today().isoformat())
+    payload = response_cache.get(key, version)
+    if payload is None:
+        payload = await run_blocking(func, *args)
+        response_cache.set(key, version, payload)
+    return payload
+
+
+def _json_response(request: Request, payload) -> Response:
+    """Serialize a payload with an ETag, answering 304 if the client already has this version"""
+    body = json.dumps(jsonable_encoder(payload), separators=(",", ":")).encode("utf-8")
+    etag = make_etag(body)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 # ---------- Dashboard Analytics Endpoints ----------
 
 @router.get("/dashboard/stats")
-async def get_dashboard_stats():
+async def get_dashboard_stats(request: Request):
     """
     Get comprehensive dashboard statistics and analytics.
     """
     try:
-        # Get real metrics from metrics tracker
-        stats = metrics_tracker.get_dashboard_stats()
-        return stats
+        # Get real metrics from metrics tracker; live counters are under /dashboard/runtime
+        # so they do not change the ETag on every poll
+        stats = await _cached(("dashboard_stats",), metrics_tracker.get_dashboard_stats)
+        return _json_response(request, stats)
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to get dashboard stats: {str(e)}")
 
 
+@router.get("/dashboard/runtime")
+async def get_runtime_stats():
+    """
+    Get the in-process counters (metrics writer, caches, Paperless task poller).
+    They move with every poll, so this endpoint is neither cached nor ETag'd.
+    """
+    return {
+        "metrics_writer": metrics_tracker.get_writer_stats(),
+        "keyword_cache": keyword_manager.get_cache_stats(),
+        "arxiv_cache": arxiv_client.query_cache.get_stats(),
+        "paperless_registry": paperless_integration.registry.get_stats(),
+        "paperless_tasks": task_poller.get_stats(),
+        "response_cache": response_cache.get_stats(),
+    }
+
+
 @router.get("/dashboard/analytics")
-async def get_dashboard_analytics():
+async def get_dashboard_analytics(request: Request):
     """
     Get detailed analytics for the dashboard.
     """
     try:
         # Get real analytics from metrics tracker
-        analytics = metrics_tracker.get_dashboard_analytics()
-        return analytics
+        analytics = await _cached(("dashboard_analytics",), metrics_tracker.get_dashboard_analytics)
+        return _json_response(request, analytics)
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to get analytics: {str(e)}")
 
 
+@router.get("/dashboard/trends")
+async def get_import_trends(
+    request: Request,
+    granularity: Literal["daily", "weekly", "monthly"] = Query(
+        "daily", description="Bucket size"),
+    start_date: Optional[str] = Query(
+        None, description="Start date in YYYY-MM-DD format (defaults to the last 30 days, 12 weeks or 12 months)"),
+    end_date: Optional[str] = Query(
+        None, description="End date in YYYY-MM-DD format (defaults to today)")
+):
+    """
+    Get imports, uploads and keyword extractions per day, week or month.
+    """
+    try:
+        start_parsed = date.fromisoformat(start_date) if start_date else None
+        end_parsed = date.fromisoformat(end_date) if end_date else None
+        trends = await _cached(
+            ("dashboard_trends", granularity, start_parsed, end_parsed),
+            metrics_tracker.get_import_trends, granularity, start_parsed, end_parsed)
+        return _json_response(request, {"granularity": granularity, "buckets": trends})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to get import trends: {str(e)}")
+
+
 # ---------- Document History Endpoints ----------
 
 @router.get("/history/dates")
-async def get_available_dates():
+async def get_available_dates(request: Request):
     """
     Get list of dates that have activity data.
     """
     try:
-        dates = metrics_tracker.get_available_dates()
-        return {"dates": dates}
+        dates = await _cached(("history_dates",), metrics_tracker.get_available_dates)
+        return _json_response(request, {"dates": dates})
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to get available dates: {str(e)}")
 
 
 @router.get("/history/date/{target_date}")
-async def get_document_history_by_date(target_date: str):
+async def get_document_history_by_date(
+    target_date: str,
+    request: Request,
+    limit: Optional[int] = Query(
+        None, ge=1, le=1000, description="Return only the first page of each list, with next_cursors")
+):
     """
     Get all documents processed on a specific date.
+    With limit, continue each list through /history/page using its next cursor.
     """
     try:
         # Parse date string
         parsed_date = date.fromisoformat(target_date)
-        history = metrics_tracker.get_document_history_by_date(parsed_date)
-        return history
     except ValueError:
         raise HTTPException(
             status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    try:
+        history = await _cached(
+            ("history_date", parsed_date, limit),
+            metrics_tracker.get_document_history_by_date, parsed_date, limit)
+        return _json_response(request, history)
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to get document history: {str(e)}")
@@ -223,12 +507,16 @@ async def get_document_history_by_date(target_date: str):
 
 @router.get("/history/range")
 async def get_document_summary_by_range(
+    request: Request,
     start_date: str = Query(...,
                             description="Start date in YYYY-MM-DD format"),
-    end_date: str = Query(..., description="End date in YYYY-MM-DD format")
+    end_date: str = Query(..., description="End date in YYYY-MM-DD format"),
+    papers_limit: Optional[int] = Query(
+        None, ge=1, le=1000, description="Maximum number of unique papers to return")
 ):
     """
     Get summary of documents processed in a date range.
+    Individual events are available page by page from /history/page and /history/stream.
     """
     try:
         # Parse date strings
@@ -239,12 +527,116 @@ async def get_document_summary_by_range(
             raise HTTPException(
                 status_code=400, detail="Start date must be before end date")
 
-        summary = metrics_tracker.get_document_summary_by_date_range(
-            start_parsed, end_parsed)
-        return summary
+        summary = await _cached(
+            ("history_range", start_parsed, end_parsed, papers_limit),
+            metrics_tracker.get_document_summary_by_date_range,
+            start_parsed, end_parsed, papers_limit)
+        return _json_response(request, summary)
     except ValueError:
         raise HTTPException(
             status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to get document summary: {str(e)}")
+
+
+HistoryKind = Literal["activities", "keyword_extractions", "paperless_uploads"]
+
+
+def _parse_history_range(start_date: str, end_date: Optional[str]):
+    """Parse a history date range; end_date defaults to start_date"""
+    try:
+        start_parsed = date.fromisoformat(start_date)
+        end_parsed = date.fromisoformat(end_date) if end_date else start_parsed
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    if start_parsed > end_parsed:
+        raise HTTPException(
+            status_code=400, detail="Start date must be before end date")
+    return start_parsed, end_parsed
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Split a comma-separated field projection"""
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(",") if field.strip()]
+
+
+@router.get("/history/page")
+async def get_history_page(
+    request: Request,
+    kind: HistoryKind = Query(..., description="Which history to page through"),
+    start_date: str = Query(..., description="Start date in YYYY-MM-DD format"),
+    end_date: Optional[str] = Query(
+        None, description="End date in YYYY-MM-DD format (defaults to start_date)"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=1000, description="Items per page"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return (defaults to the full record)")
+):
+    """
+    Get one page of history items, newest first.
+    Pages are keyset-paginated on (timestamp, id), so deep pages cost the same as the first.
+    """
+    start_parsed, end_parsed = _parse_history_range(start_date, end_date)
+    projection = _parse_fields(fields)
+    try:
+        page = await _cached(
+            ("history_page", kind, start_parsed, end_parsed, cursor, limit, fields),
+            metrics_tracker.get_history_page,
+            kind, start_parsed, end_parsed, limit, cursor, projection)
+        return _json_response(request, page)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to get history page: {str(e)}")
+
+
+@router.get("/history/stream")
+async def stream_history(
+    request: Request,
+    start_date: str = Query(..., description="Start date in YYYY-MM-DD format"),
+    end_date: Optional[str] = Query(
+        None, description="End date in YYYY-MM-DD format (defaults to start_date)"),
+    kinds: Optional[str] = Query(
+        None, description="Comma-separated history kinds (defaults to all)"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return; requires a single kind"),
+    page_size: int = Query(500, ge=1, le=1000, description="Rows fetched per database round trip")
+):
+    """
+    Stream history items as NDJSON, one item per line tagged with its kind.
+    Items are read page by page, so memory stays bounded however large the range is.
+    """
+    start_parsed, end_parsed = _parse_history_range(start_date, end_date)
+    selected = _parse_fields(kinds) or list(get_args(HistoryKind))
+    unknown = [kind for kind in selected if kind not in get_args(HistoryKind)]
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown history kinds: {', '.join(unknown)}")
+    projection = _parse_fields(fields)
+    if projection and len(selected) != 1:
+        raise HTTPException(
+            status_code=400, detail="fields can only be used with a single kind")
+
+    async def stream():
+        try:
+            for kind in selected:
+                cursor = None
+                while not await request.is_disconnected():
+                    page = await run_blocking(
+                        metrics_tracker.get_history_page,
+                        kind, start_parsed, end_parsed, page_size, cursor, projection)
+                    for item in page["items"]:
+                        yield json.dumps({"kind": kind, **item}, default=str) + "\n"
+                    cursor = page["next_cursor"]
+                    if cursor is None:
+                        break
+        except Exception as e:
+            yield json.dumps({"error": f"History stream failed: {str(e)}"}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
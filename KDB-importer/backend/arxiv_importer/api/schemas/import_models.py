@@ -78,6 +78,26 @@ class PaperlessUploadResponse(BaseModel):
     status: str
 
 
+class PaperlessBatchUploadRequest(BaseModel):
+    papers: List[PaperlessUploadRequest] = Field(
+        ..., min_length=1, max_length=100, description="Papers to upload, each with optional metadata"
+    )
+
+
+class PaperlessBatchUploadResult(BaseModel):
+    paper_id: str
+    title: str
+    task_id: Optional[str] = None
+    status: str
+    error: Optional[str] = None
+
+
+class PaperlessBatchUploadResponse(BaseModel):
+    results: List[PaperlessBatchUploadResult]
+    queued: int
+    failed: int
+
+
 # ---------- Keyword Management Models ----------
 
 class KeywordExtractionRequest(BaseModel):
@@ -93,6 +113,31 @@ class KeywordExtractionResponse(BaseModel):
     extraction_method: str
 
 
+class BatchKeywordExtractionRequest(BaseModel):
+    papers: List[PaperInfo] = Field(
+        ..., min_length=1, max_length=200, description="Papers to extract keywords for"
+    )
+
+
+class BatchKeywordExtractionResult(KeywordExtractionResponse):
+    paper_id: str
+    title: str
+
+
+class BatchKeywordExtractionResponse(BaseModel):
+    results: List[BatchKeywordExtractionResult]
+
+
+class KeywordCacheInvalidationRequest(BaseModel):
+    paper_data: Optional[PaperInfo] = Field(
+        None, description="Paper whose cached extraction to drop; omit to clear the whole cache"
+    )
+
+
+class KeywordCacheInvalidationResponse(BaseModel):
+    invalidated: int
+
+
 class KeywordValidationRequest(BaseModel):
     keywords: List[str]
 
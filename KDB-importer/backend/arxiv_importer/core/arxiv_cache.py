@@ -0,0 +1,237 @@
+# backend/arxiv_importer/core/arxiv_cache.py
+import os
+import json
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import redis  # type: ignore
+except ModuleNotFoundError:
+    redis = None
+
+
+def make_cache_key(kind: str, *parts: Any) -> str:
+    """Stable key for a request kind and its normalized parameters"""
+    payload = json.dumps([kind, *parts], sort_keys=True, default=str)
+    return f"arxiv:{kind}:{hashlib.sha1(payload.encode('utf-8')).hexdigest()}"
+
+
+class ArxivQueryCache:
+    """
+    Shared cache for arXiv responses with stale-while-revalidate.
+
+    Values must be JSON-serializable (plain dicts/lists), so every caller
+    rebuilds its own objects and nothing mutable is shared between requests.
+    Entries are fresh for `ttl` seconds; after that they are still served for up
+    to `stale_ttl` seconds while a single background refresh runs. The in-process
+    LRU is backed by Redis when ARXIV_CACHE_REDIS_URL is set and the redis
+    package is installed, so all workers share results.
+    """
+
+    def __init__(self, ttl: float = None, stale_ttl: float = None,
+                 max_entries: int = None, redis_url: Optional[str] = None):
+        self.ttl = ttl or float(os.getenv("ARXIV_CACHE_TTL", "600"))
+        self.stale_ttl = stale_ttl or float(
+            os.getenv("ARXIV_CACHE_STALE_TTL", "3600"))
+        self.max_entries = max_entries or int(
+            os.getenv("ARXIV_CACHE_SIZE", "256"))
+        redis_url = redis_url or os.getenv("ARXIV_CACHE_REDIS_URL")
+
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, threading.Event] = {}
+        self._refresher = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="arxiv-cache-refresh")
+
+        self._redis = None
+        self._redis_retry_at = 0.0
+        if redis_url and redis is not None:
+            self._redis = redis.Redis.from_url(
+                redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        elif redis_url:
+            print("ARXIV_CACHE_REDIS_URL is set but the redis package is not installed; using memory only")
+
+        # Counters
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def get(self, key: str, refresh_fn: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for `key` if it is fresh, or stale and still
+        servable (scheduling a background refresh with `refresh_fn`).
+        Returns None on a miss, leaving the fetch to the caller.
+        """
+        value, stale = self.get_entry(key)
+        if stale:
+            self._revalidate(key, refresh_fn)
+        return value
+
+    def get_entry(self, key: str) -> Tuple[Any, bool]:
+        """
+        Return (value, stale) for `key`, counting the hit or miss; value is None on a miss.
+        A stale value is still servable, but refreshing it is left to the caller.
+        """
+        value, fetched_at = self._lookup(key)
+        if value is not None:
+            age = time.time() - fetched_at
+            if age < self.ttl:
+                self._count("hits")
+                return value, False
+            if age < self.ttl + self.stale_ttl:
+                self._count("stale_hits")
+                return value, True
+
+        self._count("misses")
+        return None, False
+
+    def revalidate_many(self, items: Dict[str, Any], refresh_fn: Callable[[List[Any]], Any]):
+        """
+        Refresh several stale entries with one background call.
+        `items` maps cache keys to what `refresh_fn` needs to fetch them; it gets
+        those whose key is not already being refreshed, and stores results with set().
+        """
+        with self._lock:
+            keys = [key for key in items if key not in self._inflight]
+            for key in keys:
+                self._inflight[key] = threading.Event()
+        if not keys:
+            return
+
+        def refresh():
+            try:
+                refresh_fn([items[key] for key in keys])
+            except Exception as e:
+                print(f"Error refreshing {len(keys)} arXiv cache entries: {e}")
+            finally:
+                with self._lock:
+                    for key in keys:
+                        self._inflight.pop(key).set()
+
+        self._refresher.submit(refresh)
+
+    def get_or_fetch(self, key: str, fetch_fn: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for `key`, fetching it on a miss.
+        Concurrent misses for the same key share one fetch. Exceptions from
+        `fetch_fn` propagate and nothing is cached.
+        """
+        value = self.get(key, fetch_fn)
+        if value is not None:
+            return value
+        return self._fetch_once(key, fetch_fn)
+
+    def set(self, key: str, value: Any):
+        """Store a value in memory and in Redis"""
+        fetched_at = time.time()
+        self._remember(key, value, fetched_at)
+        self._redis_set(key, value, fetched_at)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and backend state"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "memory_entries": len(self._entries),
+                "redis_enabled": self._redis is not None
+            }
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _lookup(self, key: str) -> Tuple[Any, float]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        entry = self._redis_get(key)
+        if entry is not None:
+            self._remember(key, *entry)
+            return entry
+        return None, 0.0
+
+    def _remember(self, key: str, value: Any, fetched_at: float):
+        with self._lock:
+            self._entries[key] = (value, fetched_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _fetch_once(self, key: str, fetch_fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            waiter = self._inflight.get(key)
+            if waiter is None:
+                self._inflight[key] = threading.Event()
+
+        if waiter is not None:
+            # Another request is already fetching this key
+            waiter.wait()
+            value, _ = self._lookup(key)
+            if value is not None:
+                return value
+            return fetch_fn()
+
+        try:
+            value = fetch_fn()
+            if value is not None:
+                self.set(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key).set()
+
+    def _revalidate(self, key: str, fetch_fn: Callable[[], Any]):
+        with self._lock:
+            if key in self._inflight:
+                return
+
+        def refresh():
+            try:
+                self._fetch_once(key, fetch_fn)
+            except Exception as e:
+                print(f"Error refreshing arXiv cache entry: {e}")
+
+        self._refresher.submit(refresh)
+
+    # ---------- Redis backend ----------
+
+    def _redis_available(self) -> bool:
+        return self._redis is not None and time.monotonic() >= self._redis_retry_at
+
+    def _redis_failed(self, e: Exception):
+        print(f"arXiv cache Redis error, using memory only for 30s: {e}")
+        self._redis_retry_at = time.monotonic() + 30
+
+    def _redis_get(self, key: str) -> Optional[Tuple[Any, float]]:
+        if not self._redis_available():
+            return None
+        try:
+            raw = self._redis.get(key)
+            if raw is None:
+                return None
+            payload = json.loads(raw)
+            return payload["value"], payload["fetched_at"]
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+
+    def _redis_set(self, key: str, value: Any, fetched_at: float):
+        if not self._redis_available():
+            return
+        try:
+            self._redis.set(
+                key,
+                json.dumps({"value": value, "fetched_at": fetched_at}),
+                ex=int(self.ttl + self.stale_ttl)
+            )
+        except Exception as e:
+            self._redis_failed(e)
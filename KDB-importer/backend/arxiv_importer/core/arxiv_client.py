@@ -1,7 +1,41 @@
 # backend/arxiv_importer/core/arxiv_client.py
+import os
+import re
+import threading
+import time
 import arxiv
 import requests
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, Iterator, List, Optional
+from .arxiv_cache import ArxivQueryCache, make_cache_key
+
+# Batched ID resolution settings (arXiv asks for politeness, keep concurrency low)
+ID_BATCH_SIZE = int(os.getenv("ARXIV_ID_BATCH_SIZE", "50"))
+ID_BATCH_CONCURRENCY = int(os.getenv("ARXIV_ID_BATCH_CONCURRENCY", "3"))
+# Smaller pages let streamed searches emit their first results sooner
+STREAM_PAGE_SIZE = int(os.getenv("ARXIV_STREAM_PAGE_SIZE", "25"))
+# arXiv asks for no more than one API request every 3 seconds
+REQUEST_INTERVAL = float(os.getenv("ARXIV_REQUEST_INTERVAL", "3"))
+
+_VERSION_SUFFIX = re.compile(r"v\d+$")
+
+# Shared by every request in the process (and across processes through Redis)
+query_cache = ArxivQueryCache()
+
+_request_lock = threading.Lock()
+_next_request_slot = 0.0
+
+
+def _wait_for_request_slot():
+    """Space arXiv API requests REQUEST_INTERVAL seconds apart across threads"""
+    global _next_request_slot
+    with _request_lock:
+        now = time.monotonic()
+        slot = max(now, _next_request_slot)
+        _next_request_slot = slot + REQUEST_INTERVAL
+    if slot > now:
+        time.sleep(slot - now)
 
 
 class ArxivPaper:
@@ -14,6 +48,17 @@ class ArxivPaper:
         self.published = entry.published.isoformat()
         self.updated = entry.updated.isoformat()
     
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ArxivPaper":
+        """Rebuild a paper from its cached dict form"""
+        paper = cls.__new__(cls)
+        paper.__dict__.update(data)
+        paper.authors = list(paper.authors)
+        return paper
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**self.__dict__, "authors": list(self.authors)}
+
     def __repr__(self) -> str:
         return f"{self.id} — {self.title.strip()} by {', '.join(self.authors)}"
 
@@ -29,35 +74,170 @@ def is_valid_arxiv_id(arxiv_id: str) -> bool:
     except requests.RequestException:
         return False
 
+def _id_cache_key(arxiv_id: str) -> str:
+    return make_cache_key("id", arxiv_id)
+
+
+def _query_id(arxiv_id: str) -> Optional[Dict]:
+    _wait_for_request_slot()
+    search = arxiv.Search(id_list=[arxiv_id])
+    results = list(search.results())
+    # Not-found results are not cached
+    return ArxivPaper(results[0]).to_dict() if results else None
+
+
 def fetch_by_id(arxiv_id: str) -> Optional[ArxivPaper]:
     try:
-        search = arxiv.Search(id_list=[arxiv_id])
-        results = list(search.results())
-        if not results:
-            return None
-        return ArxivPaper(results[0])
+        data = query_cache.get_or_fetch(_id_cache_key(arxiv_id), partial(_query_id, arxiv_id))
+        return ArxivPaper.from_dict(data) if data else None
     except Exception as e:
         print(f"Error fetching ID {arxiv_id}: {e}")
         return None
 
 
+def _strip_version(arxiv_id: str) -> str:
+    return _VERSION_SUFFIX.sub("", arxiv_id)
+
+
+def _fetch_chunk(chunk: List[str]) -> Dict[str, ArxivPaper]:
+    """
+    Resolve one chunk of IDs with a single id_list query.
+    Falls back to one query per ID if arXiv rejects the whole chunk.
+    """
+    try:
+        _wait_for_request_slot()
+        search = arxiv.Search(id_list=chunk, max_results=len(chunk))
+        papers = [ArxivPaper(result) for result in search.results()]
+    except Exception as e:
+        print(f"Error fetching ID batch ({len(chunk)} ids), retrying one by one: {e}")
+        # Straight to arXiv: these IDs were already looked up in the cache
+        found = {}
+        for arxiv_id in chunk:
+            try:
+                data = _query_id(arxiv_id)
+            except Exception as e:
+                print(f"Error fetching ID {arxiv_id}: {e}")
+                continue
+            if data is not None:
+                query_cache.set(_id_cache_key(arxiv_id), data)
+                found[arxiv_id] = ArxivPaper.from_dict(data)
+        return found
+
+    # Index by both the versioned and unversioned ID so either input form matches
+    by_id = {}
+    for paper in papers:
+        by_id[paper.id] = paper
+        by_id.setdefault(_strip_version(paper.id), paper)
+
+    found = {}
+    for arxiv_id in chunk:
+        paper = by_id.get(arxiv_id) or by_id.get(_strip_version(arxiv_id))
+        if paper is not None:
+            found[arxiv_id] = paper
+            query_cache.set(_id_cache_key(arxiv_id), paper.to_dict())
+    return found
+
+
+def _chunks(arxiv_ids: List[str], batch_size: int) -> List[List[str]]:
+    return [arxiv_ids[i:i + batch_size] for i in range(0, len(arxiv_ids), batch_size)]
+
+
+def _refresh_ids(arxiv_ids: List[str], batch_size: int = ID_BATCH_SIZE):
+    """Re-resolve cached IDs, one id_list query per chunk (_fetch_chunk stores the results)"""
+    for chunk in _chunks(arxiv_ids, batch_size):
+        _fetch_chunk(chunk)
+
+
+def fetch_by_ids(
+    arxiv_ids: List[str],
+    batch_size: int = ID_BATCH_SIZE,
+    max_workers: int = ID_BATCH_CONCURRENCY
+) -> Dict[str, ArxivPaper]:
+    """
+    Resolve many arXiv IDs using chunked id_list queries run with bounded concurrency
+    (request starts are still spaced REQUEST_INTERVAL apart).
+    Returns a mapping of requested ID -> paper; IDs that were not found are absent.
+    """
+    found: Dict[str, ArxivPaper] = {}
+    missing_ids = []
+    stale_ids: Dict[str, str] = {}
+    for arxiv_id in dict.fromkeys(arxiv_ids):
+        cache_key = _id_cache_key(arxiv_id)
+        cached, stale = query_cache.get_entry(cache_key)
+        if cached:
+            found[arxiv_id] = ArxivPaper.from_dict(cached)
+            if stale:
+                stale_ids[cache_key] = arxiv_id
+        else:
+            missing_ids.append(arxiv_id)
+
+    if stale_ids:
+        # Stale entries are served now and refreshed in the background with id_list queries too
+        query_cache.revalidate_many(stale_ids, partial(_refresh_ids, batch_size=batch_size))
+
+    if not missing_ids:
+        return found
+
+    chunks = _chunks(missing_ids, batch_size)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+        for chunk_result in executor.map(_fetch_chunk, chunks):
+            found.update(chunk_result)
+    return found
+
+
 def fetch_by_query(
     query: str,
     max_results: int = 5,
     sort_by: str = "relevance"  # "relevance" or "submittedDate"
 ) -> List[ArxivPaper]:
-    try:
-        sort_criterion = arxiv.SortCriterion.Relevance
-        if sort_by == "submittedDate":
-            sort_criterion = arxiv.SortCriterion.SubmittedDate
+    sort_criterion = arxiv.SortCriterion.Relevance
+    if sort_by == "submittedDate":
+        sort_criterion = arxiv.SortCriterion.SubmittedDate
 
+    def query_arxiv():
+        _wait_for_request_slot()
         search = arxiv.Search(
             query=query,
             max_results=max_results,
             sort_by=sort_criterion
         )
-        return [ArxivPaper(result) for result in search.results()]
+        return [ArxivPaper(result).to_dict() for result in search.results()]
+
+    try:
+        # Key on the normalized query, sort and page window
+        cache_key = make_cache_key(
+            "query", " ".join(query.split()), sort_by, 0, max_results)
+        data = query_cache.get_or_fetch(cache_key, query_arxiv)
+        return [ArxivPaper.from_dict(item) for item in data]
 
     except Exception as e:
         print(f"Error fetching query '{query}': {e}")
         return []
+
+
+def iter_by_query(
+    query: str,
+    max_results: int = 5,
+    sort_by: str = "relevance",  # "relevance" or "submittedDate"
+    page_size: int = STREAM_PAGE_SIZE
+) -> Iterator[ArxivPaper]:
+    """
+    Lazily yield papers for a query as arXiv returns them.
+    Pages are only requested when the consumer asks for more results,
+    so closing the generator stops any further paging.
+    """
+    sort_criterion = arxiv.SortCriterion.Relevance
+    if sort_by == "submittedDate":
+        sort_criterion = arxiv.SortCriterion.SubmittedDate
+
+    client = arxiv.Client(page_size=max(1, min(page_size, max_results)))
+    search = arxiv.Search(
+        query=query,
+        max_results=max_results,
+        sort_by=sort_criterion
+    )
+    # The client spaces its own later pages
+    _wait_for_request_slot()
+    for result in client.results(search):
+        yield ArxivPaper(result)
@@ -1,7 +1,7 @@
 # backend/arxiv_importer/core/import_manager.py
 from typing import List, Dict, Any
 from .query_parser import parse_input, ParsedQuery
-from .arxiv_client import fetch_by_id, fetch_by_query
+from .arxiv_client import fetch_by_ids, fetch_by_query
 from .metadata_handler import process_metadata
 
 class ImportResult:
@@ -24,12 +24,23 @@ def import_ids_or_urls(inputs: List[str], metadata_list: List[Dict[str, Any]]) -
     """
     Import arXiv papers by ID or URL.
     Rejects search queries — they should be routed to /search instead.
+
+    All inputs are parsed first, unique IDs are resolved together in batched
+    arXiv queries, and results are returned in input order (one entry per input).
     """
-    results = []
+    parsed_inputs: List[ParsedQuery] = [parse_input(s) for s in inputs]
+    importable_ids = [p.value for p in parsed_inputs if p.type in ("id", "url")]
+
+    try:
+        papers = fetch_by_ids(importable_ids)
+        batch_error = ""
+    except Exception as e:
+        papers = {}
+        batch_error = str(e)
 
-    for i, input_str in enumerate(inputs):
-        parsed: ParsedQuery = parse_input(input_str)
+    results = []
 
+    for i, (input_str, parsed) in enumerate(zip(inputs, parsed_inputs)):
         if parsed.type not in ("id", "url"):
             results.append(ImportResult(
                 False,
@@ -38,10 +49,14 @@ def import_ids_or_urls(inputs: List[str], metadata_list: List[Dict[str, Any]]) -
             ).to_dict())
             continue
 
+        if batch_error:
+            results.append(ImportResult(False, input_str, reason=batch_error).to_dict())
+            continue
+
         user_metadata = metadata_list[i] if i < len(metadata_list) else {}
 
         try:
-            paper = fetch_by_id(parsed.value)
+            paper = papers.get(parsed.value)
             if paper is None:
                 results.append(ImportResult(False, input_str, reason="Not found").to_dict())
                 continue
@@ -49,7 +64,7 @@ def import_ids_or_urls(inputs: List[str], metadata_list: List[Dict[str, Any]]) -
             enriched_metadata = process_metadata(user_metadata)
 
             results.append(ImportResult(True, input_str, data={
-                "paper": paper.__dict__,
+                "paper": dict(paper.__dict__),
                 "metadata": enriched_metadata
             }).to_dict())
 
@@ -0,0 +1,155 @@
+# backend/arxiv_importer/core/keyword_cache.py
+import os
+import json
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace and case so trivial edits map to the same cache key"""
+    return " ".join((text or "").split()).lower()
+
+
+class KeywordExtractionCache:
+    """
+    Two-tier, content-addressed cache for LLM keyword extractions.
+
+    Tier 1 is an in-process LRU; tier 2 is the keyword_extraction_cache table
+    (created with the metrics schema), shared by every worker and surviving
+    restarts. Entries expire after `ttl_seconds`.
+    """
+
+    def __init__(self, connection_factory: Optional[Callable] = None,
+                 max_entries: int = None, ttl_seconds: float = None):
+        self.connection_factory = connection_factory
+        self.max_entries = max_entries or int(
+            os.getenv('KEYWORD_CACHE_SIZE', '1024'))
+        self.ttl_seconds = ttl_seconds or float(
+            os.getenv('KEYWORD_CACHE_TTL_DAYS', '30')) * 86400
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters
+        self.memory_hits = 0
+        self.durable_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(content: str, model: str, prompt_version: str) -> str:
+        """Hash of the normalized content, model name and prompt version"""
+        payload = "\x1f".join([normalize_text(content), model, prompt_version])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached extraction, promoting durable hits into memory"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.memory_hits += 1
+                    return value
+                del self._entries[key]
+
+        value = self._durable_get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.durable_hits += 1
+        self._remember(key, value, now + self.ttl_seconds)
+        return value
+
+    def set(self, key: str, value: Dict[str, Any], model: str = "", prompt_version: str = ""):
+        """Store an extraction in both tiers"""
+        self._remember(key, value, time.time() + self.ttl_seconds)
+        self._durable_set(key, value, model, prompt_version)
+
+    def invalidate(self, key: Optional[str] = None) -> int:
+        """Drop one entry, or every entry when no key is given. Returns durable rows removed."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+        return self._durable_delete(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and current memory tier size"""
+        with self._lock:
+            hits = self.memory_hits + self.durable_hits
+            lookups = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "durable_hits": self.durable_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._entries),
+                "memory_capacity": self.max_entries
+            }
+
+    def _remember(self, key: str, value: Dict[str, Any], expires_at: float):
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    # ---------- Durable tier ----------
+
+    def _durable_get(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.connection_factory is None:
+            return None
+        try:
+            with self.connection_factory() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        SELECT result FROM keyword_extraction_cache
+                        WHERE cache_key = %s AND expires_at > NOW()
+                    """, (key,))
+                    row = cur.fetchone()
+                    return row[0] if row else None
+        except Exception as e:
+            print(f"Error reading keyword cache: {e}")
+            return None
+
+    def _durable_set(self, key: str, value: Dict[str, Any], model: str, prompt_version: str):
+        if self.connection_factory is None:
+            return
+        try:
+            with self.connection_factory() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        INSERT INTO keyword_extraction_cache (cache_key, result, model, prompt_version, expires_at)
+                        VALUES (%s, %s, %s, %s, NOW() + %s * INTERVAL '1 second')
+                        ON CONFLICT (cache_key) DO UPDATE SET
+                            result = EXCLUDED.result,
+                            model = EXCLUDED.model,
+                            prompt_version = EXCLUDED.prompt_version,
+                            created_at = NOW(),
+                            expires_at = EXCLUDED.expires_at
+                    """, (key, json.dumps(value), model, prompt_version, self.ttl_seconds))
+        except Exception as e:
+            print(f"Error writing keyword cache: {e}")
+
+    def _durable_delete(self, key: Optional[str]) -> int:
+        if self.connection_factory is None:
+            return 0
+        try:
+            with self.connection_factory() as conn:
+                with conn.cursor() as cur:
+                    if key is None:
+                        cur.execute("DELETE FROM keyword_extraction_cache")
+                    else:
+                        cur.execute(
+                            "DELETE FROM keyword_extraction_cache WHERE cache_key = %s", (key,))
+                    return cur.rowcount
+        except Exception as e:
+            print(f"Error invalidating keyword cache: {e}")
+            return 0
@@ -2,13 +2,42 @@
 import os
 import json
 import re
-from typing import List, Dict, Any, Optional, Set
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterable, Optional, Set
 from dataclasses import dataclass
 from openai import OpenAI
 from dotenv import load_dotenv
+from .keyword_cache import KeywordExtractionCache
+from .phrase_matcher import PhraseMatcher
+from .metrics_tracker import metrics_tracker
 
 load_dotenv()
 
+AI_MODEL = "gpt-4"
+# Bump whenever the extraction prompts change so cached results are not reused.
+# Covers both the single and the batched prompt, which share their instructions.
+PROMPT_VERSION = "v1"
+
+EXTRACTION_INSTRUCTIONS = """- "primary_keywords": 5-8 most important keywords (high relevance)
+            - "secondary_keywords": 5-10 additional relevant keywords (medium relevance)
+            - "technical_terms": specific technical terms found
+            - "domain_tags": relevant domain categories from quantum computing
+            
+            Focus on:
+            - Quantum computing concepts and algorithms
+            - Cybersecurity and cryptography terms
+            - Technical implementations and frameworks
+            - Research methodologies and applications"""
+
+EMPTY_AI_RESULT = {
+    "primary_keywords": [],
+    "secondary_keywords": [],
+    "technical_terms": [],
+    "domain_tags": []
+}
+
 
 @dataclass
 class KeywordExtractionResult:
@@ -29,6 +58,19 @@ class KeywordManager:
         self.quantum_domains = self._load_quantum_domains()
         self.technical_terms = self._load_technical_terms()
         self.stop_words = self._load_stop_words()
+        self.domain_keywords = self._load_domain_keywords()
+        self._build_matchers()
+        self.extraction_cache = KeywordExtractionCache(
+            metrics_tracker.connection)
+
+        # Batched extraction: papers per model request, parallel requests and pacing
+        self.ai_batch_size = int(os.getenv("KEYWORD_BATCH_SIZE", "5"))
+        self.ai_batch_concurrency = int(
+            os.getenv("KEYWORD_BATCH_CONCURRENCY", "3"))
+        self.ai_min_interval = 60.0 / \
+            float(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "60"))
+        self._ai_rate_lock = threading.Lock()
+        self._ai_next_slot = 0.0
 
     def _load_quantum_domains(self) -> List[str]:
         """Load quantum computing domain categories"""
@@ -54,6 +96,37 @@ class KeywordManager:
             "quantum machine learning", "quantum neural networks"
         }
 
+    def _load_domain_keywords(self) -> Dict[str, List[str]]:
+        """Load keywords associated with each domain"""
+        return {
+            "Quantum Computing": ["quantum computer", "quantum processor", "quantum system"],
+            "Quantum Algorithm": ["quantum algorithm", "quantum circuit", "quantum gate"],
+            "Quantum Communication": ["quantum communication", "quantum channel", "quantum network"],
+            "Post Quantum Cryptography (PQC)": ["post-quantum", "quantum-resistant", "lattice-based"],
+            "Quantum Error Correction": ["quantum error", "error correction", "quantum fault tolerance"],
+            "Quantum AI": ["quantum machine learning", "quantum neural network", "quantum optimization"]
+        }
+
+    def _build_matchers(self):
+        """Compile the vocabularies into single-pass matchers"""
+        self.technical_term_matcher = PhraseMatcher(
+            {term: [term] for term in self.technical_terms})
+
+        domain_phrases: Dict[str, List[str]] = {}
+        for domain in self.quantum_domains:
+            for keyword in self._get_domain_keywords(domain):
+                domain_phrases.setdefault(keyword, []).append(domain)
+        self.domain_matcher = PhraseMatcher(domain_phrases)
+
+        self._technical_terms_lower = {
+            term.lower() for term in self.technical_terms}
+
+    def load_technical_terms(self, terms: Iterable[str]):
+        """Add technical terms to the vocabulary and recompile the matchers"""
+        self.technical_terms.update(
+            term.strip() for term in terms if term and term.strip())
+        self._build_matchers()
+
     def _load_stop_words(self) -> Set[str]:
         """Load stop words for keyword filtering"""
         return {
@@ -69,11 +142,15 @@ class KeywordManager:
         Extract keywords from paper text using multiple methods
         """
         # Combine all text sources
-        full_text = f"{title}\n{abstract}\n{text}".strip()
+        full_text = self._build_full_text(text, title, abstract)
 
         # Method 1: AI-powered extraction
         ai_keywords = self._extract_with_ai(full_text)
 
+        return self._combine_with_local_methods(full_text, ai_keywords)
+
+    def _combine_with_local_methods(self, full_text: str, ai_keywords: Dict[str, Any]) -> KeywordExtractionResult:
+        """Run the non-AI extraction methods and merge them with the AI result"""
         # Method 2: Technical term detection
         technical_terms = self._extract_technical_terms(full_text)
 
@@ -88,86 +165,168 @@ class KeywordManager:
             ai_keywords, technical_terms, domain_tags, statistical_keywords
         )
 
+    @staticmethod
+    def _build_full_text(text: str, title: str = "", abstract: str = "") -> str:
+        return f"{title}\n{abstract}\n{text}".strip()
+
     def _extract_with_ai(self, text: str) -> Dict[str, Any]:
-        """Extract keywords using OpenAI GPT-4"""
+        """Extract keywords using OpenAI GPT-4, reusing cached results for identical content"""
+        cache_key = self.extraction_cache.make_key(
+            text, AI_MODEL, PROMPT_VERSION)
+        cached = self.extraction_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            system_prompt = """You are a scientific keyword extraction expert specializing in quantum computing and cybersecurity.
+            result = self._request_ai(text)
+            self.extraction_cache.set(
+                cache_key, result, AI_MODEL, PROMPT_VERSION)
+            return result
+
+        except Exception as e:
+            print(f"AI keyword extraction failed: {e}")
+            return dict(EMPTY_AI_RESULT)
+
+    def _request_ai(self, text: str) -> Dict[str, Any]:
+        """Send one model request for a single text"""
+        system_prompt = f"""You are a scientific keyword extraction expert specializing in quantum computing and cybersecurity.
             
             Extract keywords from the given text and return a JSON object with:
-            - "primary_keywords": 5-8 most important keywords (high relevance)
-            - "secondary_keywords": 5-10 additional relevant keywords (medium relevance)
-            - "technical_terms": specific technical terms found
-            - "domain_tags": relevant domain categories from quantum computing
-            
-            Focus on:
-            - Quantum computing concepts and algorithms
-            - Cybersecurity and cryptography terms
-            - Technical implementations and frameworks
-            - Research methodologies and applications
+            {EXTRACTION_INSTRUCTIONS}
             
             Return only valid JSON, no additional text."""
 
-            # Limit text length
-            user_prompt = f"Extract keywords from this scientific text:\n\n{text[:4000]}"
+        # Limit text length
+        user_prompt = f"Extract keywords from this scientific text:\n\n{text[:4000]}"
+
+        self._wait_for_ai_slot()
+        response = self.openai_client.chat.completions.create(
+            model=AI_MODEL,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            max_tokens=500,
+            temperature=0.3
+        )
+
+        return json.loads(response.choices[0].message.content.strip())
+
+    def _wait_for_ai_slot(self):
+        """Pace OpenAI requests to at most OPENAI_REQUESTS_PER_MINUTE across threads"""
+        with self._ai_rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._ai_next_slot)
+            self._ai_next_slot = slot + self.ai_min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def _extract_with_ai_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Extract keywords for many texts, packing several texts into each model request.
+        Cached texts are served from the cache; chunks run concurrently under the rate limit.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+
+        # Identical texts share a single lookup and a single slot in the prompt
+        pending: Dict[str, List[int]] = {}
+        pending_text: Dict[str, str] = {}
+        for i, text in enumerate(texts):
+            cache_key = self.extraction_cache.make_key(
+                text, AI_MODEL, PROMPT_VERSION)
+            if cache_key in pending:
+                pending[cache_key].append(i)
+                continue
+            cached = self.extraction_cache.get(cache_key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending[cache_key] = [i]
+                pending_text[cache_key] = text
+
+        keys = list(pending)
+        chunks = [keys[i:i + self.ai_batch_size]
+                  for i in range(0, len(keys), self.ai_batch_size)]
+
+        if chunks:
+            workers = max(1, min(self.ai_batch_concurrency, len(chunks)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                chunk_results = executor.map(
+                    lambda chunk: self._request_ai_batch([pending_text[k] for k in chunk]), chunks)
+                for chunk, extracted in zip(chunks, chunk_results):
+                    for cache_key, result in zip(chunk, extracted):
+                        if result is None:
+                            # Missing from the batched answer: retry on its own
+                            try:
+                                result = self._request_ai(
+                                    pending_text[cache_key])
+                            except Exception as e:
+                                print(f"AI keyword extraction failed: {e}")
+                                result = dict(EMPTY_AI_RESULT)
+                                for i in pending[cache_key]:
+                                    results[i] = result
+                                continue
+                        self.extraction_cache.set(
+                            cache_key, result, AI_MODEL, PROMPT_VERSION)
+                        for i in pending[cache_key]:
+                            results[i] = result
+
+        return [result if result is not None else dict(EMPTY_AI_RESULT) for result in results]
+
+    def _request_ai_batch(self, texts: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Send one model request for several texts; None marks texts missing from the answer"""
+        if len(texts) == 1:
+            return [None]
+
+        try:
+            system_prompt = f"""You are a scientific keyword extraction expert specializing in quantum computing and cybersecurity.
+            
+            You will receive several numbered scientific texts. For each text, extract keywords as an object with:
+            {EXTRACTION_INSTRUCTIONS}
+            
+            Return a JSON object of the form {{"papers": [{{"index": <text number>, ...keyword fields}}]}}
+            with one entry per text. Return only valid JSON, no additional text."""
+
+            # Keep the combined prompt within the model context
+            per_text_limit = max(1000, 8000 // len(texts))
+            user_prompt = "Extract keywords from these scientific texts:\n\n" + "\n\n".join(
+                f"### Text {i}\n{text[:per_text_limit]}" for i, text in enumerate(texts))
 
+            self._wait_for_ai_slot()
             response = self.openai_client.chat.completions.create(
-                model="gpt-4",
+                model=AI_MODEL,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
-                max_tokens=500,
+                max_tokens=500 * len(texts),
                 temperature=0.3
             )
 
-            result = json.loads(response.choices[0].message.content.strip())
-            return result
+            payload = json.loads(response.choices[0].message.content.strip())
+            extracted: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+            for entry in payload.get("papers", []):
+                index = entry.pop("index", None)
+                if isinstance(index, int) and 0 <= index < len(texts):
+                    extracted[index] = entry
+            return extracted
 
         except Exception as e:
-            print(f"AI keyword extraction failed: {e}")
-            return {
-                "primary_keywords": [],
-                "secondary_keywords": [],
-                "technical_terms": [],
-                "domain_tags": []
-            }
+            print(f"Batched AI keyword extraction failed for {len(texts)} texts: {e}")
+            return [None] * len(texts)
 
     def _extract_technical_terms(self, text: str) -> List[str]:
-        """Extract technical terms using pattern matching"""
-        found_terms = []
-        text_lower = text.lower()
-
-        for term in self.technical_terms:
-            if term.lower() in text_lower:
-                found_terms.append(term)
-
-        return found_terms
+        """Extract technical terms in one pass, in order of first appearance"""
+        return self.technical_term_matcher.find(text)
 
     def _classify_domains(self, text: str) -> List[str]:
         """Classify paper into quantum computing domains"""
-        text_lower = text.lower()
-        relevant_domains = []
-
-        for domain in self.quantum_domains:
-            # Check for domain-specific keywords
-            domain_keywords = self._get_domain_keywords(domain)
-            if any(keyword.lower() in text_lower for keyword in domain_keywords):
-                relevant_domains.append(domain)
-
-        return relevant_domains
+        matched = set(self.domain_matcher.find(text))
+        return [domain for domain in self.quantum_domains if domain in matched]
 
     def _get_domain_keywords(self, domain: str) -> List[str]:
         """Get keywords associated with a specific domain"""
-        domain_keyword_map = {
-            "Quantum Computing": ["quantum computer", "quantum processor", "quantum system"],
-            "Quantum Algorithm": ["quantum algorithm", "quantum circuit", "quantum gate"],
-            "Quantum Communication": ["quantum communication", "quantum channel", "quantum network"],
-            "Post Quantum Cryptography (PQC)": ["post-quantum", "quantum-resistant", "lattice-based"],
-            "Quantum Error Correction": ["quantum error", "error correction", "quantum fault tolerance"],
-            "Quantum AI": ["quantum machine learning", "quantum neural network", "quantum optimization"]
-        }
-
-        return domain_keyword_map.get(domain, [domain.lower()])
+        return self.domain_keywords.get(domain, [domain.lower()])
 
     def _extract_statistical_keywords(self, text: str) -> List[str]:
         """Extract keywords using statistical methods (TF-IDF-like)"""
@@ -240,8 +399,8 @@ class KeywordManager:
 
         return round(confidence, 2)
 
-    def suggest_keywords_for_paper(self, paper_data: Dict[str, Any]) -> KeywordExtractionResult:
-        """Main method to suggest keywords for a paper"""
+    def _paper_text(self, paper_data: Dict[str, Any]):
+        """Get (text, title, abstract) for a paper dict or Pydantic model"""
         # Convert Pydantic model to dict if needed
         if hasattr(paper_data, 'model_dump'):
             paper_dict = paper_data.model_dump()
@@ -256,8 +415,36 @@ class KeywordManager:
         # Extract text from paper (if available)
         text = f"{title}\n{abstract}"
 
+        return text, title, abstract
+
+    def suggest_keywords_for_paper(self, paper_data: Dict[str, Any]) -> KeywordExtractionResult:
+        """Main method to suggest keywords for a paper"""
+        text, title, abstract = self._paper_text(paper_data)
         return self.extract_keywords_from_text(text, title, abstract)
 
+    def suggest_keywords_for_papers(self, papers: List[Dict[str, Any]]) -> List[KeywordExtractionResult]:
+        """Suggest keywords for many papers, batching the AI calls. Results follow input order."""
+        full_texts = [self._build_full_text(*self._paper_text(paper))
+                      for paper in papers]
+        ai_results = self._extract_with_ai_batch(full_texts)
+        return [
+            self._combine_with_local_methods(full_text, ai_keywords)
+            for full_text, ai_keywords in zip(full_texts, ai_results)
+        ]
+
+    def invalidate_cached_keywords(self, paper_data: Optional[Dict[str, Any]] = None) -> int:
+        """Drop the cached AI extraction for one paper, or the whole cache"""
+        if paper_data is None:
+            return self.extraction_cache.invalidate()
+
+        full_text = self._build_full_text(*self._paper_text(paper_data))
+        return self.extraction_cache.invalidate(
+            self.extraction_cache.make_key(full_text, AI_MODEL, PROMPT_VERSION))
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get AI extraction cache hit/miss counters"""
+        return self.extraction_cache.get_stats()
+
     def validate_keywords(self, keywords: List[str]) -> Dict[str, Any]:
         """Validate and normalize keywords"""
         validated = {
@@ -280,7 +467,7 @@ class KeywordManager:
             validated["normalized_keywords"].append(normalized)
 
             # Check if it's a known technical term
-            if normalized.lower() in [term.lower() for term in self.technical_terms]:
+            if normalized.lower() in self._technical_terms_lower:
                 validated["valid_keywords"].append(normalized)
             else:
                 # Suggest similar terms
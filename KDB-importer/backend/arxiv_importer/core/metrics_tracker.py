@@ -2,16 +2,112 @@
 import os
 import json
 import time
+import base64
+import itertools
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime, timedelta, date
-from typing import Dict, List, Any, Optional
+from decimal import Decimal
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2 import pool as pg_pool
+from psycopg2.extras import RealDictCursor, execute_values
 from dotenv import load_dotenv
+from .metrics_writer import MetricsWriter
 
 load_dotenv()
 
+# import_trends granularities: date_trunc unit and default number of buckets
+TREND_GRANULARITIES = {
+    "daily": ("day", 30),
+    "weekly": ("week", 12),
+    "monthly": ("month", 12),
+}
+MAX_TREND_BUCKETS = 2000
+
+# Raw event tables partitioned by month on timestamp
+PARTITIONED_TABLES = ("activity_events", "keyword_extractions", "paperless_uploads")
+
+
+# History sources for keyset pagination: table, output field -> column, default fields
+HISTORY_SOURCES = {
+    "activities": ("activity_events", {
+        "id": "id",
+        "type": "event_type",
+        "title": "title",
+        "timestamp": "timestamp",
+        "status": "status",
+        "details": "details",
+    }, ["type", "title", "timestamp", "status", "details"]),
+    "keyword_extractions": ("keyword_extractions", {
+        "id": "id",
+        "paper_title": "paper_title",
+        "primary_keywords": "primary_keywords",
+        "secondary_keywords": "secondary_keywords",
+        "technical_terms": "technical_terms",
+        "domain_tags": "domain_tags",
+        "confidence_score": "confidence_score",
+        "extraction_method": "extraction_method",
+        "timestamp": "timestamp",
+    }, ["paper_title", "primary_keywords", "secondary_keywords", "technical_terms",
+        "domain_tags", "confidence_score", "extraction_method", "timestamp"]),
+    "paperless_uploads": ("paperless_uploads", {
+        "id": "id",
+        "paper_title": "paper_title",
+        "task_id": "task_id",
+        "status": "status",
+        "metadata": "metadata",
+        "timestamp": "timestamp",
+        "task_status": "task_status",
+        "document_id": "document_id",
+        "processing_seconds": "processing_seconds",
+    }, ["paper_title", "task_id", "status", "metadata", "timestamp"]),
+}
+HISTORY_MAX_PAGE_SIZE = 1000
+
+
+def _encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """Opaque keyset cursor for the last row of a page"""
+    raw = json.dumps([timestamp.isoformat(), row_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _history_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _bucket_start(day: date, unit: str) -> date:
+    """First day of the bucket containing `day` (weeks start on Monday, like date_trunc)"""
+    if unit == "week":
+        return day - timedelta(days=day.weekday())
+    if unit == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(start: date, unit: str) -> date:
+    """First day of the bucket after the one starting on `start`"""
+    if unit == "week":
+        return start + timedelta(days=7)
+    if unit == "month":
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
 
 @dataclass
 class ActivityEvent:
@@ -57,11 +153,140 @@ class MetricsTracker:
             'password': os.getenv('PG_PASSWORD', 'mypassword'),
             'database': os.getenv('PG_DB', 'mydatabase')
         }
+        self.pool_min_size = int(os.getenv('PG_POOL_MIN', '1'))
+        self.pool_max_size = int(os.getenv('PG_POOL_MAX', '10'))
+        # Connections idle for longer than this are pinged before being reused
+        self.pool_healthcheck_interval = float(
+            os.getenv('PG_POOL_HEALTHCHECK_INTERVAL', '30'))
+
+        # Monthly partitions are created this many months ahead; months of raw
+        # events kept before old partitions are detached or dropped (0 keeps all)
+        self.partition_premake_months = int(os.getenv('METRICS_PARTITION_PREMAKE', '3'))
+        self.retention_months = int(os.getenv('METRICS_RETENTION_MONTHS', '0'))
+        self.retention_action = os.getenv('METRICS_RETENTION_ACTION', 'detach')
+        # First days of months this process has made sure have partitions
+        self._partition_months = set()
+
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        # ThreadedConnectionPool raises instead of blocking when exhausted
+        self._pool_slots = threading.BoundedSemaphore(self.pool_max_size)
+        self._last_used: Dict[int, float] = {}
+
+        # Tracked events are written in batches off the request path
+        self.writer = MetricsWriter(self._write_batch)
+
+        # Moves whenever tracked data changes, so cached responses can be invalidated
+        self._versions = itertools.count(1)
+        self.data_version = 0
+
+        # import_trends buckets the writer has flushed past, keyed by (granularity, start).
+        # Past days change in place when late records or rebuilds land, which clears
+        # the affected buckets; the TTL bounds staleness from other processes
+        self.trend_cache_ttl = float(os.getenv('TREND_CACHE_TTL', '300'))
+        self.trend_cache_size = int(os.getenv('TREND_CACHE_SIZE', '1024'))
+        self._trend_cache: "OrderedDict[Tuple[str, date], Tuple[float, Dict[str, int]]]" = OrderedDict()
+        self._trend_generation = 0
+        self._trend_cache_lock = threading.Lock()
+
         self._ensure_tables_exist()
 
+    def _get_pool(self):
+        """Get the process-wide connection pool, creating it on first use"""
+        with self._pool_lock:
+            if self._pool is None or self._pool.closed:
+                self._pool = pg_pool.ThreadedConnectionPool(
+                    self.pool_min_size, self.pool_max_size, **self.db_config)
+                self._last_used = {}
+            return self._pool
+
+    def _is_healthy(self, conn) -> bool:
+        """Check a pooled connection is still usable before handing it out"""
+        if conn.closed:
+            return False
+        idle = time.monotonic() - self._last_used.get(id(conn), 0.0)
+        if idle < self.pool_healthcheck_interval:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _borrow(self, pool):
+        """Borrow a healthy connection, replacing dead ones transparently"""
+        for _ in range(self.pool_max_size + 1):
+            conn = pool.getconn()
+            if self._is_healthy(conn):
+                return conn
+            self._last_used.pop(id(conn), None)
+            pool.putconn(conn, close=True)
+        raise psycopg2.OperationalError("No healthy database connection available")
+
+    @contextmanager
     def _get_connection(self):
-        """Get database connection"""
-        return psycopg2.connect(**self.db_config)
+        """
+        Borrow a database connection from the pool.
+        Commits on success, rolls back on error, and discards connections
+        that failed at the network level so the pool reconnects.
+        """
+        self._pool_slots.acquire()
+        try:
+            try:
+                pool = self._get_pool()
+                conn = self._borrow(pool)
+            except psycopg2.OperationalError:
+                # The server may have restarted: rebuild the pool once
+                self._reset_pool()
+                pool = self._get_pool()
+                conn = self._borrow(pool)
+
+            broken = False
+            try:
+                yield conn
+                conn.commit()
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                broken = True
+                raise
+            except Exception:
+                if not conn.closed:
+                    conn.rollback()
+                raise
+            finally:
+                broken = broken or bool(conn.closed)
+                if broken:
+                    self._last_used.pop(id(conn), None)
+                else:
+                    self._last_used[id(conn)] = time.monotonic()
+                if pool.closed:
+                    # The pool was rebuilt while this connection was out
+                    conn.close()
+                else:
+                    pool.putconn(conn, close=broken)
+        finally:
+            self._pool_slots.release()
+
+    def connection(self):
+        """
+        Borrow a pooled connection for tables other modules keep in this database.
+        Same commit/rollback handling as the tracker's own queries.
+        """
+        return self._get_connection()
+
+    def close(self):
+        """Flush pending metrics and close every pooled connection"""
+        self.writer.stop()
+        self._reset_pool()
+
+    def _reset_pool(self):
+        """Close every pooled connection; the next borrow builds a fresh pool"""
+        with self._pool_lock:
+            if self._pool is not None and not self._pool.closed:
+                self._pool.closeall()
+            self._pool = None
+            self._last_used = {}
 
     def _ensure_tables_exist(self):
         """Ensure all required tables exist, create them if missing"""
@@ -80,6 +305,9 @@ class MetricsTracker:
                         print("Creating missing database tables...")
                         self._create_tables(cur)
                         print("Database tables created successfully!")
+
+                    self._apply_migrations(cur)
+                    self._maintain_partitions(cur)
         except Exception as e:
             print(f"Error ensuring database tables: {e}")
 
@@ -99,23 +327,29 @@ class MetricsTracker:
             )
         """)
 
+        # Raw event tables are range-partitioned by month on timestamp, so
+        # date-filtered queries only touch the months they ask for and old
+        # months can be detached or dropped whole (see create_metrics_partitions).
+        # The primary key must include the partition key.
+
         # Individual activity events
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS activity_events (
-                id SERIAL PRIMARY KEY,
+                id SERIAL,
                 timestamp TIMESTAMP NOT NULL,
                 event_type VARCHAR(50) NOT NULL,
                 title TEXT NOT NULL,
                 status VARCHAR(20) NOT NULL,
                 details JSONB,
-                date DATE GENERATED ALWAYS AS (timestamp::DATE) STORED
-            )
+                date DATE GENERATED ALWAYS AS (timestamp::DATE) STORED,
+                PRIMARY KEY (id, timestamp)
+            ) PARTITION BY RANGE (timestamp)
         """)
 
         # Keyword extraction history
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS keyword_extractions (
-                id SERIAL PRIMARY KEY,
+                id SERIAL,
                 timestamp TIMESTAMP NOT NULL,
                 paper_title TEXT NOT NULL,
                 primary_keywords TEXT[],
@@ -124,21 +358,28 @@ class MetricsTracker:
                 domain_tags TEXT[],
                 confidence_score DECIMAL(3,2),
                 extraction_method VARCHAR(50),
-                date DATE GENERATED ALWAYS AS (timestamp::DATE) STORED
-            )
+                date DATE GENERATED ALWAYS AS (timestamp::DATE) STORED,
+                PRIMARY KEY (id, timestamp)
+            ) PARTITION BY RANGE (timestamp)
         """)
 
         # Paperless upload history
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS paperless_uploads (
-                id SERIAL PRIMARY KEY,
+                id SERIAL,
                 timestamp TIMESTAMP NOT NULL,
                 paper_title TEXT NOT NULL,
                 task_id VARCHAR(100),
                 status VARCHAR(20) NOT NULL,
                 metadata JSONB,
-                date DATE GENERATED ALWAYS AS (timestamp::DATE) STORED
-            )
+                task_status VARCHAR(20),
+                document_id INTEGER,
+                processing_seconds DOUBLE PRECISION,
+                completed_at TIMESTAMP,
+                task_error TEXT,
+                date DATE GENERATED ALWAYS AS (timestamp::DATE) STORED,
+                PRIMARY KEY (id, timestamp)
+            ) PARTITION BY RANGE (timestamp)
         """)
 
         # Create indexes
@@ -148,139 +389,818 @@ class MetricsTracker:
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_paperless_uploads_date ON paperless_uploads(date)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_daily_metrics_date ON daily_metrics(date)")
 
-        # Create function to update daily metrics
+    def _apply_migrations(self, cursor):
+        """Apply idempotent schema upgrades on top of the base tables"""
+        # First, so the triggers and indexes below land on the partitioned tables
+        self._create_partitioning(cursor)
+
+        # Running totals so the daily average can be maintained incrementally
+        cursor.execute("""
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = 'public' AND table_name = 'daily_metrics'
+            AND column_name = 'confidence_score_sum'
+        """)
+        needs_backfill = cursor.fetchone() is None
+        cursor.execute("ALTER TABLE daily_metrics ADD COLUMN IF NOT EXISTS confidence_score_sum DECIMAL(12,2) DEFAULT 0")
+        cursor.execute("ALTER TABLE daily_metrics ADD COLUMN IF NOT EXISTS confidence_score_count INTEGER DEFAULT 0")
+
+        # Rebuild daily metrics for a date range from the raw tables (repair/backfill)
+        cursor.execute("""
+            CREATE OR REPLACE FUNCTION rebuild_daily_metrics(start_date DATE, end_date DATE)
+            RETURNS INTEGER AS $$
+            DECLARE
+                rebuilt INTEGER;
+            BEGIN
+                -- Block incremental updates until the rebuilt rows are committed
+                LOCK TABLE daily_metrics IN SHARE ROW EXCLUSIVE MODE;
+
+                DELETE FROM daily_metrics WHERE date BETWEEN start_date AND end_date;
+
+                -- Raw tables are filtered on timestamp, the partition key, so only months in range are read
+                INSERT INTO daily_metrics (date, papers_imported, papers_uploaded, keywords_extracted,
+                                           confidence_score_sum, confidence_score_count, avg_confidence_score)
+                SELECT
+                    d.date,
+                    COALESCE(ae.imported, 0),
+                    COALESCE(ae.uploaded, 0),
+                    COALESCE(ke.extracted, 0),
+                    COALESCE(ke.confidence_sum, 0),
+                    COALESCE(ke.confidence_count, 0),
+                    COALESCE(ROUND(ke.confidence_sum / NULLIF(ke.confidence_count, 0), 2), 0.0)
+                FROM (
+                    SELECT date FROM activity_events WHERE timestamp >= start_date AND timestamp < end_date + 1
+                    UNION
+                    SELECT date FROM keyword_extractions WHERE timestamp >= start_date AND timestamp < end_date + 1
+                ) d
+                LEFT JOIN (
+                    SELECT date,
+                        COUNT(*) FILTER (WHERE event_type = 'import' AND status = 'success') AS imported,
+                        COUNT(*) FILTER (WHERE event_type = 'paperless_upload' AND status = 'success') AS uploaded
+                    FROM activity_events
+                    WHERE timestamp >= start_date AND timestamp < end_date + 1
+                    GROUP BY date
+                ) ae ON ae.date = d.date
+                LEFT JOIN (
+                    SELECT date,
+                        COUNT(*) AS extracted,
+                        SUM(confidence_score) AS confidence_sum,
+                        COUNT(confidence_score) AS confidence_count
+                    FROM keyword_extractions
+                    WHERE timestamp >= start_date AND timestamp < end_date + 1
+                    GROUP BY date
+                ) ke ON ke.date = d.date;
+
+                GET DIAGNOSTICS rebuilt = ROW_COUNT;
+                RETURN rebuilt;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+
+        # Kept for compatibility: a single-day rebuild
         cursor.execute("""
             CREATE OR REPLACE FUNCTION update_daily_metrics(target_date DATE)
             RETURNS VOID AS $$
             BEGIN
-                INSERT INTO daily_metrics (date, papers_imported, papers_uploaded, keywords_extracted, avg_confidence_score)
-                SELECT 
-                    target_date,
-                    COALESCE(SUM(CASE WHEN event_type = 'import' AND status = 'success' THEN 1 ELSE 0 END), 0),
-                    COALESCE(SUM(CASE WHEN event_type = 'paperless_upload' AND status = 'success' THEN 1 ELSE 0 END), 0),
-                    COALESCE(COUNT(DISTINCT ke.id), 0),
-                    COALESCE(AVG(ke.confidence_score), 0.0)
-                FROM activity_events ae
-                LEFT JOIN keyword_extractions ke ON ke.date = target_date
-                WHERE ae.date = target_date
+                PERFORM rebuild_daily_metrics(target_date, target_date);
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+
+        # Incremental maintenance: each INSERT statement adds its per-day deltas
+        cursor.execute("""
+            CREATE OR REPLACE FUNCTION daily_metrics_add_activity()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                INSERT INTO daily_metrics (date, papers_imported, papers_uploaded)
+                SELECT date,
+                    COUNT(*) FILTER (WHERE event_type = 'import' AND status = 'success'),
+                    COUNT(*) FILTER (WHERE event_type = 'paperless_upload' AND status = 'success')
+                FROM new_rows
+                GROUP BY date
+                ON CONFLICT (date) DO UPDATE SET
+                    papers_imported = daily_metrics.papers_imported + EXCLUDED.papers_imported,
+                    papers_uploaded = daily_metrics.papers_uploaded + EXCLUDED.papers_uploaded,
+                    updated_at = NOW();
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        cursor.execute("""
+            CREATE OR REPLACE FUNCTION daily_metrics_add_extractions()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                INSERT INTO daily_metrics (date, keywords_extracted, confidence_score_sum,
+                                           confidence_score_count, avg_confidence_score)
+                SELECT date,
+                    COUNT(*),
+                    COALESCE(SUM(confidence_score), 0),
+                    COUNT(confidence_score),
+                    COALESCE(ROUND(SUM(confidence_score) / NULLIF(COUNT(confidence_score), 0), 2), 0.0)
+                FROM new_rows
+                GROUP BY date
                 ON CONFLICT (date) DO UPDATE SET
-                    papers_imported = EXCLUDED.papers_imported,
-                    papers_uploaded = EXCLUDED.papers_uploaded,
-                    keywords_extracted = EXCLUDED.keywords_extracted,
-                    avg_confidence_score = EXCLUDED.avg_confidence_score,
+                    keywords_extracted = daily_metrics.keywords_extracted + EXCLUDED.keywords_extracted,
+                    confidence_score_sum = daily_metrics.confidence_score_sum + EXCLUDED.confidence_score_sum,
+                    confidence_score_count = daily_metrics.confidence_score_count + EXCLUDED.confidence_score_count,
+                    avg_confidence_score = COALESCE(ROUND(
+                        (daily_metrics.confidence_score_sum + EXCLUDED.confidence_score_sum)
+                        / NULLIF(daily_metrics.confidence_score_count + EXCLUDED.confidence_score_count, 0), 2), 0.0),
                     updated_at = NOW();
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        cursor.execute("DROP TRIGGER IF EXISTS trg_activity_events_daily_metrics ON activity_events")
+        cursor.execute("""
+            CREATE TRIGGER trg_activity_events_daily_metrics
+            AFTER INSERT ON activity_events
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION daily_metrics_add_activity()
+        """)
+        cursor.execute("DROP TRIGGER IF EXISTS trg_keyword_extractions_daily_metrics ON keyword_extractions")
+        cursor.execute("""
+            CREATE TRIGGER trg_keyword_extractions_daily_metrics
+            AFTER INSERT ON keyword_extractions
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION daily_metrics_add_extractions()
+        """)
+
+        # Paperless consumption outcome, filled in by the task poller
+        cursor.execute("ALTER TABLE paperless_uploads ADD COLUMN IF NOT EXISTS task_status VARCHAR(20)")
+        cursor.execute("ALTER TABLE paperless_uploads ADD COLUMN IF NOT EXISTS document_id INTEGER")
+        cursor.execute("ALTER TABLE paperless_uploads ADD COLUMN IF NOT EXISTS processing_seconds DOUBLE PRECISION")
+        cursor.execute("ALTER TABLE paperless_uploads ADD COLUMN IF NOT EXISTS completed_at TIMESTAMP")
+        cursor.execute("ALTER TABLE paperless_uploads ADD COLUMN IF NOT EXISTS task_error TEXT")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_paperless_uploads_task_id ON paperless_uploads(task_id)")
+        # Keyset pagination of history on (timestamp, id); also serves ORDER BY timestamp DESC LIMIT n
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_activity_events_ts_id ON activity_events(timestamp DESC, id DESC)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_keyword_extractions_ts_id ON keyword_extractions(timestamp DESC, id DESC)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_paperless_uploads_ts_id ON paperless_uploads(timestamp DESC, id DESC)")
+        # Per-day counts by event type and status
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_activity_events_date_type_status ON activity_events(date, event_type, status)")
+        # Containment lookups such as "papers with keyword X"
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_keyword_extractions_primary_keywords ON keyword_extractions USING GIN (primary_keywords)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_keyword_extractions_domain_tags ON keyword_extractions USING GIN (domain_tags)")
+        # Substring title search; pg_trgm is a trusted extension, but keep going without it
+        cursor.execute("SAVEPOINT trigram_index")
+        try:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_keyword_extractions_title_trgm
+                ON keyword_extractions USING GIN (paper_title gin_trgm_ops)
+            """)
+            cursor.execute("RELEASE SAVEPOINT trigram_index")
+        except psycopg2.Error as e:
+            print(f"Error creating paper title trigram index: {e}")
+            cursor.execute("ROLLBACK TO SAVEPOINT trigram_index")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_paperless_uploads_pending ON paperless_uploads(timestamp)
+            WHERE completed_at IS NULL AND status = 'success'
+        """)
+
+        self._create_rollups(cursor)
+
+        # Durable tier of the LLM keyword extraction cache (see keyword_cache.py)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS keyword_extraction_cache (
+                cache_key CHAR(64) PRIMARY KEY,
+                result JSONB NOT NULL,
+                model VARCHAR(100),
+                prompt_version VARCHAR(50),
+                created_at TIMESTAMP DEFAULT NOW(),
+                expires_at TIMESTAMP NOT NULL
+            )
+        """)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_keyword_extraction_cache_expires ON keyword_extraction_cache(expires_at)")
+        cursor.execute("DELETE FROM keyword_extraction_cache WHERE expires_at <= NOW()")
+
+        if needs_backfill:
+            # Existing rows predate the running totals: rebuild all history once
+            cursor.execute("""
+                SELECT rebuild_daily_metrics(
+                    COALESCE(LEAST((SELECT MIN(date) FROM activity_events),
+                                   (SELECT MIN(date) FROM keyword_extractions)), CURRENT_DATE),
+                    CURRENT_DATE)
+            """)
+
+    def _create_partitioning(self, cursor):
+        """Create the partition maintenance functions and partition tables from older installs"""
+        # Monthly partitions named <table>_YYYY_MM for every month touched by a date range
+        cursor.execute("""
+            CREATE OR REPLACE FUNCTION create_metrics_partitions(start_date DATE, end_date DATE)
+            RETURNS INTEGER AS $$
+            DECLARE
+                parent TEXT;
+                part_start DATE;
+                part_name TEXT;
+                created INTEGER := 0;
+            BEGIN
+                -- Serialize concurrent writers creating the same month
+                PERFORM pg_advisory_xact_lock(hashtext('create_metrics_partitions'));
+
+                -- Tables still awaiting the partitioning migration are skipped
+                FOR parent IN
+                    SELECT relname FROM pg_class
+                    WHERE oid IN (to_regclass('activity_events'), to_regclass('keyword_extractions'),
+                                  to_regclass('paperless_uploads'))
+                    AND relkind = 'p'
+                LOOP
+                    part_start := date_trunc('month', start_date)::DATE;
+                    WHILE part_start <= end_date LOOP
+                        part_name := parent || '_' || to_char(part_start, 'YYYY_MM');
+                        IF to_regclass(part_name) IS NULL THEN
+                            EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                                           part_name, parent, part_start, (part_start + INTERVAL '1 month')::DATE);
+                            created := created + 1;
+                        END IF;
+                        part_start := (part_start + INTERVAL '1 month')::DATE;
+                    END LOOP;
+                END LOOP;
+                RETURN created;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+
+        # Retention: detach (or drop) every partition that ends on or before the cutoff
+        cursor.execute("""
+            CREATE OR REPLACE FUNCTION expire_metrics_partitions(cutoff DATE, drop_partitions BOOLEAN)
+            RETURNS INTEGER AS $$
+            DECLARE
+                part RECORD;
+                expired INTEGER := 0;
+            BEGIN
+                FOR part IN
+                    SELECT parent.relname AS parent, child.relname AS child
+                    FROM pg_inherits i
+                    JOIN pg_class parent ON parent.oid = i.inhparent
+                    JOIN pg_class child ON child.oid = i.inhrelid
+                    WHERE i.inhparent IN (to_regclass('activity_events'), to_regclass('keyword_extractions'),
+                                          to_regclass('paperless_uploads'))
+                    AND child.relname ~ '_[0-9]{4}_[0-9]{2}$'
+                    AND to_date(right(child.relname, 7), 'YYYY_MM') + INTERVAL '1 month' <= cutoff
+                    ORDER BY child.relname
+                LOOP
+                    EXECUTE format('ALTER TABLE %I DETACH PARTITION %I', part.parent, part.child);
+                    IF drop_partitions THEN
+                        EXECUTE format('DROP TABLE %I', part.child);
+                    ELSE
+                        -- Free the month's name so create_metrics_partitions can recreate it
+                        EXECUTE format('ALTER TABLE %I RENAME TO %I', part.child,
+                                       part.child || '_detached_' || to_char(clock_timestamp(), 'YYYYMMDDHH24MISS'));
+                    END IF;
+                    expired := expired + 1;
+                END LOOP;
+                RETURN expired;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+
+        for table in PARTITIONED_TABLES:
+            self._partition_table(cursor, table)
+
+    def _partition_table(self, cursor, table: str):
+        """
+        Migrate an unpartitioned event table from an older install: the rows are
+        copied into a new partitioned table of the same name in this transaction,
+        before any trigger exists on it, so daily_metrics and the rollups are not
+        counted twice. IDs are kept, so history cursors stay valid.
+        """
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", (table,))
+        row = cursor.fetchone()
+        if row is None or row[0] == 'p':
+            return
+
+        print(f"Partitioning {table} by month...")
+        legacy = f"{table}_unpartitioned"
+        cursor.execute(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+        cursor.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+
+        # Free the index, primary key and sequence names for the new table
+        cursor.execute("""
+            SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE i.indrelid = %s::regclass
+        """, (legacy,))
+        for (index,) in cursor.fetchall():
+            cursor.execute(f'ALTER INDEX "{index}" RENAME TO "{index[:48]}_unpartitioned"')
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", (legacy,))
+        sequence = cursor.fetchone()[0]
+        if sequence:
+            cursor.execute(f"ALTER SEQUENCE {sequence} RENAME TO {legacy}_id_seq")
+
+        self._create_tables(cursor)
+
+        cursor.execute("""
+            SELECT attname FROM pg_attribute
+            WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped AND attgenerated = ''
+            ORDER BY attnum
+        """, (legacy,))
+        columns = ", ".join(f'"{row[0]}"' for row in cursor.fetchall())
+        cursor.execute(f"SELECT create_metrics_partitions(MIN(timestamp)::DATE, MAX(timestamp)::DATE) FROM {legacy}")
+        cursor.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {legacy}")
+        migrated = cursor.rowcount
+        cursor.execute(f"""
+            SELECT setval(pg_get_serial_sequence('{table}', 'id'),
+                          (SELECT COALESCE(MAX(id), 0) + 1 FROM {legacy}), false)
+        """)
+        cursor.execute(f"DROP TABLE {legacy}")
+        print(f"Moved {migrated} {table} rows into monthly partitions")
+
+    def _maintain_partitions(self, cursor) -> Dict[str, int]:
+        """Create partitions ahead of time and apply the retention policy"""
+        cursor.execute("""
+            SELECT create_metrics_partitions(CURRENT_DATE, (CURRENT_DATE + make_interval(months => %s))::DATE)
+        """, (self.partition_premake_months,))
+        created = cursor.fetchone()[0]
+
+        expired = 0
+        if self.retention_months > 0:
+            # Keep the current month plus retention_months whole months before it
+            cursor.execute("""
+                SELECT expire_metrics_partitions(
+                    (date_trunc('month', CURRENT_DATE) - make_interval(months => %s))::DATE, %s)
+            """, (self.retention_months, self.retention_action == 'drop'))
+            expired = cursor.fetchone()[0]
+            if expired:
+                # Expired months no longer have a partition
+                self._partition_months.clear()
+        return {"created": created, "expired": expired}
+
+    def _retention_cutoff(self) -> Optional[date]:
+        """First month kept by the retention policy, or None when nothing expires"""
+        if self.retention_months <= 0:
+            return None
+        today = date.today()
+        month = today.year * 12 + today.month - 1 - self.retention_months
+        return date(month // 12, month % 12 + 1, 1)
+
+    def maintain_partitions(self) -> Dict[str, int]:
+        """
+        Create upcoming monthly partitions and detach or drop the ones past
+        METRICS_RETENTION_MONTHS. daily_metrics and the analytics rollups are
+        kept, so the dashboard still shows expired months; rebuilding them for
+        an expired range would empty it. Returns the partitions created and expired.
+        """
+        self.flush()
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                result = self._maintain_partitions(cur)
+        if result["expired"]:
+            self._invalidate_trends()
+            self._data_changed()
+        return result
+
+    def _create_rollups(self, cursor):
+        """Create the pre-aggregated analytics tables and the triggers that maintain them"""
+        cursor.execute("SELECT to_regclass('public.keyword_daily_counts')")
+        needs_backfill = cursor.fetchone()[0] is None
+
+        # Keyword, domain and upload counts per day, so the dashboard sums a few small rows
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS keyword_daily_counts (
+                date DATE NOT NULL,
+                keyword TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (date, keyword)
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS domain_daily_counts (
+                date DATE NOT NULL,
+                domain TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (date, domain)
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS upload_daily_stats (
+                date DATE PRIMARY KEY,
+                total INTEGER NOT NULL DEFAULT 0,
+                submitted INTEGER NOT NULL DEFAULT 0,
+                upload_errors INTEGER NOT NULL DEFAULT 0,
+                processing_errors INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+        # Rebuild the rollups for a date range from the raw tables (repair/backfill)
+        cursor.execute("""
+            CREATE OR REPLACE FUNCTION rebuild_analytics_rollups(start_date DATE, end_date DATE)
+            RETURNS INTEGER AS $$
+            DECLARE
+                rebuilt INTEGER;
+            BEGIN
+                -- Block incremental updates until the rebuilt rows are committed
+                LOCK TABLE keyword_daily_counts, domain_daily_counts, upload_daily_stats IN SHARE ROW EXCLUSIVE MODE;
+
+                DELETE FROM keyword_daily_counts WHERE date BETWEEN start_date AND end_date;
+                DELETE FROM domain_daily_counts WHERE date BETWEEN start_date AND end_date;
+                DELETE FROM upload_daily_stats WHERE date BETWEEN start_date AND end_date;
+
+                -- Raw tables are filtered on timestamp, the partition key, so only months in range are read
+                INSERT INTO keyword_daily_counts (date, keyword, count)
+                SELECT date, keyword, COUNT(*)
+                FROM keyword_extractions, unnest(primary_keywords) AS keyword
+                WHERE timestamp >= start_date AND timestamp < end_date + 1
+                GROUP BY date, keyword;
+
+                INSERT INTO domain_daily_counts (date, domain, count)
+                SELECT date, domain, COUNT(*)
+                FROM keyword_extractions, unnest(domain_tags) AS domain
+                WHERE timestamp >= start_date AND timestamp < end_date + 1
+                GROUP BY date, domain;
+
+                INSERT INTO upload_daily_stats (date, total, submitted, upload_errors, processing_errors)
+                SELECT date,
+                    COUNT(*),
+                    COUNT(*) FILTER (WHERE status = 'success'),
+                    COUNT(*) FILTER (WHERE status = 'error'),
+                    COUNT(*) FILTER (WHERE task_status = 'FAILURE')
+                FROM paperless_uploads
+                WHERE timestamp >= start_date AND timestamp < end_date + 1
+                GROUP BY date;
+
+                SELECT COUNT(*) INTO rebuilt FROM (
+                    SELECT date FROM keyword_daily_counts WHERE date BETWEEN start_date AND end_date
+                    UNION
+                    SELECT date FROM domain_daily_counts WHERE date BETWEEN start_date AND end_date
+                    UNION
+                    SELECT date FROM upload_daily_stats WHERE date BETWEEN start_date AND end_date
+                ) d;
+                RETURN rebuilt;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+
+        # Incremental maintenance: each statement adds its per-day deltas
+        cursor.execute("""
+            CREATE OR REPLACE FUNCTION analytics_rollups_add_extractions()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                -- Sorted so concurrent writers lock rollup rows in the same order
+                INSERT INTO keyword_daily_counts (date, keyword, count)
+                SELECT date, keyword, COUNT(*)
+                FROM new_rows, unnest(primary_keywords) AS keyword
+                GROUP BY date, keyword
+                ORDER BY date, keyword
+                ON CONFLICT (date, keyword) DO UPDATE SET
+                    count = keyword_daily_counts.count + EXCLUDED.count;
+
+                INSERT INTO domain_daily_counts (date, domain, count)
+                SELECT date, domain, COUNT(*)
+                FROM new_rows, unnest(domain_tags) AS domain
+                GROUP BY date, domain
+                ORDER BY date, domain
+                ON CONFLICT (date, domain) DO UPDATE SET
+                    count = domain_daily_counts.count + EXCLUDED.count;
+                RETURN NULL;
             END;
             $$ LANGUAGE plpgsql
         """)
+        cursor.execute("""
+            CREATE OR REPLACE FUNCTION analytics_rollups_add_uploads()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                INSERT INTO upload_daily_stats (date, total, submitted, upload_errors, processing_errors)
+                SELECT date,
+                    COUNT(*),
+                    COUNT(*) FILTER (WHERE status = 'success'),
+                    COUNT(*) FILTER (WHERE status = 'error'),
+                    COUNT(*) FILTER (WHERE task_status = 'FAILURE')
+                FROM new_rows
+                GROUP BY date
+                ORDER BY date
+                ON CONFLICT (date) DO UPDATE SET
+                    total = upload_daily_stats.total + EXCLUDED.total,
+                    submitted = upload_daily_stats.submitted + EXCLUDED.submitted,
+                    upload_errors = upload_daily_stats.upload_errors + EXCLUDED.upload_errors,
+                    processing_errors = upload_daily_stats.processing_errors + EXCLUDED.processing_errors;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        cursor.execute("""
+            CREATE OR REPLACE FUNCTION analytics_rollups_update_uploads()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                -- The task poller sets task_status after the fact; apply only the change
+                INSERT INTO upload_daily_stats (date, processing_errors)
+                SELECT n.date,
+                    SUM((n.task_status IS NOT DISTINCT FROM 'FAILURE')::INTEGER
+                        - (o.task_status IS NOT DISTINCT FROM 'FAILURE')::INTEGER)
+                FROM new_rows n
+                JOIN old_rows o ON o.id = n.id
+                WHERE n.task_status IS DISTINCT FROM o.task_status
+                GROUP BY n.date
+                HAVING SUM((n.task_status IS NOT DISTINCT FROM 'FAILURE')::INTEGER
+                           - (o.task_status IS NOT DISTINCT FROM 'FAILURE')::INTEGER) <> 0
+                ORDER BY n.date
+                ON CONFLICT (date) DO UPDATE SET
+                    processing_errors = upload_daily_stats.processing_errors + EXCLUDED.processing_errors;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        cursor.execute("DROP TRIGGER IF EXISTS trg_keyword_extractions_rollups ON keyword_extractions")
+        cursor.execute("""
+            CREATE TRIGGER trg_keyword_extractions_rollups
+            AFTER INSERT ON keyword_extractions
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION analytics_rollups_add_extractions()
+        """)
+        cursor.execute("DROP TRIGGER IF EXISTS trg_paperless_uploads_rollups_insert ON paperless_uploads")
+        cursor.execute("""
+            CREATE TRIGGER trg_paperless_uploads_rollups_insert
+            AFTER INSERT ON paperless_uploads
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION analytics_rollups_add_uploads()
+        """)
+        cursor.execute("DROP TRIGGER IF EXISTS trg_paperless_uploads_rollups_update ON paperless_uploads")
+        cursor.execute("""
+            CREATE TRIGGER trg_paperless_uploads_rollups_update
+            AFTER UPDATE ON paperless_uploads
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION analytics_rollups_update_uploads()
+        """)
+
+        if needs_backfill:
+            # The rollups start empty: build them from existing history once
+            cursor.execute("""
+                SELECT rebuild_analytics_rollups(
+                    COALESCE(LEAST((SELECT MIN(date) FROM keyword_extractions),
+                                   (SELECT MIN(date) FROM paperless_uploads)), CURRENT_DATE),
+                    CURRENT_DATE)
+            """)
 
     def track_paper_import(self, paper_title: str, success: bool = True):
         """Track a paper import event"""
-        try:
-            with self._get_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute("""
-                        INSERT INTO activity_events (timestamp, event_type, title, status, details)
-                        VALUES (%s, %s, %s, %s, %s)
-                    """, (
-                        datetime.now(),
-                        "import",
-                        f"Imported: {paper_title}",
-                        "success" if success else "error",
-                        json.dumps({"paper_title": paper_title})
-                    ))
-                    conn.commit()
-                    self._update_daily_metrics(date.today())
-        except Exception as e:
-            print(f"Error tracking paper import: {e}")
+        self._submit(ActivityEvent(
+            timestamp=datetime.now().isoformat(),
+            event_type="import",
+            title=f"Imported: {paper_title}",
+            status="success" if success else "error",
+            details={"paper_title": paper_title}
+        ))
 
     def track_keyword_extraction(self, extraction: KeywordExtraction):
         """Track a keyword extraction event"""
-        try:
-            with self._get_connection() as conn:
-                with conn.cursor() as cur:
-                    # Insert keyword extraction
-                    cur.execute("""
-                        INSERT INTO keyword_extractions 
-                        (timestamp, paper_title, primary_keywords, secondary_keywords, 
-                         technical_terms, domain_tags, confidence_score, extraction_method)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                    """, (
-                        datetime.now(),
-                        extraction.paper_title,
-                        extraction.primary_keywords,
-                        extraction.secondary_keywords,
-                        extraction.technical_terms,
-                        extraction.domain_tags,
-                        extraction.confidence_score,
-                        extraction.extraction_method
-                    ))
-
-                    # Insert activity event
-                    cur.execute("""
-                        INSERT INTO activity_events (timestamp, event_type, title, status, details)
-                        VALUES (%s, %s, %s, %s, %s)
-                    """, (
-                        datetime.now(),
-                        "keyword_extraction",
-                        f"Extracted keywords: {extraction.paper_title}",
-                        "success",
-                        json.dumps({
-                            "paper_title": extraction.paper_title,
-                            "confidence_score": extraction.confidence_score,
-                            "keyword_count": len(extraction.primary_keywords)
-                        })
-                    ))
-                    conn.commit()
-                    self._update_daily_metrics(date.today())
-        except Exception as e:
-            print(f"Error tracking keyword extraction: {e}")
+        self._submit(extraction)
+
+    def track_keyword_extractions(self, extractions: List[KeywordExtraction]):
+        """Track several keyword extractions, written together in one transaction"""
+        if extractions:
+            self._submit(list(extractions))
 
     def track_paperless_upload(self, upload: PaperlessUpload):
         """Track a Paperless upload event"""
+        self._submit(upload)
+
+    def _submit(self, record):
+        """Hand a record to the background writer"""
+        if not self.writer.submit(record):
+            kind = type(record[0] if isinstance(record, list) else record).__name__
+            print(f"Metrics queue full, dropped {kind} event")
+
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until every tracked event so far has been written"""
+        return self.writer.flush(timeout)
+
+    def get_writer_stats(self) -> Dict[str, Any]:
+        """Get background writer queue depth and counters"""
+        return self.writer.get_stats()
+
+    @staticmethod
+    def _parse_timestamp(value) -> datetime:
+        if isinstance(value, datetime):
+            return value
         try:
-            with self._get_connection() as conn:
-                with conn.cursor() as cur:
-                    # Insert upload record
-                    cur.execute("""
+            return datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            return datetime.now()
+
+    def _write_batch(self, records: List[Any]):
+        """Write a batch of tracked records with multi-row inserts in one transaction"""
+        activity_rows = []
+        extraction_rows = []
+        upload_rows = []
+
+        # Grouped submissions arrive as lists
+        flat_records = []
+        for record in records:
+            if isinstance(record, list):
+                flat_records.extend(record)
+            else:
+                flat_records.append(record)
+
+        months = set()
+        earliest = None
+        cutoff = self._retention_cutoff()
+        expired = 0
+        for record in flat_records:
+            timestamp = self._parse_timestamp(record.timestamp)
+            month = timestamp.date().replace(day=1)
+            if cutoff is not None and month < cutoff:
+                # Its partition is gone; inserting it would fail the whole batch
+                expired += 1
+                continue
+            months.add(month)
+            earliest = min(earliest or timestamp.date(), timestamp.date())
+
+            if isinstance(record, KeywordExtraction):
+                extraction_rows.append((
+                    timestamp,
+                    record.paper_title,
+                    record.primary_keywords,
+                    record.secondary_keywords,
+                    record.technical_terms,
+                    record.domain_tags,
+                    record.confidence_score,
+                    record.extraction_method
+                ))
+                activity_rows.append((
+                    timestamp,
+                    "keyword_extraction",
+                    f"Extracted keywords: {record.paper_title}",
+                    "success",
+                    json.dumps({
+                        "paper_title": record.paper_title,
+                        "confidence_score": record.confidence_score,
+                        "keyword_count": len(record.primary_keywords)
+                    })
+                ))
+            elif isinstance(record, PaperlessUpload):
+                upload_rows.append((
+                    timestamp,
+                    record.paper_title,
+                    record.task_id,
+                    record.status,
+                    json.dumps(record.metadata)
+                ))
+                activity_rows.append((
+                    timestamp,
+                    "paperless_upload",
+                    f"Uploaded to Paperless: {record.paper_title}",
+                    record.status,
+                    json.dumps({
+                        "paper_title": record.paper_title,
+                        "task_id": record.task_id
+                    })
+                ))
+            elif isinstance(record, ActivityEvent):
+                activity_rows.append((
+                    timestamp,
+                    record.event_type,
+                    record.title,
+                    record.status,
+                    json.dumps(record.details)
+                ))
+
+        if expired:
+            print(f"Skipped {expired} metrics older than the {self.retention_months}-month retention window")
+
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                # Rows for a month without a partition would be rejected
+                for month in sorted(months - self._partition_months):
+                    cur.execute("SELECT create_metrics_partitions(%s, %s)", (month, month))
+                if extraction_rows:
+                    execute_values(cur, """
+                        INSERT INTO keyword_extractions 
+                        (timestamp, paper_title, primary_keywords, secondary_keywords, 
+                         technical_terms, domain_tags, confidence_score, extraction_method)
+                        VALUES %s
+                    """, extraction_rows)
+                if upload_rows:
+                    execute_values(cur, """
                         INSERT INTO paperless_uploads (timestamp, paper_title, task_id, status, metadata)
-                        VALUES (%s, %s, %s, %s, %s)
-                    """, (
-                        datetime.now(),
-                        upload.paper_title,
-                        upload.task_id,
-                        upload.status,
-                        json.dumps(upload.metadata)
-                    ))
-
-                    # Insert activity event
-                    cur.execute("""
+                        VALUES %s
+                    """, upload_rows)
+                if activity_rows:
+                    execute_values(cur, """
                         INSERT INTO activity_events (timestamp, event_type, title, status, details)
-                        VALUES (%s, %s, %s, %s, %s)
-                    """, (
-                        datetime.now(),
-                        "paperless_upload",
-                        f"Uploaded to Paperless: {upload.paper_title}",
-                        upload.status,
-                        json.dumps({
-                            "paper_title": upload.paper_title,
-                            "task_id": upload.task_id
-                        })
-                    ))
-                    conn.commit()
-                    self._update_daily_metrics(date.today())
-        except Exception as e:
-            print(f"Error tracking paperless upload: {e}")
+                        VALUES %s
+                    """, activity_rows)
+                # daily_metrics is kept up to date by the insert triggers
+        self._partition_months |= months
+        if earliest is not None and earliest < date.today():
+            # Late records, e.g. flushed after midnight, change days that may be cached
+            self._invalidate_trends(earliest)
+        self._data_changed()
 
-    def _update_daily_metrics(self, target_date: date):
-        """Update daily metrics for a specific date"""
-        try:
-            with self._get_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute("SELECT update_daily_metrics(%s)",
-                                (target_date,))
-                    conn.commit()
-        except Exception as e:
-            print(f"Error updating daily metrics: {e}")
+    def _invalidate_trends(self, since: Optional[date] = None):
+        """Drop cached trend buckets that contain days from `since` on (every bucket by default)"""
+        with self._trend_cache_lock:
+            self._trend_generation += 1
+            if since is None:
+                self._trend_cache.clear()
+                return
+            stale = [key for key in self._trend_cache
+                     if _next_bucket(key[1], TREND_GRANULARITIES[key[0]][0]) > since]
+            for key in stale:
+                del self._trend_cache[key]
+
+    def _data_changed(self):
+        """Record that committed data changed (next() on a count is atomic)"""
+        self.data_version = next(self._versions)
+
+    def rebuild_daily_metrics(self, start_date: date, end_date: date) -> int:
+        """
+        Rebuild daily metrics for a date range from the raw event tables.
+        Used to repair drift or backfill history; returns the number of days written.
+        """
+        self.flush()
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT rebuild_daily_metrics(%s, %s)",
+                            (start_date, end_date))
+                rebuilt = cur.fetchone()[0]
+        self._invalidate_trends(start_date)
+        self._data_changed()
+        return rebuilt
+
+    def get_pending_paperless_tasks(self, limit: int = 500) -> List[str]:
+        """Get task IDs of queued uploads whose Paperless outcome is not known yet"""
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT task_id FROM paperless_uploads
+                    WHERE completed_at IS NULL AND status = 'success' AND task_id <> ''
+                    ORDER BY timestamp
+                    LIMIT %s
+                """, (limit,))
+                return [row[0] for row in cur.fetchall()]
+
+    def resolve_paperless_tasks(self, outcomes: List[Dict[str, Any]]) -> int:
+        """
+        Record final Paperless task outcomes (task_status, document_id,
+        processing_seconds, completed_at, error). Returns the number of uploads updated.
+        """
+        if not outcomes:
+            return 0
+        rows = [(
+            outcome["task_id"],
+            outcome["task_status"],
+            outcome.get("document_id"),
+            outcome.get("processing_seconds"),
+            outcome.get("completed_at") or datetime.now(),
+            outcome.get("error")
+        ) for outcome in outcomes]
+
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                (updated, earliest), = execute_values(cur, """
+                    WITH resolved AS (
+                        UPDATE paperless_uploads AS p SET
+                            task_status = v.task_status,
+                            document_id = v.document_id,
+                            processing_seconds = v.processing_seconds,
+                            completed_at = v.completed_at,
+                            task_error = v.task_error
+                        FROM (VALUES %s) AS v(task_id, task_status, document_id,
+                                              processing_seconds, completed_at, task_error)
+                        WHERE p.task_id = v.task_id AND p.completed_at IS NULL
+                        RETURNING p.date
+                    )
+                    SELECT COUNT(*), MIN(date) FROM resolved
+                """, rows,
+                    template="(%s, %s, %s::integer, %s::double precision, %s::timestamp, %s)",
+                    page_size=len(rows), fetch=True)
+        if updated:
+            # The uploads' days change after the fact
+            self._invalidate_trends(earliest)
+            self._data_changed()
+        return updated
+
+    def expire_paperless_tasks(self, queued_before: datetime) -> int:
+        """Give up on queued uploads that Paperless never reported back on"""
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    WITH expired AS (
+                        UPDATE paperless_uploads SET task_status = 'UNKNOWN', completed_at = NOW()
+                        WHERE completed_at IS NULL AND status = 'success' AND timestamp < %s
+                        RETURNING date
+                    )
+                    SELECT COUNT(*), MIN(date) FROM expired
+                """, (queued_before,))
+                expired, earliest = cur.fetchone()
+        if expired:
+            self._invalidate_trends(earliest)
+            self._data_changed()
+        return expired
+
+    def rebuild_analytics_rollups(self, start_date: date, end_date: date) -> int:
+        """
+        Rebuild the keyword, domain and upload rollups for a date range from the raw tables.
+        Returns the number of days that have rollup rows afterwards.
+        """
+        self.flush()
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT rebuild_analytics_rollups(%s, %s)",
+                            (start_date, end_date))
+                rebuilt = cur.fetchone()[0]
+        self._data_changed()
+        return rebuilt
 
     def get_dashboard_stats(self) -> Dict[str, Any]:
         """Get current dashboard statistics"""
@@ -342,17 +1262,103 @@ class MetricsTracker:
                 }
             }
 
+    def get_import_trends(self, granularity: str = "daily", start_date: Optional[date] = None,
+                          end_date: Optional[date] = None) -> List[Dict[str, Any]]:
+        """
+        Get papers imported, uploaded and keywords extracted per day, week or month.
+
+        Buckets are summed from daily_metrics with date_trunc, and the range is
+        widened to whole buckets. Buckets the metrics writer has flushed past are
+        kept in memory for trend_cache_ttl seconds, until a write changes one of
+        their days, so usually only open buckets are queried again.
+        """
+        if granularity not in TREND_GRANULARITIES:
+            raise ValueError(
+                f"Unknown granularity '{granularity}', use one of {', '.join(TREND_GRANULARITIES)}")
+        unit, default_buckets = TREND_GRANULARITIES[granularity]
+
+        end_date = end_date or date.today()
+        if start_date is None:
+            start_date = _bucket_start(end_date, unit)
+            for _ in range(default_buckets - 1):
+                start_date = _bucket_start(start_date - timedelta(days=1), unit)
+        if start_date > end_date:
+            raise ValueError("Start date must be before end date")
+
+        buckets = []
+        bucket = _bucket_start(start_date, unit)
+        while bucket <= end_date:
+            buckets.append(bucket)
+            if len(buckets) > MAX_TREND_BUCKETS:
+                raise ValueError(
+                    f"Range spans more than {MAX_TREND_BUCKETS} {granularity} buckets")
+            bucket = _next_bucket(bucket, unit)
+
+        series = {}
+        now = time.monotonic()
+        with self._trend_cache_lock:
+            generation = self._trend_generation
+            for b in buckets:
+                entry = self._trend_cache.get((granularity, b))
+                if entry is not None and now - entry[0] < self.trend_cache_ttl:
+                    self._trend_cache.move_to_end((granularity, b))
+                    series[b] = entry[1]
+                else:
+                    series[b] = None
+        missing = [b for b in buckets if series[b] is None]
+
+        if missing:
+            # Days before this have every submitted record written
+            flushed_through = datetime.fromtimestamp(self.writer.flushed_through()).date()
+            with self._get_connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    cur.execute("""
+                        SELECT
+                            date_trunc(%s, date)::date as period,
+                            SUM(papers_imported) as papers_imported,
+                            SUM(papers_uploaded) as papers_uploaded,
+                            SUM(keywords_extracted) as keywords_extracted
+                        FROM daily_metrics
+                        WHERE date BETWEEN %s AND %s
+                        GROUP BY period
+                    """, (unit, missing[0], _next_bucket(buckets[-1], unit) - timedelta(days=1)))
+                    rows = {row['period']: row for row in cur.fetchall()}
+
+            closed = {}
+            for b in missing:
+                row = rows.get(b) or {}
+                series[b] = {
+                    "papers_imported": int(row.get('papers_imported') or 0),
+                    "papers_uploaded": int(row.get('papers_uploaded') or 0),
+                    "keywords_extracted": int(row.get('keywords_extracted') or 0)
+                }
+                if _next_bucket(b, unit) <= flushed_through:
+                    closed[(granularity, b)] = series[b]
+            with self._trend_cache_lock:
+                # Past days changed while querying: what was read may already be stale
+                if generation == self._trend_generation:
+                    for key, values in closed.items():
+                        self._trend_cache[key] = (now, values)
+                        self._trend_cache.move_to_end(key)
+                    while len(self._trend_cache) > self.trend_cache_size:
+                        self._trend_cache.popitem(last=False)
+
+        return [{"period": b.isoformat(), **series[b]} for b in buckets]
+
     def get_dashboard_analytics(self) -> Dict[str, Any]:
         """Get detailed analytics for dashboard"""
         try:
+            import_trends = {
+                granularity: self.get_import_trends(granularity)
+                for granularity in TREND_GRANULARITIES
+            }
+
             with self._get_connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                    # Get keyword analytics
+                    # Get keyword analytics from the daily rollup
                     cur.execute("""
-                        SELECT 
-                            unnest(primary_keywords) as keyword,
-                            COUNT(*) as count
-                        FROM keyword_extractions 
+                        SELECT keyword, SUM(count) as count
+                        FROM keyword_daily_counts
                         WHERE date >= %s
                         GROUP BY keyword
                         ORDER BY count DESC
@@ -360,18 +1366,16 @@ class MetricsTracker:
                     """, (date.today() - timedelta(days=30),))
                     keyword_counts = cur.fetchall()
 
-                    # Get domain distribution
+                    # Get domain distribution from the daily rollup
                     cur.execute("""
-                        SELECT 
-                            unnest(domain_tags) as domain,
-                            COUNT(*) as count
-                        FROM keyword_extractions 
+                        SELECT domain, SUM(count) as count
+                        FROM domain_daily_counts
                         WHERE date >= %s
                         GROUP BY domain
                         ORDER BY count DESC
                     """, (date.today() - timedelta(days=30),))
                     domain_distribution = {
-                        row['domain']: row['count'] for row in cur.fetchall()}
+                        row['domain']: int(row['count']) for row in cur.fetchall()}
 
                     # Get confidence trends (last 20 extractions)
                     cur.execute("""
@@ -382,36 +1386,61 @@ class MetricsTracker:
                     """)
                     confidence_trends = cur.fetchall()
 
-                    # Get upload success rate
+                    # Get upload and consumption failures per day from the daily rollup
                     cur.execute("""
-                        SELECT 
-                            COUNT(*) as total,
-                            COUNT(CASE WHEN status = 'success' THEN 1 END) as successful
-                        FROM paperless_uploads 
-                        WHERE date >= %s
+                        SELECT date, total, upload_errors, processing_errors,
+                            submitted - processing_errors as successful
+                        FROM upload_daily_stats
+                        WHERE date >= %s AND total > 0
+                        ORDER BY date
                     """, (date.today() - timedelta(days=30),))
-                    upload_stats = cur.fetchone()
+                    error_rates = cur.fetchall()
 
+                    # Get upload success rate (uploads Paperless failed to consume count as failures)
+                    total_uploads = sum(row['total'] for row in error_rates)
                     success_rate = 0.0
-                    if upload_stats['total'] > 0:
-                        success_rate = upload_stats['successful'] / \
-                            upload_stats['total']
+                    if total_uploads > 0:
+                        success_rate = sum(
+                            row['successful'] for row in error_rates) / total_uploads
+
+                    # Get Paperless consumption times per day (timestamp range prunes partitions)
+                    cur.execute("""
+                        SELECT
+                            date,
+                            COUNT(*) as count,
+                            AVG(processing_seconds) as avg_seconds,
+                            PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY processing_seconds) as p95_seconds,
+                            MAX(processing_seconds) as max_seconds
+                        FROM paperless_uploads
+                        WHERE timestamp >= %s AND task_status = 'SUCCESS' AND processing_seconds IS NOT NULL
+                        GROUP BY date
+                        ORDER BY date
+                    """, (date.today() - timedelta(days=30),))
+                    processing_times = cur.fetchall()
 
                     return {
-                        "import_trends": {
-                            "daily": [],  # Could be enhanced with time-based analysis
-                            "weekly": [],
-                            "monthly": []
-                        },
+                        "import_trends": import_trends,
                         "keyword_analytics": {
-                            "most_used_keywords": [{"keyword": row['keyword'], "count": row['count']} for row in keyword_counts],
+                            "most_used_keywords": [{"keyword": row['keyword'], "count": int(row['count'])} for row in keyword_counts],
                             "domain_distribution": domain_distribution,
                             "confidence_trends": [{"timestamp": row['timestamp'].isoformat(), "confidence": float(row['confidence'])} for row in confidence_trends]
                         },
                         "paperless_analytics": {
                             "upload_success_rate": success_rate,
-                            "processing_times": [],  # Could be enhanced
-                            "error_rates": []
+                            "processing_times": [{
+                                "date": row['date'].isoformat(),
+                                "count": row['count'],
+                                "avg_seconds": round(float(row['avg_seconds']), 2),
+                                "p95_seconds": round(float(row['p95_seconds']), 2),
+                                "max_seconds": round(float(row['max_seconds']), 2)
+                            } for row in processing_times],
+                            "error_rates": [{
+                                "date": row['date'].isoformat(),
+                                "total": row['total'],
+                                "upload_errors": row['upload_errors'],
+                                "processing_errors": row['processing_errors'],
+                                "error_rate": (row['upload_errors'] + row['processing_errors']) / row['total']
+                            } for row in error_rates]
                         }
                     }
         except Exception as e:
@@ -434,39 +1463,83 @@ class MetricsTracker:
                 }
             }
 
-    def get_document_history_by_date(self, target_date: date) -> Dict[str, Any]:
-        """Get all documents processed on a specific date"""
+    def _query_history(self, cur, kind: str, start_date: date, end_date: date,
+                       limit: Optional[int] = None, cursor: Optional[str] = None,
+                       fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Read one page of a history source, newest first, keyset-paginated on (timestamp, id).
+        Returns the projected items and the cursor for the next page (None on the last page).
+        """
+        if kind not in HISTORY_SOURCES:
+            raise ValueError(
+                f"Unknown history kind '{kind}', use one of {', '.join(HISTORY_SOURCES)}")
+        table, columns, default_fields = HISTORY_SOURCES[kind]
+        fields = fields or default_fields
+        unknown = [field for field in fields if field not in columns]
+        if unknown:
+            raise ValueError(
+                f"Unknown {kind} fields: {', '.join(unknown)}; available: {', '.join(columns)}")
+        if limit is not None and not 1 <= limit <= HISTORY_MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {HISTORY_MAX_PAGE_SIZE}")
+
+        # A timestamp range (rather than date) lets the (timestamp, id) index serve both filters
+        conditions = ["timestamp >= %s", "timestamp < %s"]
+        params: List[Any] = [
+            datetime.combine(start_date, datetime.min.time()),
+            datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+        ]
+        if cursor:
+            conditions.append("(timestamp, id) < (%s, %s)")
+            params.extend(_decode_cursor(cursor))
+
+        # Field names come from the whitelist above, never from the request
+        projection = ", ".join(f'{columns[field]} AS "{field}"' for field in fields)
+        sql = f"""
+            SELECT {projection}, timestamp AS _cursor_ts, id AS _cursor_id
+            FROM {table}
+            WHERE {" AND ".join(conditions)}
+            ORDER BY timestamp DESC, id DESC
+        """
+        if limit is not None:
+            sql += " LIMIT %s"
+            params.append(limit + 1)
+        cur.execute(sql, params)
+        rows = cur.fetchall()
+
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1]['_cursor_ts'], rows[-1]['_cursor_id'])
+
+        return {
+            "items": [{field: _history_value(row[field]) for field in fields} for row in rows],
+            "next_cursor": next_cursor
+        }
+
+    def get_history_page(self, kind: str, start_date: date, end_date: date,
+                         limit: int = 100, cursor: Optional[str] = None,
+                         fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get one page of activities, keyword extractions or Paperless uploads for a date range"""
+        with self._get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                page = self._query_history(
+                    cur, kind, start_date, end_date, limit, cursor, fields)
+        return {"kind": kind, **page}
+
+    def get_document_history_by_date(self, target_date: date, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get all documents processed on a specific date.
+        With `limit`, each list holds only its first page and `next_cursors` continues it
+        through get_history_page.
+        """
         try:
             with self._get_connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                    # Get all activities for the date
-                    cur.execute("""
-                        SELECT event_type, title, timestamp, status, details
-                        FROM activity_events 
-                        WHERE date = %s
-                        ORDER BY timestamp DESC
-                    """, (target_date,))
-                    activities = cur.fetchall()
-
-                    # Get keyword extractions for the date
-                    cur.execute("""
-                        SELECT paper_title, primary_keywords, secondary_keywords, 
-                               technical_terms, domain_tags, confidence_score, 
-                               extraction_method, timestamp
-                        FROM keyword_extractions 
-                        WHERE date = %s
-                        ORDER BY timestamp DESC
-                    """, (target_date,))
-                    keyword_extractions = cur.fetchall()
-
-                    # Get paperless uploads for the date
-                    cur.execute("""
-                        SELECT paper_title, task_id, status, metadata, timestamp
-                        FROM paperless_uploads 
-                        WHERE date = %s
-                        ORDER BY timestamp DESC
-                    """, (target_date,))
-                    uploads = cur.fetchall()
+                    # Get activities, keyword extractions and paperless uploads for the date
+                    pages = {
+                        kind: self._query_history(cur, kind, target_date, target_date, limit)
+                        for kind in HISTORY_SOURCES
+                    }
 
                     # Get daily metrics for the date
                     cur.execute("""
@@ -475,7 +1548,7 @@ class MetricsTracker:
                     """, (target_date,))
                     daily_metrics = cur.fetchone()
 
-                    return {
+                    history = {
                         "date": target_date.isoformat(),
                         "daily_metrics": {
                             "papers_imported": daily_metrics['papers_imported'] if daily_metrics else 0,
@@ -483,37 +1556,16 @@ class MetricsTracker:
                             "keywords_extracted": daily_metrics['keywords_extracted'] if daily_metrics else 0,
                             "avg_confidence_score": float(daily_metrics['avg_confidence_score']) if daily_metrics else 0.0
                         },
-                        "activities": [
-                            {
-                                "type": activity['event_type'],
-                                "title": activity['title'],
-                                "timestamp": activity['timestamp'].isoformat(),
-                                "status": activity['status'],
-                                "details": activity['details']
-                            } for activity in activities
-                        ],
-                        "keyword_extractions": [
-                            {
-                                "paper_title": ke['paper_title'],
-                                "primary_keywords": ke['primary_keywords'],
-                                "secondary_keywords": ke['secondary_keywords'],
-                                "technical_terms": ke['technical_terms'],
-                                "domain_tags": ke['domain_tags'],
-                                "confidence_score": float(ke['confidence_score']),
-                                "extraction_method": ke['extraction_method'],
-                                "timestamp": ke['timestamp'].isoformat()
-                            } for ke in keyword_extractions
-                        ],
-                        "paperless_uploads": [
-                            {
-                                "paper_title": upload['paper_title'],
-                                "task_id": upload['task_id'],
-                                "status": upload['status'],
-                                "metadata": upload['metadata'],
-                                "timestamp": upload['timestamp'].isoformat()
-                            } for upload in uploads
-                        ]
+                        "activities": pages["activities"]["items"],
+                        "keyword_extractions": pages["keyword_extractions"]["items"],
+                        "paperless_uploads": pages["paperless_uploads"]["items"]
                     }
+                    if limit is not None:
+                        history["next_cursors"] = {
+                            kind: page["next_cursor"] for kind, page in pages.items()}
+                    return history
+        except ValueError:
+            raise
         except Exception as e:
             print(f"Error getting document history: {e}")
             return {
@@ -524,6 +1576,77 @@ class MetricsTracker:
                 "paperless_uploads": []
             }
 
+    def search_keyword_extractions(self, keywords: Optional[List[str]] = None, match: str = "all",
+                                   title: Optional[str] = None, domains: Optional[List[str]] = None,
+                                   start_date: Optional[date] = None, end_date: Optional[date] = None,
+                                   limit: int = 50, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Search keyword extractions, newest first, keyset-paginated on (timestamp, id).
+        `keywords` are matched exactly against primary_keywords, all of them or any
+        of them depending on `match`; `domains` must all be tagged; `title` is a
+        case-insensitive substring of the paper title.
+        """
+        if match not in ("all", "any"):
+            raise ValueError("match must be 'all' or 'any'")
+        if not 1 <= limit <= HISTORY_MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {HISTORY_MAX_PAGE_SIZE}")
+
+        # Array containment/overlap and ILIKE are served by the GIN and trigram indexes
+        conditions = []
+        params: List[Any] = []
+        if keywords:
+            conditions.append(
+                f"primary_keywords {'@>' if match == 'all' else '&&'} %s::TEXT[]")
+            params.append(keywords)
+        if domains:
+            conditions.append("domain_tags @> %s::TEXT[]")
+            params.append(domains)
+        if title:
+            escaped = title.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conditions.append("paper_title ILIKE %s")
+            params.append(f"%{escaped}%")
+        # Timestamp bounds prune the monthly partitions
+        if start_date:
+            conditions.append("timestamp >= %s")
+            params.append(datetime.combine(start_date, datetime.min.time()))
+        if end_date:
+            conditions.append("timestamp < %s")
+            params.append(datetime.combine(end_date + timedelta(days=1), datetime.min.time()))
+        if cursor:
+            conditions.append("(timestamp, id) < (%s, %s)")
+            params.extend(_decode_cursor(cursor))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(f"""
+                    SELECT id, paper_title, primary_keywords, domain_tags,
+                        confidence_score, extraction_method, timestamp
+                    FROM keyword_extractions
+                    {where}
+                    ORDER BY timestamp DESC, id DESC
+                    LIMIT %s
+                """, params + [limit + 1])
+                rows = cur.fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1]['timestamp'], rows[-1]['id'])
+
+        return {
+            "items": [{
+                "id": row['id'],
+                "paper_title": row['paper_title'],
+                "primary_keywords": row['primary_keywords'],
+                "domain_tags": row['domain_tags'],
+                "confidence_score": float(row['confidence_score'] or 0.0),
+                "extraction_method": row['extraction_method'],
+                "timestamp": row['timestamp'].isoformat()
+            } for row in rows],
+            "next_cursor": next_cursor
+        }
+
     def get_available_dates(self) -> List[str]:
         """Get list of dates that have activity data"""
         try:
@@ -541,8 +1664,13 @@ class MetricsTracker:
             print(f"Error getting available dates: {e}")
             return []
 
-    def get_document_summary_by_date_range(self, start_date: date, end_date: date) -> Dict[str, Any]:
-        """Get summary of documents processed in a date range"""
+    def get_document_summary_by_date_range(self, start_date: date, end_date: date,
+                                           papers_limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get summary of documents processed in a date range.
+        `papers_limit` caps unique_papers to the most recently first-seen titles;
+        the individual events are paginated through get_history_page.
+        """
         try:
             with self._get_connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
@@ -568,11 +1696,12 @@ class MetricsTracker:
                             END as paper_title,
                             MIN(timestamp) as first_seen
                         FROM activity_events 
-                        WHERE date BETWEEN %s AND %s
+                        WHERE timestamp >= %s AND timestamp < %s
                         AND details->>'paper_title' IS NOT NULL
                         GROUP BY paper_title
                         ORDER BY first_seen DESC
-                    """, (start_date, end_date))
+                        LIMIT %s
+                    """, (start_date, end_date + timedelta(days=1), papers_limit))
                     unique_papers = cur.fetchall()
 
                     return {
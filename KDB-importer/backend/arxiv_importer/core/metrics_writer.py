@@ -0,0 +1,167 @@
+# backend/arxiv_importer/core/metrics_writer.py
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+# Control messages for the writer thread
+_STOP = object()
+
+
+class MetricsWriter:
+    """
+    Background writer that takes metrics records off the request path.
+
+    Records (or lists of records that must be written together) are handed over
+    through a bounded queue and flushed in batches by a single worker thread,
+    either when `batch_size` records are pending or when the oldest pending
+    record is `flush_interval` seconds old. When the queue is
+    full new records are dropped (and counted) rather than blocking the caller.
+    """
+
+    def __init__(self, flush_fn: Callable[[List[Any]], None],
+                 max_queue_size: int = None, batch_size: int = None,
+                 flush_interval: float = None):
+        self.flush_fn = flush_fn
+        self.max_queue_size = max_queue_size or int(
+            os.getenv('METRICS_QUEUE_SIZE', '10000'))
+        self.batch_size = batch_size or int(
+            os.getenv('METRICS_BATCH_SIZE', '200'))
+        self.flush_interval = flush_interval or float(
+            os.getenv('METRICS_FLUSH_INTERVAL', '1.0'))
+
+        self._queue: queue.Queue = queue.Queue(maxsize=self.max_queue_size)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopped = False
+        # Records submitted but not written yet, and the submission time of the
+        # oldest of them (records are written in submission order)
+        self._unwritten = 0
+        self._written_through = 0.0
+
+        # Counters
+        self.dropped_events = 0
+        self.failed_events = 0
+        self.written_events = 0
+        self.flushes = 0
+
+    def start(self):
+        """Start the worker thread if it is not already running"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped = False
+            self._thread = threading.Thread(
+                target=self._run, name="metrics-writer", daemon=True)
+            self._thread.start()
+
+    def submit(self, record: Any) -> bool:
+        """Queue a record for writing. Returns False if it was dropped."""
+        if self._stopped:
+            with self._lock:
+                self.dropped_events += 1
+            return False
+
+        self.start()
+        with self._lock:
+            submitted = time.time()
+            if self._unwritten == 0:
+                self._written_through = submitted
+            self._unwritten += 1
+        try:
+            self._queue.put_nowait((submitted, record))
+            return True
+        except queue.Full:
+            with self._lock:
+                self._unwritten -= 1
+                self.dropped_events += 1
+            return False
+
+    def flushed_through(self) -> float:
+        """
+        Wall-clock time before which every submitted record has been written
+        (or failed). Data up to this point will not change any more through this writer.
+        """
+        with self._lock:
+            return time.time() if self._unwritten == 0 else self._written_through
+
+    def flush(self, timeout: float = None) -> bool:
+        """Block until every record queued so far has been written"""
+        if self._thread is None or not self._thread.is_alive():
+            return self._queue.empty()
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def stop(self, timeout: float = 10.0):
+        """Flush pending records and stop the worker thread"""
+        self._stopped = True
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth and writer counters"""
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self.max_queue_size,
+                "dropped_events": self.dropped_events,
+                "failed_events": self.failed_events,
+                "written_events": self.written_events,
+                "flushes": self.flushes,
+                "running": self._thread is not None and self._thread.is_alive()
+            }
+
+    def _run(self):
+        batch: List[Any] = []
+        deadline = 0.0
+        # Submission time of the newest record in the batch
+        submitted = 0.0
+
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if batch else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._write(batch, submitted)
+                return
+
+            if isinstance(item, threading.Event):
+                self._write(batch, submitted)
+                batch = []
+                item.set()
+                continue
+
+            if item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                submitted, record = item
+                batch.append(record)
+
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._write(batch, submitted)
+                batch = []
+
+    def _write(self, batch: List[Any], submitted: float):
+        if not batch:
+            return
+        count = sum(len(item) if isinstance(item, list) else 1 for item in batch)
+        try:
+            self.flush_fn(batch)
+            with self._lock:
+                self.written_events += count
+                self.flushes += 1
+        except Exception as e:
+            print(f"Error flushing {count} metrics records: {e}")
+            with self._lock:
+                self.failed_events += count
+        finally:
+            with self._lock:
+                self._unwritten -= len(batch)
+                self._written_through = submitted
@@ -1,13 +1,203 @@
 # backend/arxiv_importer/core/paperless_integration.py
 import os
+import io
+import uuid
+import tempfile
+import threading
+import time
 import requests
 import asyncio
-from typing import Dict, Any, Optional
+from typing import IO, Dict, Any, List, Optional, Tuple
 from dotenv import load_dotenv
+from .utils import run_blocking
+from .paperless_pipeline import PaperlessUploadPipeline
 
 # Load environment variables
 load_dotenv()
 
+# Bytes read per chunk while streaming PDFs in and out
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class MultipartStream:
+    """
+    File-like multipart/form-data body that reads the document as it is sent.
+
+    The total length is known up front, so requests sends a Content-Length
+    header rather than chunked encoding (which Paperless-ngx, like most WSGI
+    apps, does not accept for request bodies).
+    """
+
+    def __init__(self, fields: Dict[str, Any], file_field: str, filename: str,
+                 fileobj: IO[bytes], content_type: str):
+        boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+
+        head = bytearray()
+        for name, value in fields.items():
+            for item in value if isinstance(value, (list, tuple)) else [value]:
+                head += (f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'
+                         f'{item}\r\n').encode("utf-8")
+        safe_filename = filename.replace('"', "")
+        head += (f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; '
+                 f'filename="{safe_filename}"\r\nContent-Type: {content_type}\r\n\r\n').encode("utf-8")
+        tail = f"\r\n--{boundary}--\r\n".encode("utf-8")
+
+        fileobj.seek(0, os.SEEK_END)
+        file_size = fileobj.tell()
+        fileobj.seek(0)
+
+        self._parts = [io.BytesIO(bytes(head)), fileobj, io.BytesIO(tail)]
+        self._length = len(head) + file_size + len(tail)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    def read(self, size: int = -1) -> bytes:
+        out = bytearray()
+        while self._parts and (size < 0 or len(out) < size):
+            chunk = self._parts[0].read(-1 if size < 0 else size - len(out))
+            if not chunk:
+                self._parts.pop(0)
+                continue
+            out += chunk
+        return bytes(out)
+
+
+class PaperlessRegistry:
+    """
+    Cached name -> ID maps for Paperless-ngx reference data.
+
+    Each resource is loaded once with all of its pages and shared by every
+    request. It is reloaded when older than `ttl` seconds, or when a lookup
+    misses (at most once per `miss_refresh_interval` seconds, so unknown names
+    cannot trigger a reload storm). Loading happens outside the lock, so a slow
+    Paperless only holds up callers that have no data for that resource yet.
+    """
+
+    RESOURCES = {
+        "document_types": "/document_types/",
+        "tags": "/tags/",
+        "correspondents": "/correspondents/",
+        "custom_fields": "/custom_fields/",
+    }
+
+    def __init__(self, base_url: str, headers: Dict[str, str],
+                 ttl: float = None, miss_refresh_interval: float = None):
+        self.base_url = base_url.rstrip("/")
+        self.headers = headers
+        self.ttl = ttl or float(os.getenv("PAPERLESS_REGISTRY_TTL", "300"))
+        self.miss_refresh_interval = miss_refresh_interval or float(
+            os.getenv("PAPERLESS_REGISTRY_MISS_REFRESH", "30"))
+
+        self._maps: Dict[str, Dict[str, int]] = {}
+        self._loaded_at: Dict[str, float] = {}
+        # Resources being fetched, so each is loaded by one thread at a time
+        self._loading: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+        # Counters
+        self.api_requests = 0
+        self.refreshes = 0
+
+    def get_all(self, resource: str) -> Dict[str, int]:
+        """Get the name -> ID map for a resource, loading it if missing or expired"""
+        self._reload(resource, self.ttl)
+        with self._lock:
+            return dict(self._maps.get(resource, {}))
+
+    def lookup(self, resource: str, name: str) -> Optional[int]:
+        """Resolve a name to its ID, reloading the resource once on a miss"""
+        self._reload(resource, self.ttl)
+        with self._lock:
+            found = self._maps.get(resource, {}).get(name)
+        if found is None:
+            self._reload(resource, self.miss_refresh_interval, wait=True)
+            with self._lock:
+                found = self._maps.get(resource, {}).get(name)
+        return found
+
+    def invalidate(self, resource: Optional[str] = None):
+        """Force a reload of one resource, or all of them, on next use"""
+        with self._lock:
+            if resource is None:
+                self._loaded_at.clear()
+            else:
+                self._loaded_at.pop(resource, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "api_requests": self.api_requests,
+                "refreshes": self.refreshes,
+                "entries": {name: len(items) for name, items in self._maps.items()}
+            }
+
+    def _reload(self, resource: str, max_age: float, wait: bool = False):
+        """
+        Reload a resource whose data is older than `max_age` seconds.
+        One thread fetches, outside the lock; the others keep serving the
+        previous map, or wait for the fetch if there is none yet (or `wait` is set).
+        """
+        with self._lock:
+            loaded_at = self._loaded_at.get(resource)
+            if loaded_at is not None and time.monotonic() - loaded_at < max_age:
+                return
+            loading = self._loading.get(resource)
+            if loading is None:
+                self._loading[resource] = threading.Event()
+            elif not wait and resource in self._maps:
+                return
+
+        if loading is not None:
+            loading.wait()
+            return
+
+        items = None
+        try:
+            items = self._fetch(resource)
+        finally:
+            with self._lock:
+                if items is not None:
+                    self._maps[resource] = items
+                    self.refreshes += 1
+                # On failure this backs off before retrying, still serving the previous data
+                self._loaded_at[resource] = time.monotonic()
+                self._loading.pop(resource).set()
+
+    def _fetch(self, resource: str) -> Optional[Dict[str, int]]:
+        """Load every page of a resource, or None if loading fails"""
+        url = f"{self.base_url}{self.RESOURCES[resource]}"
+        params = {"page_size": 100}
+        items: Dict[str, int] = {}
+        try:
+            while url:
+                with self._lock:
+                    self.api_requests += 1
+                response = requests.get(
+                    url, headers=self.headers, params=params, timeout=30)
+                if response.status_code != 200:
+                    raise ValueError(
+                        f"{response.status_code} - {response.text[:200]}")
+                data = response.json()
+                for item in data.get("results", []):
+                    if item.get("name") and isinstance(item.get("id"), int):
+                        items[item["name"]] = item["id"]
+                # "next" is a full URL that already carries the query string
+                url = data.get("next")
+                params = None
+        except Exception as e:
+            print(f"Error loading Paperless {resource}: {e}")
+            return None
+        return items
+
 
 class PaperlessIntegration:
     def __init__(self):
@@ -18,110 +208,179 @@ class PaperlessIntegration:
             raise ValueError(
                 "PAPERLESS_BASE_URL and PAPERLESS_API_TOKEN must be set")
 
+        self.registry = PaperlessRegistry(
+            self.paperless_url, self._get_headers())
+        # PDFs larger than this are spooled to disk instead of memory
+        self.spool_max_memory = int(
+            os.getenv("PAPERLESS_SPOOL_MAX_MEMORY", str(1024 * 1024)))
+        # Up to this many task IDs are looked up individually instead of listing all tasks
+        self.task_lookup_threshold = int(
+            os.getenv("PAPERLESS_TASK_LOOKUP_THRESHOLD", "5"))
+
     def _get_headers(self):
         """Get headers for Paperless-ngx API"""
         return {"Authorization": f"Token {self.paperless_token}"}
 
     def _get_document_types(self):
         """Get available document types from Paperless-ngx"""
-        response = requests.get(
-            f"{self.paperless_url}/document_types/", headers=self._get_headers())
-        if response.status_code == 200:
-            data = response.json()
-            return {dt["name"]: dt["id"] for dt in data.get("results", [])}
-        return {}
+        return self.registry.get_all("document_types")
 
     def _get_tags(self):
         """Get available tags from Paperless-ngx"""
-        response = requests.get(
-            f"{self.paperless_url}/tags/", headers=self._get_headers())
-        if response.status_code == 200:
-            data = response.json()
-            return {tag["name"]: tag["id"] for tag in data.get("results", [])}
-        return {}
+        return self.registry.get_all("tags")
 
-    def _download_pdf(self, pdf_url: str) -> Optional[bytes]:
-        """Download PDF from arXiv"""
+    def _download_pdf(self, pdf_url: str) -> Optional[IO[bytes]]:
+        """
+        Stream a PDF from arXiv into a spooled temporary file.
+        Small files stay in memory and larger ones roll over to disk. The caller closes the file.
+        """
+        pdf_file = tempfile.SpooledTemporaryFile(max_size=self.spool_max_memory)
         try:
-            response = requests.get(pdf_url, timeout=30)
-            if response.status_code == 200:
-                return response.content
+            with requests.get(pdf_url, stream=True, timeout=30) as response:
+                if response.status_code == 200:
+                    for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                        pdf_file.write(chunk)
+                    pdf_file.seek(0)
+                    return pdf_file
         except Exception as e:
             print(f"Error downloading PDF from {pdf_url}: {e}")
+        pdf_file.close()
         return None
 
+    @staticmethod
+    def _as_dict(value: Any) -> Dict[str, Any]:
+        """Convert a Pydantic model to a dict if needed"""
+        if hasattr(value, 'model_dump'):
+            return value.model_dump()
+        if hasattr(value, 'dict'):
+            return value.dict()
+        return value or {}
+
+    def _build_upload_data(self, paper_dict: Dict[str, Any], metadata_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the post_document form fields, resolving names to IDs"""
+        upload_data = {
+            "title": paper_dict["title"],
+            "created": paper_dict["published"][:10],  # Extract date part
+        }
+
+        # Add document type (convert name to ID)
+        doc_type_name = "Scientific-Paper"  # Default
+        doc_type_id = self.registry.lookup("document_types", doc_type_name)
+        if doc_type_id is not None:
+            upload_data["document_type"] = doc_type_id
+
+        # Add tags if provided (convert names to IDs)
+        if metadata_dict and metadata_dict.get("tag"):
+            tag_id = self.registry.lookup("tags", metadata_dict.get("tag"))
+            if tag_id is not None:
+                upload_data["tags"] = [tag_id]
+
+        return upload_data
+
+    def _post_document(self, upload_data: Dict[str, Any], filename: str, pdf_file: IO[bytes]) -> str:
+        """Stream a document to Paperless-ngx and return its task ID"""
+        body = MultipartStream(upload_data, "document", filename, pdf_file, "application/pdf")
+        headers = self._get_headers()
+        headers["Content-Type"] = body.content_type
+
+        response = requests.post(
+            f"{self.paperless_url}/documents/post_document/",
+            data=body,
+            headers=headers,
+            timeout=300
+        )
+
+        if response.status_code == 200:
+            return response.text.strip('"')  # Remove quotes from UUID
+        raise ValueError(
+            f"Paperless-ngx upload failed: {response.status_code} - {response.text}")
+
+    def get_tasks(self, task_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Look up consumption tasks in bulk.
+        A few IDs are queried one by one; larger sets are matched against the task
+        listing (newest first), which stops paging once every ID has been seen.
+        """
+        if not task_ids:
+            return []
+
+        if len(task_ids) <= self.task_lookup_threshold:
+            tasks = []
+            for task_id in task_ids:
+                response = requests.get(
+                    f"{self.paperless_url}/tasks/", params={"task_id": task_id},
+                    headers=self._get_headers(), timeout=30)
+                response.raise_for_status()
+                tasks.extend(self._task_results(response.json()))
+            return tasks
+
+        wanted = set(task_ids)
+        tasks = []
+        url = f"{self.paperless_url}/tasks/"
+        params = {"page_size": 100, "ordering": "-date_created"}
+        while url and wanted:
+            response = requests.get(url, headers=self._get_headers(), params=params, timeout=60)
+            response.raise_for_status()
+            data = response.json()
+            for task in self._task_results(data):
+                if task.get("task_id") in wanted:
+                    wanted.discard(task["task_id"])
+                    tasks.append(task)
+            # Older Paperless versions paginate the listing, newer ones return a plain list;
+            # "next" is a full URL that already carries the query string
+            url = data.get("next") if isinstance(data, dict) else None
+            params = None
+        return tasks
+
+    @staticmethod
+    def _task_results(data: Any) -> List[Dict[str, Any]]:
+        return data.get("results", []) if isinstance(data, dict) else list(data)
+
     async def upload_paper_to_paperless(self, paper: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> str:
         """
         Upload a paper to Paperless-ngx with metadata.
         Returns the task ID for async processing.
+        The blocking download/upload runs on the shared executor.
         """
-        try:
-            # Convert Pydantic model to dict if needed
-            if hasattr(paper, 'model_dump'):
-                paper_dict = paper.model_dump()
-            elif hasattr(paper, 'dict'):
-                paper_dict = paper.dict()
-            else:
-                paper_dict = paper
+        return await run_blocking(self.upload_paper, paper, metadata)
 
-            # Convert metadata if needed
-            if metadata and hasattr(metadata, 'model_dump'):
-                metadata_dict = metadata.model_dump()
-            elif metadata and hasattr(metadata, 'dict'):
-                metadata_dict = metadata.dict()
-            else:
-                metadata_dict = metadata or {}
+    async def upload_papers_to_paperless(self, items: List[Tuple[Any, Any]]) -> List[Dict[str, Any]]:
+        """
+        Upload a batch of (paper, metadata) pairs through the download/upload pipeline.
+        Returns one result per item, in input order.
+        """
+        return await PaperlessUploadPipeline(self).run(items)
 
-            # Get document types and tags
-            doc_types = self._get_document_types()
-            tags = self._get_tags()
+    def upload_paper(self, paper: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Synchronous upload of a paper to Paperless-ngx with metadata.
+        Returns the task ID for async processing.
+        """
+        paper_dict = {}
+        pdf_file = None
+        try:
+            paper_dict = self._as_dict(paper)
+            metadata_dict = self._as_dict(metadata)
 
             # Download PDF
-            pdf_content = self._download_pdf(paper_dict["pdf_url"])
-            if not pdf_content:
+            pdf_file = self._download_pdf(str(paper_dict["pdf_url"]))
+            if not pdf_file:
                 raise ValueError(
                     f"Failed to download PDF from {paper_dict['pdf_url']}")
 
-            # Prepare upload data
-            upload_data = {
-                "title": paper_dict["title"],
-                "created": paper_dict["published"][:10],  # Extract date part
-            }
-
-            # Add document type (convert name to ID)
-            doc_type_name = "Scientific-Paper"  # Default
-            if doc_type_name in doc_types:
-                upload_data["document_type"] = doc_types[doc_type_name]
-
-            # Add tags if provided (convert names to IDs)
-            if metadata_dict and metadata_dict.get("tag"):
-                tag_name = metadata_dict.get("tag")
-                if tag_name in tags:
-                    upload_data["tags"] = [tags[tag_name]]
-
-            # Prepare files
-            files = {
-                "document": (f"{paper_dict['id']}.pdf", pdf_content, "application/pdf")
-            }
-
             # Upload to Paperless-ngx
-            response = requests.post(
-                f"{self.paperless_url}/documents/post_document/",
-                data=upload_data,
-                files=files,
-                headers=self._get_headers()
+            return self._post_document(
+                self._build_upload_data(paper_dict, metadata_dict),
+                f"{paper_dict['id']}.pdf",
+                pdf_file
             )
 
-            if response.status_code == 200:
-                task_id = response.text.strip('"')  # Remove quotes from UUID
-                return task_id
-            else:
-                raise ValueError(
-                    f"Paperless-ngx upload failed: {response.status_code} - {response.text}")
-
         except Exception as e:
             raise Exception(
                 f"Failed to upload paper '{paper_dict.get('title', 'Unknown')}' to Paperless: {str(e)}")
+        finally:
+            if pdf_file is not None:
+                pdf_file.close()
 
 
 # Create a global instance
@@ -0,0 +1,125 @@
+# backend/arxiv_importer/core/paperless_pipeline.py
+import os
+import asyncio
+from typing import IO, Any, Dict, List, Optional, Tuple
+from .utils import run_blocking
+
+# Marks the end of work on a stage queue
+_DONE = object()
+
+
+class PaperlessUploadPipeline:
+    """
+    Batch uploader with separate download and upload stages.
+
+    A pool of download workers streams PDFs from arXiv into spooled temporary
+    files and hands them to a pool of upload workers through a bounded queue.
+    When uploads fall behind, the queue fills and downloads wait, so at most
+    `download_concurrency + queue_size + upload_concurrency` PDFs are held at
+    once, each in a file that spills to disk past PAPERLESS_SPOOL_MAX_MEMORY.
+    """
+
+    def __init__(self, integration, download_concurrency: int = None,
+                 upload_concurrency: int = None, queue_size: int = None):
+        self.integration = integration
+        self.download_concurrency = download_concurrency or int(
+            os.getenv("PAPERLESS_DOWNLOAD_CONCURRENCY", "4"))
+        self.upload_concurrency = upload_concurrency or int(
+            os.getenv("PAPERLESS_UPLOAD_CONCURRENCY", "2"))
+        self.queue_size = queue_size or int(
+            os.getenv("PAPERLESS_PIPELINE_QUEUE_SIZE", "4"))
+
+    async def run(self, items: List[Tuple[Any, Any]]) -> List[Dict[str, Any]]:
+        """
+        Upload (paper, metadata) pairs and return one result per pair, in input order.
+        Each result carries the Paperless task ID, or the error if that paper failed.
+        """
+        jobs = [(self.integration._as_dict(paper), self.integration._as_dict(metadata))
+                for paper, metadata in items]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+
+        pending: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        downloaded: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        async def produce():
+            for index, job in enumerate(jobs):
+                await pending.put((index, *job))
+            for _ in range(self.download_concurrency):
+                await pending.put(_DONE)
+
+        async def download():
+            while True:
+                job = await pending.get()
+                if job is _DONE:
+                    return
+                index, paper, metadata = job
+                try:
+                    pdf_file = await run_blocking(
+                        self.integration._download_pdf, str(paper["pdf_url"]))
+                    if pdf_file is None:
+                        raise ValueError(
+                            f"Failed to download PDF from {paper['pdf_url']}")
+                except Exception as e:
+                    results[index] = self._result(paper, error=str(e))
+                    continue
+
+                try:
+                    await downloaded.put((index, paper, metadata, pdf_file))
+                except BaseException:
+                    pdf_file.close()
+                    raise
+
+        async def upload():
+            while True:
+                job = await downloaded.get()
+                if job is _DONE:
+                    return
+                index, paper, metadata, pdf_file = job
+                try:
+                    task_id = await run_blocking(self._upload, paper, metadata, pdf_file)
+                    results[index] = self._result(paper, task_id=task_id)
+                except Exception as e:
+                    results[index] = self._result(paper, error=str(e))
+
+        producer = asyncio.create_task(produce())
+        downloaders = [asyncio.create_task(download())
+                       for _ in range(self.download_concurrency)]
+        uploaders = [asyncio.create_task(upload())
+                     for _ in range(self.upload_concurrency)]
+        try:
+            await asyncio.gather(producer, *downloaders)
+            for _ in uploaders:
+                await downloaded.put(_DONE)
+            await asyncio.gather(*uploaders)
+        finally:
+            for task in (producer, *downloaders, *uploaders):
+                task.cancel()
+            # Release PDFs that were downloaded but never uploaded
+            while not downloaded.empty():
+                job = downloaded.get_nowait()
+                if job is not _DONE:
+                    job[3].close()
+
+        return results
+
+    def _upload(self, paper: Dict[str, Any], metadata: Dict[str, Any], pdf_file: IO[bytes]) -> str:
+        """Post one spooled PDF, closing it afterwards even if the request was cancelled"""
+        try:
+            return self.integration._post_document(
+                self.integration._build_upload_data(paper, metadata),
+                f"{paper['id']}.pdf",
+                pdf_file
+            )
+        finally:
+            pdf_file.close()
+
+    @staticmethod
+    def _result(paper: Dict[str, Any], task_id: Optional[str] = None,
+                error: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            "paper_id": paper.get("id", ""),
+            "title": paper.get("title", ""),
+            "task_id": task_id,
+            "status": "queued" if task_id else "error",
+            "error": error
+        }
@@ -0,0 +1,181 @@
+# backend/arxiv_importer/core/paperless_tasks.py
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .paperless_integration import paperless_integration
+from .metrics_tracker import metrics_tracker
+
+# Paperless (Celery) task states that will not change any more
+FINAL_STATES = {"SUCCESS", "FAILURE", "REVOKED"}
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    """Parse a Paperless ISO timestamp into naive local time, like our own timestamps"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed.astimezone().replace(tzinfo=None) if parsed.tzinfo else parsed
+
+
+class PaperlessTaskPoller:
+    """
+    Background thread that resolves queued Paperless-ngx consumption tasks.
+
+    Outstanding task IDs are read from paperless_uploads, so tasks queued before
+    a restart (or by another worker) are picked up too. Each poll looks them up
+    in bulk and records the final status, document ID and processing time. The
+    poll interval doubles while nothing finishes, resets when something does or
+    when a new upload is queued, and tasks still unresolved after
+    PAPERLESS_TASK_TIMEOUT_HOURS are marked UNKNOWN.
+    """
+
+    def __init__(self, fetch_tasks: Callable[[List[str]], List[Dict[str, Any]]],
+                 get_pending: Callable[[int], List[str]],
+                 resolve: Callable[[List[Dict[str, Any]]], int],
+                 expire: Callable[[datetime], int],
+                 min_interval: float = None, max_interval: float = None,
+                 task_timeout_hours: float = None, batch_limit: int = 500):
+        self.fetch_tasks = fetch_tasks
+        self.get_pending = get_pending
+        self.resolve = resolve
+        self.expire = expire
+        self.min_interval = min_interval or float(
+            os.getenv("PAPERLESS_TASK_POLL_MIN", "2"))
+        self.max_interval = max_interval or float(
+            os.getenv("PAPERLESS_TASK_POLL_MAX", "60"))
+        self.task_timeout = timedelta(hours=task_timeout_hours or float(
+            os.getenv("PAPERLESS_TASK_TIMEOUT_HOURS", "6")))
+        self.batch_limit = batch_limit
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+        # Counters
+        self.polls = 0
+        self.resolved_tasks = 0
+        self.expired_tasks = 0
+        self.failed_polls = 0
+        self.pending_tasks = 0
+        self.current_interval = self.min_interval
+
+    def start(self):
+        """Start the poller thread if it is not already running"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="paperless-task-poller", daemon=True)
+            self._thread.start()
+
+    def notify(self):
+        """Signal that a new upload was queued so polling speeds up again"""
+        self.start()
+        self._wake.set()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the poller thread"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get poll counters and the current interval"""
+        with self._lock:
+            return {
+                "polls": self.polls,
+                "resolved_tasks": self.resolved_tasks,
+                "expired_tasks": self.expired_tasks,
+                "failed_polls": self.failed_polls,
+                "pending_tasks": self.pending_tasks,
+                "current_interval": self.current_interval,
+                "running": self._thread is not None and self._thread.is_alive()
+            }
+
+    def poll_once(self) -> Tuple[int, int]:
+        """Resolve finished tasks once. Returns (resolved, still pending)."""
+        expired = self.expire(datetime.now() - self.task_timeout)
+
+        pending = self.get_pending(self.batch_limit)
+        outcomes = []
+        if pending:
+            tasks = {task.get("task_id"): task for task in self.fetch_tasks(pending)}
+            for task_id in pending:
+                outcome = self._parse_task(tasks.get(task_id))
+                if outcome is not None:
+                    outcomes.append(outcome)
+        resolved = self.resolve(outcomes) if outcomes else 0
+
+        with self._lock:
+            self.polls += 1
+            self.resolved_tasks += resolved
+            self.expired_tasks += expired
+            self.pending_tasks = len(pending) - len(outcomes)
+        return resolved, len(pending) - len(outcomes)
+
+    @staticmethod
+    def _parse_task(task: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Turn a finished Paperless task into an outcome record, or None if still running"""
+        if not task:
+            return None
+        status = str(task.get("status") or "").upper()
+        if status not in FINAL_STATES:
+            return None
+
+        created = _parse_datetime(task.get("date_created"))
+        done = _parse_datetime(task.get("date_done"))
+        document = task.get("related_document")
+        return {
+            "task_id": task["task_id"],
+            "task_status": status,
+            "document_id": int(document) if str(document).isdigit() else None,
+            "processing_seconds": (done - created).total_seconds() if created and done else None,
+            "completed_at": done or datetime.now(),
+            "error": None if status == "SUCCESS" else str(task.get("result") or "")[:2000]
+        }
+
+    def _run(self):
+        interval = self.min_interval
+        while not self._stop.is_set():
+            if self._wake.wait(interval):
+                self._wake.clear()
+                if self._stop.is_set():
+                    return
+                # A new upload was queued: give Paperless a moment before polling
+                interval = self.min_interval
+                if self._stop.wait(self.min_interval):
+                    return
+
+            try:
+                resolved, pending = self.poll_once()
+            except Exception as e:
+                print(f"Error polling Paperless tasks: {e}")
+                with self._lock:
+                    self.failed_polls += 1
+                resolved, pending = 0, 1
+
+            if resolved:
+                interval = self.min_interval
+            elif pending:
+                interval = min(interval * 2, self.max_interval)
+            else:
+                # Nothing outstanding: idle until notified, checking now and then
+                interval = self.max_interval
+            with self._lock:
+                self.current_interval = interval
+
+
+# Create a global instance
+task_poller = PaperlessTaskPoller(
+    paperless_integration.get_tasks,
+    metrics_tracker.get_pending_paperless_tasks,
+    metrics_tracker.resolve_paperless_tasks,
+    metrics_tracker.expire_paperless_tasks
+)
@@ -0,0 +1,94 @@
+# backend/arxiv_importer/core/phrase_matcher.py
+import re
+from typing import Dict, Iterable, List
+
+_END = ""
+
+
+def _normalize_phrase(phrase: str) -> str:
+    return " ".join(phrase.split()).lower()
+
+
+class PhraseMatcher:
+    """
+    Finds every vocabulary phrase in a text in a single regex pass.
+
+    The vocabulary is compiled once into a trie-shaped regex, so the cost of a
+    scan grows with the text length and the phrase depth rather than with the
+    number of phrases. Matches are case-insensitive, must start and end on word
+    boundaries, tolerate any whitespace between words and accept a plural "s".
+    """
+
+    def __init__(self, phrases: Dict[str, Iterable[str]]):
+        """
+        Args:
+            phrases (dict): Maps each phrase to the labels reported when it matches.
+        """
+        self.labels: Dict[str, List[str]] = {}
+        for phrase, labels in phrases.items():
+            key = _normalize_phrase(phrase)
+            if not key:
+                continue
+            bucket = self.labels.setdefault(key, [])
+            for label in labels:
+                if label not in bucket:
+                    bucket.append(label)
+
+        trie: Dict[str, dict] = {}
+        for key in self.labels:
+            node = trie
+            for ch in key:
+                node = node.setdefault(ch, {})
+            node[_END] = {}
+
+        # The regex reports the longest phrase at each start position, so also
+        # credit shorter vocabulary phrases that are word-aligned prefixes of it
+        self._prefixes: Dict[str, List[str]] = {
+            key: self._word_prefixes(trie, key) for key in self.labels
+        }
+
+        body = self._trie_to_regex(trie)
+        self.pattern = re.compile(
+            r"(?<!\w)(?=(" + body + r")s?(?!\w))", re.IGNORECASE) if body else None
+
+    @staticmethod
+    def _word_prefixes(trie: Dict[str, dict], key: str) -> List[str]:
+        found = []
+        node = trie
+        for i, ch in enumerate(key):
+            node = node[ch]
+            at_boundary = i + 1 == len(key) or not (key[i + 1].isalnum() or key[i + 1] == "_")
+            if _END in node and at_boundary:
+                found.append(key[:i + 1])
+        return found
+
+    @classmethod
+    def _trie_to_regex(cls, node: Dict[str, dict]) -> str:
+        branches = []
+        for ch in sorted(k for k in node if k != _END):
+            atom = r"\s+" if ch == " " else re.escape(ch)
+            branches.append(atom + cls._trie_to_regex(node[ch]))
+
+        if not branches:
+            return ""
+        if len(branches) == 1 and _END not in node:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        # Optional group: the greedy engine still prefers the longer phrase
+        return group + "?" if _END in node else group
+
+    def find(self, text: str) -> List[str]:
+        """Return the labels of every phrase found in `text`, in order of first appearance"""
+        if self.pattern is None or not text:
+            return []
+
+        found: List[str] = []
+        seen = set()
+        for match in self.pattern.finditer(text):
+            key = _normalize_phrase(match.group(1))
+            for prefix in self._prefixes.get(key, ()):
+                for label in self.labels[prefix]:
+                    if label not in seen:
+                        seen.add(label)
+                        found.append(label)
+        return found
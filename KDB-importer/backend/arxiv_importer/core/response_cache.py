@@ -0,0 +1,82 @@
+# backend/arxiv_importer/core/response_cache.py
+import os
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag for a serialized response body"""
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header (a list of tags, possibly weak, or *) against an ETag"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """
+    LRU of endpoint payloads tagged with the data version they were built from.
+
+    Callers pass the current version (MetricsTracker.data_version, which moves
+    whenever tracked events are written), so a write invalidates every entry at
+    once without tracking which endpoints it affects. Entries also expire after
+    `ttl` seconds, which bounds staleness when several worker processes write.
+    """
+
+    def __init__(self, max_entries: int = None, ttl: float = None):
+        self.max_entries = max_entries or int(
+            os.getenv("RESPONSE_CACHE_SIZE", "256"))
+        self.ttl = ttl or float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+
+        self._entries: "OrderedDict[Hashable, Tuple[int, float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, version: int) -> Optional[Any]:
+        """Return the payload cached for `key` at `version`, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version and time.monotonic() - entry[1] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+            return None
+
+    def set(self, key: Hashable, version: int, payload: Any):
+        """Cache a payload built from data at `version`"""
+        with self._lock:
+            self._entries[key] = (version, time.monotonic(), payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries)
+            }
+
+
+# Create a global instance
+response_cache = ResponseCache()
@@ -1,6 +1,6 @@
-from .arxiv_client import fetch_by_query
+from .arxiv_client import fetch_by_query, iter_by_query
 from .metadata_handler import process_metadata
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 
 def search_with_metadata(
     query: str,
@@ -31,3 +31,25 @@ def search_with_metadata(
         }
         for paper in papers
     ]
+
+
+def iter_search_with_metadata(
+    query: str,
+    sort_by: str = "relevance",
+    max_results: int = 5,
+    metadata: Dict[str, Any] = {}
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming variant of search_with_metadata.
+
+    Yields each enriched paper as soon as arXiv returns it instead of
+    materializing the full result list.
+    """
+    enriched = process_metadata(metadata)
+
+    for paper in iter_by_query(query, max_results=max_results, sort_by=sort_by):
+        yield {
+            "query": query,
+            "paper": paper.__dict__,
+            "metadata": enriched
+        }
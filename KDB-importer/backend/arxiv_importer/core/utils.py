@@ -0,0 +1,26 @@
+# backend/arxiv_importer/core/utils.py
+import os
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+# Bounded pool for blocking work (arxiv, requests, OpenAI, psycopg2) so that
+# route handlers never block the event loop while waiting on I/O
+BLOCKING_IO_WORKERS = int(os.getenv("BLOCKING_IO_WORKERS", "16"))
+
+_executor = ThreadPoolExecutor(
+    max_workers=BLOCKING_IO_WORKERS, thread_name_prefix="blocking-io")
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking callable on the shared bounded executor and await its result.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+def shutdown_executor(wait: bool = True):
+    """Stop accepting blocking jobs and wait for in-flight ones to finish"""
+    _executor.shutdown(wait=wait)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Dashboard Analytics Rollup Benchmark
+Loads synthetic keyword extractions into a scratch schema and compares the
+legacy unnest/GROUP BY dashboard queries with the daily rollup tables, plus
+the write overhead the rollup trigger adds to batched inserts.
+
+Uses the PG_* environment variables (see env.template). Everything is created
+in the `rollup_benchmark` schema, which is dropped afterwards.
+"""
+
+import os
+import sys
+import time
+import random
+import statistics
+from datetime import datetime, timedelta
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "KDB-importer", "backend"))
+
+# Importing the tracker applies the migrations, which define the rollup trigger functions
+from arxiv_importer.core.metrics_tracker import metrics_tracker  # noqa: E402
+
+# Configuration
+ROWS = int(os.getenv("BENCH_ROWS", "1000000"))
+DAYS = int(os.getenv("BENCH_DAYS", "60"))
+VOCABULARY = int(os.getenv("BENCH_VOCABULARY", "5000"))
+REPEATS = int(os.getenv("BENCH_REPEATS", "5"))
+WRITE_BATCHES = 20
+BATCH_SIZE = 200
+SCHEMA = "rollup_benchmark"
+
+DOMAINS = [
+    "quantum_computing", "quantum_cryptography", "quantum_communication",
+    "quantum_algorithms", "quantum_hardware", "quantum_software",
+    "quantum_simulation", "quantum_optimization", "quantum_ml",
+]
+
+LEGACY_QUERIES = {
+    "keywords": """
+        SELECT unnest(primary_keywords) as keyword, COUNT(*) as count
+        FROM keyword_extractions
+        WHERE date >= %s
+        GROUP BY keyword
+        ORDER BY count DESC
+        LIMIT 10
+    """,
+    "domains": """
+        SELECT unnest(domain_tags) as domain, COUNT(*) as count
+        FROM keyword_extractions
+        WHERE date >= %s
+        GROUP BY domain
+        ORDER BY count DESC
+    """,
+}
+
+ROLLUP_QUERIES = {
+    "keywords": """
+        SELECT keyword, SUM(count) as count
+        FROM keyword_daily_counts
+        WHERE date >= %s
+        GROUP BY keyword
+        ORDER BY count DESC
+        LIMIT 10
+    """,
+    "domains": """
+        SELECT domain, SUM(count) as count
+        FROM domain_daily_counts
+        WHERE date >= %s
+        GROUP BY domain
+        ORDER BY count DESC
+    """,
+}
+
+
+def _setup(cur):
+    """Create scratch copies of the raw and rollup tables"""
+    cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    cur.execute(f"CREATE SCHEMA {SCHEMA}")
+    # Unqualified names (including inside the trigger functions) resolve to the scratch schema
+    cur.execute(f"SET search_path TO {SCHEMA}, public")
+    cur.execute("""
+        CREATE TABLE keyword_extractions (
+            id SERIAL PRIMARY KEY,
+            timestamp TIMESTAMP NOT NULL,
+            paper_title TEXT NOT NULL,
+            primary_keywords TEXT[],
+            secondary_keywords TEXT[],
+            technical_terms TEXT[],
+            domain_tags TEXT[],
+            confidence_score DECIMAL(3,2),
+            extraction_method VARCHAR(50),
+            date DATE GENERATED ALWAYS AS (timestamp::DATE) STORED
+        )
+    """)
+    cur.execute("CREATE INDEX ON keyword_extractions(date)")
+    cur.execute("CREATE TABLE keyword_daily_counts (LIKE public.keyword_daily_counts INCLUDING ALL)")
+    cur.execute("CREATE TABLE domain_daily_counts (LIKE public.domain_daily_counts INCLUDING ALL)")
+
+
+def _load(cur):
+    """Generate ROWS extractions spread over DAYS days with a skewed keyword distribution"""
+    cur.execute("""
+        INSERT INTO keyword_extractions
+            (timestamp, paper_title, primary_keywords, domain_tags, confidence_score, extraction_method)
+        SELECT
+            NOW() - random() * make_interval(days => %s),
+            'Benchmark paper ' || g,
+            ARRAY(SELECT 'keyword-' || floor(power(random(), 3) * %s)::int
+                  FROM generate_series(1, 5) WHERE g > 0),
+            ARRAY[(%s::text[])[1 + g %% 9], (%s::text[])[1 + (g / 9) %% 9]],
+            round(random()::numeric, 2),
+            'benchmark'
+        FROM generate_series(1, %s) g
+    """, (DAYS, VOCABULARY, DOMAINS, DOMAINS, ROWS))
+    cur.execute("ANALYZE keyword_extractions")
+
+
+def _backfill(cur):
+    """Build the rollups from the loaded rows, as the migration does once"""
+    cur.execute("""
+        INSERT INTO keyword_daily_counts (date, keyword, count)
+        SELECT date, keyword, COUNT(*)
+        FROM keyword_extractions, unnest(primary_keywords) AS keyword
+        GROUP BY date, keyword
+    """)
+    cur.execute("""
+        INSERT INTO domain_daily_counts (date, domain, count)
+        SELECT date, domain, COUNT(*)
+        FROM keyword_extractions, unnest(domain_tags) AS domain
+        GROUP BY date, domain
+    """)
+    cur.execute("ANALYZE keyword_daily_counts")
+    cur.execute("ANALYZE domain_daily_counts")
+
+
+def _time_query(cur, sql, since):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        cur.execute(sql, (since,))
+        cur.fetchall()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def _time_writes(conn, cur):
+    """Insert WRITE_BATCHES batches of BATCH_SIZE rows like the metrics writer does"""
+    rng = random.Random(7)
+    timings = []
+    for _ in range(WRITE_BATCHES):
+        rows = [(
+            datetime.now() - timedelta(days=rng.randint(0, DAYS)),
+            "Benchmark write",
+            [f"keyword-{rng.randint(0, VOCABULARY)}" for _ in range(5)],
+            rng.sample(DOMAINS, 2),
+            round(rng.random(), 2),
+            "benchmark"
+        ) for _ in range(BATCH_SIZE)]
+        start = time.perf_counter()
+        execute_values(cur, """
+            INSERT INTO keyword_extractions
+                (timestamp, paper_title, primary_keywords, domain_tags, confidence_score, extraction_method)
+            VALUES %s
+        """, rows)
+        conn.commit()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    """Run the benchmark"""
+    print("📈 Dashboard Analytics Rollup Benchmark")
+    print("=" * 60)
+    print(f"   Rows: {ROWS:,}, days: {DAYS}, keyword vocabulary: {VOCABULARY}")
+
+    conn = psycopg2.connect(**metrics_tracker.db_config)
+    try:
+        with conn.cursor() as cur:
+            _setup(cur)
+            start = time.perf_counter()
+            _load(cur)
+            conn.commit()
+            print(f"   Loaded synthetic extractions in {time.perf_counter() - start:.1f}s")
+
+            start = time.perf_counter()
+            _backfill(cur)
+            conn.commit()
+            cur.execute("SELECT COUNT(*) FROM keyword_daily_counts")
+            rollup_rows = cur.fetchone()[0]
+            print(f"   Backfilled {rollup_rows:,} keyword rollup rows in {time.perf_counter() - start:.1f}s")
+
+            since = (datetime.now() - timedelta(days=30)).date()
+            print("\n🔍 Dashboard queries (median of {} runs, last 30 days)".format(REPEATS))
+            for name in LEGACY_QUERIES:
+                legacy = _time_query(cur, LEGACY_QUERIES[name], since)
+                rollup = _time_query(cur, ROLLUP_QUERIES[name], since)
+                print(f"   {name:<9} unnest: {legacy * 1000:9.1f} ms   rollup: {rollup * 1000:7.1f} ms   "
+                      f"→ {legacy / rollup if rollup else 0:.0f}x")
+
+            print(f"\n✍️  Batched inserts ({BATCH_SIZE} rows, median of {WRITE_BATCHES} batches)")
+            without_trigger = _time_writes(conn, cur)
+            cur.execute("""
+                CREATE TRIGGER trg_benchmark_rollups
+                AFTER INSERT ON keyword_extractions
+                REFERENCING NEW TABLE AS new_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION public.analytics_rollups_add_extractions()
+            """)
+            conn.commit()
+            with_trigger = _time_writes(conn, cur)
+            print(f"   without rollup trigger: {without_trigger * 1000:.1f} ms")
+            print(f"   with rollup trigger:    {with_trigger * 1000:.1f} ms")
+    finally:
+        conn.rollback()
+        with conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.commit()
+        conn.close()
+        metrics_tracker.close()
+
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
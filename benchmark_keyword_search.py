@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Keyword Search Benchmark
+Loads synthetic keyword extractions into a scratch schema built with the real
+MetricsTracker migrations (partitions, GIN and trigram indexes) and measures
+/keywords/search query latency for typical filter combinations.
+
+Uses the PG_* environment variables (see env.template). Everything is created
+in the `keyword_search_benchmark` schema, which is dropped afterwards.
+"""
+
+import os
+import sys
+import time
+import random
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import psycopg2
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "KDB-importer", "backend"))
+
+from arxiv_importer.core.metrics_tracker import metrics_tracker  # noqa: E402
+
+# Configuration
+ROWS = int(os.getenv("BENCH_ROWS", "1000000"))
+DAYS = int(os.getenv("BENCH_DAYS", "365"))
+VOCABULARY = int(os.getenv("BENCH_VOCABULARY", "5000"))
+REPEATS = int(os.getenv("BENCH_REPEATS", "50"))
+TARGET_P95_MS = 50
+SCHEMA = "keyword_search_benchmark"
+
+DOMAINS = [
+    "quantum_computing", "quantum_cryptography", "quantum_communication",
+    "quantum_algorithms", "quantum_hardware", "quantum_software",
+    "quantum_simulation", "quantum_optimization", "quantum_ml",
+]
+TITLE_WORDS = [
+    "Quantum", "Error", "Correction", "Surface", "Codes", "Entanglement", "Superconducting",
+    "Qubits", "Variational", "Algorithms", "Photonic", "Networks", "Topological", "Annealing",
+    "Fidelity", "Decoherence", "Benchmarking", "Circuits", "Simulation", "Hamiltonians",
+]
+
+
+def _setup(conn):
+    """Create the metrics tables in the scratch schema and load ROWS extractions"""
+    with conn.cursor() as cur:
+        cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        cur.execute(f"CREATE SCHEMA {SCHEMA}")
+        # Unqualified names (including inside the migration functions) resolve to the scratch schema
+        cur.execute(f"SET search_path TO {SCHEMA}, public")
+        metrics_tracker._create_tables(cur)
+        metrics_tracker._apply_migrations(cur)
+        cur.execute("SELECT create_metrics_partitions(%s, CURRENT_DATE)",
+                    (date.today() - timedelta(days=DAYS),))
+        cur.execute("""
+            INSERT INTO keyword_extractions
+                (timestamp, paper_title, primary_keywords, domain_tags, confidence_score, extraction_method)
+            SELECT
+                NOW() - random() * make_interval(days => %s),
+                (%s::text[])[1 + g %% 20] || ' ' || (%s::text[])[1 + (g / 20) %% 20] || ' '
+                    || (%s::text[])[1 + (g / 400) %% 20] || ' ' || g,
+                ARRAY(SELECT 'keyword-' || floor(power(random(), 3) * %s)::int
+                      FROM generate_series(1, 5) WHERE g > 0),
+                ARRAY[(%s::text[])[1 + g %% 9], (%s::text[])[1 + (g / 9) %% 9]],
+                round(random()::numeric, 2),
+                'benchmark'
+            FROM generate_series(1, %s) g
+        """, (DAYS, TITLE_WORDS, TITLE_WORDS, TITLE_WORDS, VOCABULARY, DOMAINS, DOMAINS, ROWS))
+        cur.execute("ANALYZE keyword_extractions")
+    conn.commit()
+
+
+def _keyword(rng):
+    """A keyword drawn with the same skew as the loaded data"""
+    return f"keyword-{int(rng.random() ** 3 * VOCABULARY)}"
+
+
+def _searches(rng):
+    """Search shapes to time: each prepares fresh random arguments and returns the call to time"""
+    today = date.today()
+    search = metrics_tracker.search_keyword_extractions
+    return {
+        "one keyword": lambda: lambda: search([_keyword(rng)]),
+        "two keywords (AND)": lambda: lambda: search([_keyword(rng), _keyword(rng)], "all"),
+        "three keywords (OR)": lambda: lambda: search([_keyword(rng) for _ in range(3)], "any"),
+        "keyword, last quarter": lambda: lambda: search(
+            [_keyword(rng)], start_date=today - timedelta(days=90), end_date=today),
+        "keyword and domain": lambda: lambda: search([_keyword(rng)], domains=[rng.choice(DOMAINS)]),
+        "title substring": lambda: lambda: search(title=" ".join(rng.sample(TITLE_WORDS, 2))),
+        "keyword, page 5": lambda: _fifth_page([_keyword(rng)]),
+    }
+
+
+def _fifth_page(keywords):
+    """Follow next_cursor through four pages; the fifth request is the one timed"""
+    cursor = None
+    for _ in range(4):
+        cursor = metrics_tracker.search_keyword_extractions(keywords, cursor=cursor)["next_cursor"]
+    return lambda: metrics_tracker.search_keyword_extractions(keywords, cursor=cursor)
+
+
+def _percentile(timings, fraction):
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    """Run the benchmark"""
+    print("🔎 Keyword Search Benchmark")
+    print("=" * 60)
+    print(f"   Rows: {ROWS:,}, days: {DAYS}, keyword vocabulary: {VOCABULARY}")
+
+    conn = psycopg2.connect(**metrics_tracker.db_config)
+
+    @contextmanager
+    def scratch_connection():
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    # Route MetricsTracker queries through the scratch schema
+    original_get_connection = metrics_tracker._get_connection
+    metrics_tracker._get_connection = scratch_connection
+    slow = 0
+    try:
+        start = time.perf_counter()
+        _setup(conn)
+        print(f"   Loaded synthetic extractions in {time.perf_counter() - start:.1f}s")
+
+        print(f"\n⏱️  Search latency ({REPEATS} runs each, target p95 < {TARGET_P95_MS} ms)")
+        rng = random.Random(7)
+        for name, prepare in _searches(rng).items():
+            prepare()()  # warm up
+            timings = []
+            for _ in range(REPEATS):
+                search = prepare()
+                started = time.perf_counter()
+                search()
+                timings.append((time.perf_counter() - started) * 1000)
+            p50, p95 = _percentile(timings, 0.5), _percentile(timings, 0.95)
+            status = "✅" if p95 < TARGET_P95_MS else "❌"
+            slow += p95 >= TARGET_P95_MS
+            print(f"   {status} {name:<24} p50: {p50:7.1f} ms   p95: {p95:7.1f} ms")
+    finally:
+        metrics_tracker._get_connection = original_get_connection
+        conn.rollback()
+        with conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.commit()
+        conn.close()
+        metrics_tracker.close()
+
+    print("=" * 60)
+    if slow:
+        print(f"❌ {slow} search shape(s) above the {TARGET_P95_MS} ms p95 target")
+        sys.exit(1)
+    print(f"🎉 Every search shape is under {TARGET_P95_MS} ms at p95")
+
+
+if __name__ == "__main__":
+    main()
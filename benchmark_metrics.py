@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Metrics Tracking Benchmark
+Measures tracked events per second against a live PostgreSQL instance,
+comparing the legacy connect-per-event pattern with the pooled, batched
+MetricsTracker.
+
+Uses the PG_* environment variables (see env.template). Benchmark rows are
+tagged and deleted afterwards.
+"""
+
+import os
+import sys
+import json
+import time
+from datetime import datetime, date
+from concurrent.futures import ThreadPoolExecutor
+
+import psycopg2
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "KDB-importer", "backend"))
+
+from arxiv_importer.core.metrics_tracker import metrics_tracker  # noqa: E402
+
+# Configuration
+EVENTS = int(os.getenv("BENCH_EVENTS", "500"))
+THREADS = int(os.getenv("BENCH_THREADS", "8"))
+BENCH_TAG = "[benchmark]"
+
+
+def _legacy_track(paper_title):
+    """The pre-pool behaviour: one fresh connection per event"""
+    with psycopg2.connect(**metrics_tracker.db_config) as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                INSERT INTO activity_events (timestamp, event_type, title, status, details)
+                VALUES (%s, %s, %s, %s, %s)
+            """, (
+                datetime.now(),
+                "import",
+                f"Imported: {paper_title}",
+                "success",
+                json.dumps({"paper_title": paper_title})
+            ))
+            conn.commit()
+    with psycopg2.connect(**metrics_tracker.db_config) as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT update_daily_metrics(%s)", (date.today(),))
+            conn.commit()
+
+
+def _pooled_track(paper_title):
+    metrics_tracker.track_paper_import(paper_title=paper_title, success=True)
+
+
+def _run(label, track, drain=None):
+    """Track EVENTS events on THREADS threads and report events per second"""
+    titles = [f"{BENCH_TAG} {label} #{i}" for i in range(EVENTS)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        list(executor.map(track, titles))
+    enqueued = time.perf_counter() - start
+    if drain:
+        # Include the time for the background writer to persist everything
+        drain()
+        print(f"   {label:<8} caller-side time: {enqueued * 1000 / EVENTS:.3f} ms/event")
+    elapsed = time.perf_counter() - start
+    rate = EVENTS / elapsed if elapsed else 0.0
+    print(f"   {label:<8} {EVENTS} events in {elapsed:.2f}s → {rate:.1f} events/s")
+    return rate
+
+
+def _cleanup():
+    with metrics_tracker._get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "DELETE FROM activity_events WHERE details->>'paper_title' LIKE %s",
+                (f"{BENCH_TAG}%",))
+            cur.execute("SELECT update_daily_metrics(%s)", (date.today(),))
+
+
+def main():
+    """Run the before/after benchmark"""
+    print("📊 Metrics Tracking Benchmark")
+    print("=" * 50)
+    print(f"   Events: {EVENTS}, threads: {THREADS}, "
+          f"pool: {metrics_tracker.pool_min_size}-{metrics_tracker.pool_max_size}")
+
+    try:
+        before = _run("before", _legacy_track)
+        after = _run("after", _pooled_track, drain=metrics_tracker.flush)
+    finally:
+        _cleanup()
+        metrics_tracker.close()
+
+    print("\n" + "=" * 50)
+    print(f"🎯 Speedup: {after / before:.1f}x" if before else "⚠️ No baseline measured")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Paperless API Call Benchmark
+Counts the Paperless-ngx HTTP requests made for a batch of uploads, comparing
+the legacy per-upload reference lookups with the shared PaperlessRegistry.
+
+Runs offline: HTTP calls go to an in-process fake Paperless server, so the
+numbers are request counts, not timings.
+"""
+
+import os
+import sys
+from collections import Counter
+
+os.environ.setdefault("PAPERLESS_BASE_URL", "http://paperless.local/api")
+os.environ.setdefault("PAPERLESS_API_TOKEN", "benchmark")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "KDB-importer", "backend"))
+
+from arxiv_importer.core import paperless_integration as paperless_module  # noqa: E402
+
+# Configuration
+UPLOADS = int(os.getenv("BENCH_UPLOADS", "100"))
+TAG_COUNT = int(os.getenv("BENCH_TAGS", "250"))
+TAGS_USED = ["quant-ph", "cs.LG", "cs.AI", "hep-th"]
+
+
+class _Response:
+    def __init__(self, status_code=200, payload=None, text=""):
+        self.status_code = status_code
+        self._payload = payload
+        self.text = text
+        self.content = text.encode()
+
+    def json(self):
+        return self._payload
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakePaperless:
+    """Serves paginated reference data and accepts uploads, counting every call"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+        self.calls = Counter()
+        self.data = {
+            "document_types": ["Scientific-Paper", "Invoice", "Letter"],
+            "tags": TAGS_USED + [f"tag-{i}" for i in range(TAG_COUNT - len(TAGS_USED))],
+            "correspondents": ["arXiv"],
+            "custom_fields": ["arxiv_id", "doi"],
+        }
+
+    def get(self, url, params=None, **kwargs):
+        if not url.startswith(self.base_url):
+            self.calls["pdf_download"] += 1
+            return _Response(text="%PDF-1.4 benchmark")
+
+        path, _, query = url[len(self.base_url):].partition("?")
+        resource = path.strip("/")
+        self.calls[resource] += 1
+
+        page_size = int((params or {}).get("page_size", 25))
+        page = 1
+        for part in query.split("&"):
+            if part.startswith("page_size="):
+                page_size = int(part.split("=", 1)[1])
+            elif part.startswith("page="):
+                page = int(part.split("=", 1)[1])
+
+        names = self.data[resource]
+        start = (page - 1) * page_size
+        results = [{"id": start + i + 1, "name": name}
+                   for i, name in enumerate(names[start:start + page_size])]
+        more = start + page_size < len(names)
+        return _Response(payload={
+            "count": len(names),
+            "next": f"{self.base_url}/{resource}/?page={page + 1}&page_size={page_size}" if more else None,
+            "results": results,
+        })
+
+    def post(self, url, **kwargs):
+        self.calls["post_document"] += 1
+        return _Response(text='"00000000-0000-0000-0000-000000000000"')
+
+
+def _papers():
+    for i in range(UPLOADS):
+        yield {
+            "id": f"2401.{i:05d}",
+            "title": f"Benchmark paper {i}",
+            "published": "2024-01-01T00:00:00",
+            "pdf_url": f"http://arxiv.local/pdf/2401.{i:05d}",
+        }, {"tag": TAGS_USED[i % len(TAGS_USED)]}
+
+
+class LegacyLookups:
+    """The previous behaviour: fetch the first page of a resource on every lookup"""
+
+    def __init__(self, integration):
+        self.integration = integration
+
+    def lookup(self, resource, name):
+        response = paperless_module.requests.get(
+            f"{self.integration.paperless_url}/{resource}/", headers=self.integration._get_headers())
+        return {item["name"]: item["id"] for item in response.json().get("results", [])}.get(name)
+
+
+def _run(legacy):
+    fake = FakePaperless(os.environ["PAPERLESS_BASE_URL"])
+    original = paperless_module.requests
+    paperless_module.requests = fake
+    try:
+        integration = paperless_module.PaperlessIntegration()
+        if legacy:
+            integration.registry = LegacyLookups(integration)
+        for paper, metadata in _papers():
+            integration.upload_paper(paper, metadata)
+    finally:
+        paperless_module.requests = original
+    calls = dict(fake.calls)
+    calls.pop("pdf_download", None)
+    return calls
+
+
+def main():
+    """Run both modes and print the request counts"""
+    print("📨 Paperless API Call Benchmark")
+    print("=" * 60)
+    print(f"Uploads: {UPLOADS}, tags on server: {TAG_COUNT}")
+
+    for label, legacy in (("before (per-upload lookups)", True), ("after (shared registry)", False)):
+        calls = _run(legacy)
+        total = sum(calls.values())
+        print(f"\n{label}: {total} Paperless requests")
+        for endpoint, count in sorted(calls.items()):
+            print(f"  {endpoint:<16} {count:>5}")
+
+    print("=" * 60)
+    print("Upload requests are unchanged; reference lookups drop to one load per resource.")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,24 +9,32 @@ CREATE TABLE IF NOT EXISTS daily_metrics (
     papers_uploaded INTEGER DEFAULT 0,
     keywords_extracted INTEGER DEFAULT 0,
     avg_confidence_score DECIMAL(3,2) DEFAULT 0.0,
+    confidence_score_sum DECIMAL(12,2) DEFAULT 0,
+    confidence_score_count INTEGER DEFAULT 0,
     created_at TIMESTAMP DEFAULT NOW(),
     updated_at TIMESTAMP DEFAULT NOW()
 );
 
+-- Raw event tables are range-partitioned by month on timestamp, so date-filtered
+-- queries only touch the months they ask for and old months can be detached or
+-- dropped whole. The primary key must include the partition key. Installs with
+-- the older unpartitioned tables are migrated by the backend on startup.
+
 -- Individual activity events
 CREATE TABLE IF NOT EXISTS activity_events (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     timestamp TIMESTAMP NOT NULL,
     event_type VARCHAR(50) NOT NULL,
     title TEXT NOT NULL,
     status VARCHAR(20) NOT NULL,
     details JSONB,
-    date DATE GENERATED ALWAYS AS (timestamp::DATE) STORED
-);
+    date DATE GENERATED ALWAYS AS (timestamp::DATE) STORED,
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
 
 -- Keyword extraction history
 CREATE TABLE IF NOT EXISTS keyword_extractions (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     timestamp TIMESTAMP NOT NULL,
     paper_title TEXT NOT NULL,
     primary_keywords TEXT[],
@@ -35,46 +43,393 @@ CREATE TABLE IF NOT EXISTS keyword_extractions (
     domain_tags TEXT[],
     confidence_score DECIMAL(3,2),
     extraction_method VARCHAR(50),
-    date DATE GENERATED ALWAYS AS (timestamp::DATE) STORED
-);
+    date DATE GENERATED ALWAYS AS (timestamp::DATE) STORED,
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
 
 -- Paperless upload history
 CREATE TABLE IF NOT EXISTS paperless_uploads (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     timestamp TIMESTAMP NOT NULL,
     paper_title TEXT NOT NULL,
     task_id VARCHAR(100),
     status VARCHAR(20) NOT NULL,
     metadata JSONB,
-    date DATE GENERATED ALWAYS AS (timestamp::DATE) STORED
-);
+    -- Paperless consumption outcome, filled in by the task poller
+    task_status VARCHAR(20),
+    document_id INTEGER,
+    processing_seconds DOUBLE PRECISION,
+    completed_at TIMESTAMP,
+    task_error TEXT,
+    date DATE GENERATED ALWAYS AS (timestamp::DATE) STORED,
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
+
+-- Monthly partitions named <table>_YYYY_MM for every month touched by a date range
+CREATE OR REPLACE FUNCTION create_metrics_partitions(start_date DATE, end_date DATE)
+RETURNS INTEGER AS $$
+DECLARE
+    parent TEXT;
+    part_start DATE;
+    part_name TEXT;
+    created INTEGER := 0;
+BEGIN
+    -- Serialize concurrent writers creating the same month
+    PERFORM pg_advisory_xact_lock(hashtext('create_metrics_partitions'));
+
+    -- Tables still awaiting the partitioning migration are skipped
+    FOR parent IN
+        SELECT relname FROM pg_class
+        WHERE oid IN (to_regclass('activity_events'), to_regclass('keyword_extractions'),
+                      to_regclass('paperless_uploads'))
+        AND relkind = 'p'
+    LOOP
+        part_start := date_trunc('month', start_date)::DATE;
+        WHILE part_start <= end_date LOOP
+            part_name := parent || '_' || to_char(part_start, 'YYYY_MM');
+            IF to_regclass(part_name) IS NULL THEN
+                EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                               part_name, parent, part_start, (part_start + INTERVAL '1 month')::DATE);
+                created := created + 1;
+            END IF;
+            part_start := (part_start + INTERVAL '1 month')::DATE;
+        END LOOP;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Retention: detach (or drop) every partition that ends on or before the cutoff
+CREATE OR REPLACE FUNCTION expire_metrics_partitions(cutoff DATE, drop_partitions BOOLEAN)
+RETURNS INTEGER AS $$
+DECLARE
+    part RECORD;
+    expired INTEGER := 0;
+BEGIN
+    FOR part IN
+        SELECT parent.relname AS parent, child.relname AS child
+        FROM pg_inherits i
+        JOIN pg_class parent ON parent.oid = i.inhparent
+        JOIN pg_class child ON child.oid = i.inhrelid
+        WHERE i.inhparent IN (to_regclass('activity_events'), to_regclass('keyword_extractions'),
+                              to_regclass('paperless_uploads'))
+        AND child.relname ~ '_[0-9]{4}_[0-9]{2}$'
+        AND to_date(right(child.relname, 7), 'YYYY_MM') + INTERVAL '1 month' <= cutoff
+        ORDER BY child.relname
+    LOOP
+        EXECUTE format('ALTER TABLE %I DETACH PARTITION %I', part.parent, part.child);
+        IF drop_partitions THEN
+            EXECUTE format('DROP TABLE %I', part.child);
+        ELSE
+            -- Free the month's name so create_metrics_partitions can recreate it
+            EXECUTE format('ALTER TABLE %I RENAME TO %I', part.child,
+                           part.child || '_detached_' || to_char(clock_timestamp(), 'YYYYMMDDHH24MISS'));
+        END IF;
+        expired := expired + 1;
+    END LOOP;
+    RETURN expired;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Partitions for the current month and the next three (the backend creates later ones as needed)
+SELECT create_metrics_partitions(CURRENT_DATE, (CURRENT_DATE + INTERVAL '3 months')::DATE);
 
 -- Create indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_activity_events_date ON activity_events(date);
 CREATE INDEX IF NOT EXISTS idx_activity_events_type ON activity_events(event_type);
 CREATE INDEX IF NOT EXISTS idx_keyword_extractions_date ON keyword_extractions(date);
 CREATE INDEX IF NOT EXISTS idx_paperless_uploads_date ON paperless_uploads(date);
+CREATE INDEX IF NOT EXISTS idx_paperless_uploads_task_id ON paperless_uploads(task_id);
+-- Keyset pagination of history on (timestamp, id); also serves ORDER BY timestamp DESC LIMIT n
+CREATE INDEX IF NOT EXISTS idx_activity_events_ts_id ON activity_events(timestamp DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_keyword_extractions_ts_id ON keyword_extractions(timestamp DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_paperless_uploads_ts_id ON paperless_uploads(timestamp DESC, id DESC);
+-- Per-day counts by event type and status
+CREATE INDEX IF NOT EXISTS idx_activity_events_date_type_status ON activity_events(date, event_type, status);
+-- Containment lookups such as "papers with keyword X"
+CREATE INDEX IF NOT EXISTS idx_keyword_extractions_primary_keywords ON keyword_extractions USING GIN (primary_keywords);
+CREATE INDEX IF NOT EXISTS idx_keyword_extractions_domain_tags ON keyword_extractions USING GIN (domain_tags);
+-- Substring title search (/keywords/search)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_keyword_extractions_title_trgm
+    ON keyword_extractions USING GIN (paper_title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_paperless_uploads_pending ON paperless_uploads(timestamp)
+    WHERE completed_at IS NULL AND status = 'success';
 CREATE INDEX IF NOT EXISTS idx_daily_metrics_date ON daily_metrics(date);
 
--- Function to update daily metrics
+-- Durable tier of the LLM keyword extraction cache, shared by every backend worker
+CREATE TABLE IF NOT EXISTS keyword_extraction_cache (
+    cache_key CHAR(64) PRIMARY KEY,
+    result JSONB NOT NULL,
+    model VARCHAR(100),
+    prompt_version VARCHAR(50),
+    created_at TIMESTAMP DEFAULT NOW(),
+    expires_at TIMESTAMP NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_keyword_extraction_cache_expires ON keyword_extraction_cache(expires_at);
+
+-- Rebuild daily metrics for a date range from the raw tables (repair/backfill)
+CREATE OR REPLACE FUNCTION rebuild_daily_metrics(start_date DATE, end_date DATE)
+RETURNS INTEGER AS $$
+DECLARE
+    rebuilt INTEGER;
+BEGIN
+    -- Block incremental updates until the rebuilt rows are committed
+    LOCK TABLE daily_metrics IN SHARE ROW EXCLUSIVE MODE;
+
+    DELETE FROM daily_metrics WHERE date BETWEEN start_date AND end_date;
+
+    -- Raw tables are filtered on timestamp, the partition key, so only months in range are read
+    INSERT INTO daily_metrics (date, papers_imported, papers_uploaded, keywords_extracted,
+                               confidence_score_sum, confidence_score_count, avg_confidence_score)
+    SELECT
+        d.date,
+        COALESCE(ae.imported, 0),
+        COALESCE(ae.uploaded, 0),
+        COALESCE(ke.extracted, 0),
+        COALESCE(ke.confidence_sum, 0),
+        COALESCE(ke.confidence_count, 0),
+        COALESCE(ROUND(ke.confidence_sum / NULLIF(ke.confidence_count, 0), 2), 0.0)
+    FROM (
+        SELECT date FROM activity_events WHERE timestamp >= start_date AND timestamp < end_date + 1
+        UNION
+        SELECT date FROM keyword_extractions WHERE timestamp >= start_date AND timestamp < end_date + 1
+    ) d
+    LEFT JOIN (
+        SELECT date,
+            COUNT(*) FILTER (WHERE event_type = 'import' AND status = 'success') AS imported,
+            COUNT(*) FILTER (WHERE event_type = 'paperless_upload' AND status = 'success') AS uploaded
+        FROM activity_events
+        WHERE timestamp >= start_date AND timestamp < end_date + 1
+        GROUP BY date
+    ) ae ON ae.date = d.date
+    LEFT JOIN (
+        SELECT date,
+            COUNT(*) AS extracted,
+            SUM(confidence_score) AS confidence_sum,
+            COUNT(confidence_score) AS confidence_count
+        FROM keyword_extractions
+        WHERE timestamp >= start_date AND timestamp < end_date + 1
+        GROUP BY date
+    ) ke ON ke.date = d.date;
+
+    GET DIAGNOSTICS rebuilt = ROW_COUNT;
+    RETURN rebuilt;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Kept for compatibility: a single-day rebuild
 CREATE OR REPLACE FUNCTION update_daily_metrics(target_date DATE)
 RETURNS VOID AS $$
 BEGIN
-    INSERT INTO daily_metrics (date, papers_imported, papers_uploaded, keywords_extracted, avg_confidence_score)
-    SELECT 
-        target_date,
-        COALESCE(SUM(CASE WHEN event_type = 'import' AND status = 'success' THEN 1 ELSE 0 END), 0),
-        COALESCE(SUM(CASE WHEN event_type = 'paperless_upload' AND status = 'success' THEN 1 ELSE 0 END), 0),
-        COALESCE(COUNT(DISTINCT ke.id), 0),
-        COALESCE(AVG(ke.confidence_score), 0.0)
-    FROM activity_events ae
-    LEFT JOIN keyword_extractions ke ON ke.date = target_date
-    WHERE ae.date = target_date
+    PERFORM rebuild_daily_metrics(target_date, target_date);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Incremental maintenance: each INSERT statement adds its per-day deltas
+CREATE OR REPLACE FUNCTION daily_metrics_add_activity()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO daily_metrics (date, papers_imported, papers_uploaded)
+    SELECT date,
+        COUNT(*) FILTER (WHERE event_type = 'import' AND status = 'success'),
+        COUNT(*) FILTER (WHERE event_type = 'paperless_upload' AND status = 'success')
+    FROM new_rows
+    GROUP BY date
+    ON CONFLICT (date) DO UPDATE SET
+        papers_imported = daily_metrics.papers_imported + EXCLUDED.papers_imported,
+        papers_uploaded = daily_metrics.papers_uploaded + EXCLUDED.papers_uploaded,
+        updated_at = NOW();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION daily_metrics_add_extractions()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO daily_metrics (date, keywords_extracted, confidence_score_sum,
+                               confidence_score_count, avg_confidence_score)
+    SELECT date,
+        COUNT(*),
+        COALESCE(SUM(confidence_score), 0),
+        COUNT(confidence_score),
+        COALESCE(ROUND(SUM(confidence_score) / NULLIF(COUNT(confidence_score), 0), 2), 0.0)
+    FROM new_rows
+    GROUP BY date
     ON CONFLICT (date) DO UPDATE SET
-        papers_imported = EXCLUDED.papers_imported,
-        papers_uploaded = EXCLUDED.papers_uploaded,
-        keywords_extracted = EXCLUDED.keywords_extracted,
-        avg_confidence_score = EXCLUDED.avg_confidence_score,
+        keywords_extracted = daily_metrics.keywords_extracted + EXCLUDED.keywords_extracted,
+        confidence_score_sum = daily_metrics.confidence_score_sum + EXCLUDED.confidence_score_sum,
+        confidence_score_count = daily_metrics.confidence_score_count + EXCLUDED.confidence_score_count,
+        avg_confidence_score = COALESCE(ROUND(
+            (daily_metrics.confidence_score_sum + EXCLUDED.confidence_score_sum)
+            / NULLIF(daily_metrics.confidence_score_count + EXCLUDED.confidence_score_count, 0), 2), 0.0),
         updated_at = NOW();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_activity_events_daily_metrics ON activity_events;
+CREATE TRIGGER trg_activity_events_daily_metrics
+AFTER INSERT ON activity_events
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION daily_metrics_add_activity();
+
+DROP TRIGGER IF EXISTS trg_keyword_extractions_daily_metrics ON keyword_extractions;
+CREATE TRIGGER trg_keyword_extractions_daily_metrics
+AFTER INSERT ON keyword_extractions
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION daily_metrics_add_extractions();
+
+-- Keyword, domain and upload counts per day, so the dashboard sums a few small rows
+CREATE TABLE IF NOT EXISTS keyword_daily_counts (
+    date DATE NOT NULL,
+    keyword TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (date, keyword)
+);
+
+CREATE TABLE IF NOT EXISTS domain_daily_counts (
+    date DATE NOT NULL,
+    domain TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (date, domain)
+);
+
+CREATE TABLE IF NOT EXISTS upload_daily_stats (
+    date DATE PRIMARY KEY,
+    total INTEGER NOT NULL DEFAULT 0,
+    submitted INTEGER NOT NULL DEFAULT 0,
+    upload_errors INTEGER NOT NULL DEFAULT 0,
+    processing_errors INTEGER NOT NULL DEFAULT 0
+);
+
+-- Rebuild the analytics rollups for a date range from the raw tables (repair/backfill)
+CREATE OR REPLACE FUNCTION rebuild_analytics_rollups(start_date DATE, end_date DATE)
+RETURNS INTEGER AS $$
+DECLARE
+    rebuilt INTEGER;
+BEGIN
+    -- Block incremental updates until the rebuilt rows are committed
+    LOCK TABLE keyword_daily_counts, domain_daily_counts, upload_daily_stats IN SHARE ROW EXCLUSIVE MODE;
+
+    DELETE FROM keyword_daily_counts WHERE date BETWEEN start_date AND end_date;
+    DELETE FROM domain_daily_counts WHERE date BETWEEN start_date AND end_date;
+    DELETE FROM upload_daily_stats WHERE date BETWEEN start_date AND end_date;
+
+    -- Raw tables are filtered on timestamp, the partition key, so only months in range are read
+    INSERT INTO keyword_daily_counts (date, keyword, count)
+    SELECT date, keyword, COUNT(*)
+    FROM keyword_extractions, unnest(primary_keywords) AS keyword
+    WHERE timestamp >= start_date AND timestamp < end_date + 1
+    GROUP BY date, keyword;
+
+    INSERT INTO domain_daily_counts (date, domain, count)
+    SELECT date, domain, COUNT(*)
+    FROM keyword_extractions, unnest(domain_tags) AS domain
+    WHERE timestamp >= start_date AND timestamp < end_date + 1
+    GROUP BY date, domain;
+
+    INSERT INTO upload_daily_stats (date, total, submitted, upload_errors, processing_errors)
+    SELECT date,
+        COUNT(*),
+        COUNT(*) FILTER (WHERE status = 'success'),
+        COUNT(*) FILTER (WHERE status = 'error'),
+        COUNT(*) FILTER (WHERE task_status = 'FAILURE')
+    FROM paperless_uploads
+    WHERE timestamp >= start_date AND timestamp < end_date + 1
+    GROUP BY date;
+
+    SELECT COUNT(*) INTO rebuilt FROM (
+        SELECT date FROM keyword_daily_counts WHERE date BETWEEN start_date AND end_date
+        UNION
+        SELECT date FROM domain_daily_counts WHERE date BETWEEN start_date AND end_date
+        UNION
+        SELECT date FROM upload_daily_stats WHERE date BETWEEN start_date AND end_date
+    ) d;
+    RETURN rebuilt;
 END;
 $$ LANGUAGE plpgsql;
+
+-- Incremental rollup maintenance: each statement adds its per-day deltas
+CREATE OR REPLACE FUNCTION analytics_rollups_add_extractions()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Sorted so concurrent writers lock rollup rows in the same order
+    INSERT INTO keyword_daily_counts (date, keyword, count)
+    SELECT date, keyword, COUNT(*)
+    FROM new_rows, unnest(primary_keywords) AS keyword
+    GROUP BY date, keyword
+    ORDER BY date, keyword
+    ON CONFLICT (date, keyword) DO UPDATE SET
+        count = keyword_daily_counts.count + EXCLUDED.count;
+
+    INSERT INTO domain_daily_counts (date, domain, count)
+    SELECT date, domain, COUNT(*)
+    FROM new_rows, unnest(domain_tags) AS domain
+    GROUP BY date, domain
+    ORDER BY date, domain
+    ON CONFLICT (date, domain) DO UPDATE SET
+        count = domain_daily_counts.count + EXCLUDED.count;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION analytics_rollups_add_uploads()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO upload_daily_stats (date, total, submitted, upload_errors, processing_errors)
+    SELECT date,
+        COUNT(*),
+        COUNT(*) FILTER (WHERE status = 'success'),
+        COUNT(*) FILTER (WHERE status = 'error'),
+        COUNT(*) FILTER (WHERE task_status = 'FAILURE')
+    FROM new_rows
+    GROUP BY date
+    ORDER BY date
+    ON CONFLICT (date) DO UPDATE SET
+        total = upload_daily_stats.total + EXCLUDED.total,
+        submitted = upload_daily_stats.submitted + EXCLUDED.submitted,
+        upload_errors = upload_daily_stats.upload_errors + EXCLUDED.upload_errors,
+        processing_errors = upload_daily_stats.processing_errors + EXCLUDED.processing_errors;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION analytics_rollups_update_uploads()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- The task poller sets task_status after the fact; apply only the change
+    INSERT INTO upload_daily_stats (date, processing_errors)
+    SELECT n.date,
+        SUM((n.task_status IS NOT DISTINCT FROM 'FAILURE')::INTEGER
+            - (o.task_status IS NOT DISTINCT FROM 'FAILURE')::INTEGER)
+    FROM new_rows n
+    JOIN old_rows o ON o.id = n.id
+    WHERE n.task_status IS DISTINCT FROM o.task_status
+    GROUP BY n.date
+    HAVING SUM((n.task_status IS NOT DISTINCT FROM 'FAILURE')::INTEGER
+               - (o.task_status IS NOT DISTINCT FROM 'FAILURE')::INTEGER) <> 0
+    ORDER BY n.date
+    ON CONFLICT (date) DO UPDATE SET
+        processing_errors = upload_daily_stats.processing_errors + EXCLUDED.processing_errors;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_keyword_extractions_rollups ON keyword_extractions;
+CREATE TRIGGER trg_keyword_extractions_rollups
+AFTER INSERT ON keyword_extractions
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION analytics_rollups_add_extractions();
+
+DROP TRIGGER IF EXISTS trg_paperless_uploads_rollups_insert ON paperless_uploads;
+CREATE TRIGGER trg_paperless_uploads_rollups_insert
+AFTER INSERT ON paperless_uploads
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION analytics_rollups_add_uploads();
+
+DROP TRIGGER IF EXISTS trg_paperless_uploads_rollups_update ON paperless_uploads;
+CREATE TRIGGER trg_paperless_uploads_rollups_update
+AFTER UPDATE ON paperless_uploads
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION analytics_rollups_update_uploads();
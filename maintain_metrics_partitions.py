@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Create upcoming monthly partitions for the metrics event tables and apply the
+retention policy (METRICS_RETENTION_MONTHS / METRICS_RETENTION_ACTION).
+The backend does this on startup; run it from cron for long-running deployments.
+
+Usage:
+    python maintain_metrics_partitions.py [--retention-months N] [--action detach|drop]
+"""
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "KDB-importer", "backend"))
+
+from arxiv_importer.core.metrics_tracker import metrics_tracker  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create metrics partitions and expire old ones")
+    parser.add_argument("--retention-months", type=int, default=metrics_tracker.retention_months,
+                        help="Whole months of raw events to keep before the current one (0 keeps everything)")
+    parser.add_argument("--action", choices=["detach", "drop"], default=metrics_tracker.retention_action,
+                        help="Detach expired partitions (kept as standalone tables) or drop them")
+    args = parser.parse_args()
+
+    metrics_tracker.retention_months = args.retention_months
+    metrics_tracker.retention_action = args.action
+    try:
+        result = metrics_tracker.maintain_partitions()
+        print(f"✅ Created {result['created']} partition(s)")
+        if args.retention_months > 0:
+            verb = "Dropped" if args.action == "drop" else "Detached"
+            print(f"✅ {verb} {result['expired']} partition(s) older than {args.retention_months} month(s)")
+    finally:
+        metrics_tracker.close()
+
+
+if __name__ == "__main__":
+    main()
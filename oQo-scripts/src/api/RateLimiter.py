@@ -0,0 +1,120 @@
+import asyncio
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """
+    Allows `rate` requests per second on average and bursts of up to `burst`.
+
+    Callers reserve a token and get back how long to wait before using it, so
+    the lock is never held while sleeping and waiters are served in order.
+    """
+
+    def __init__(self, rate: float | None, burst: int = 1):
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive, or None for no limit")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return the seconds to wait before it becomes valid."""
+        if self.rate is None:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Going negative queues the caller behind those already waiting
+            self._tokens -= 1
+
+            return max(0.0, -self._tokens / self.rate)
+
+
+class RateLimiter:
+    """
+    Token buckets keyed by host.
+
+    Hosts without an explicit limit share the default rate, each with its own
+    bucket. `jitter` adds up to that many seconds to every wait that is needed,
+    so workers released together do not hit the remote in lockstep.
+    """
+
+    def __init__(self, rate: float | None = None, burst: int = 1, jitter: float = 0.0):
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+
+        self._limits: dict[str, tuple[float | None, int, float]] = {}
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host(url: str) -> str:
+        """Host part of a URL; a bare host name is returned as is."""
+        return (urlsplit(url).hostname or url).lower()
+
+    def limit(self, host: str, rate: float | None, burst: int = 1, jitter: float | None = None) -> None:
+        """Set the limit of one host (a URL works too)."""
+        host = self.host(host)
+        limit = (rate, burst, self.jitter if jitter is None else jitter)
+
+        with self._lock:
+            if self._limits.get(host) == limit:
+                return
+            self._limits[host] = limit
+            self._buckets[host] = TokenBucket(rate, burst)
+
+    def _delay(self, url: str) -> float:
+        host = self.host(url)
+
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+            jitter = self._limits.get(host, (None, None, self.jitter))[2]
+
+        delay = bucket.reserve()
+        if delay > 0 and jitter:
+            delay += random.uniform(0, jitter)
+        return delay
+
+    def acquire(self, url: str) -> float:
+        """Block until a request to `url` is allowed. Returns the seconds waited."""
+        delay = self._delay(url)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+class AsyncRateLimiter(RateLimiter):
+    """RateLimiter whose acquire() waits with asyncio.sleep instead of blocking the thread."""
+
+    @classmethod
+    def sharing(cls, limiter: RateLimiter) -> "AsyncRateLimiter":
+        """An AsyncRateLimiter drawing from the same per-host buckets as `limiter`."""
+        shared = cls(limiter.rate, limiter.burst, limiter.jitter)
+        shared._limits, shared._buckets, shared._lock = limiter._limits, limiter._buckets, limiter._lock
+        return shared
+
+    async def acquire(self, url: str) -> float:
+        delay = self._delay(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+# Shared by every client so two clients talking to one host split its budget.
+# Hosts nobody configured get one request every 3 seconds.
+rate_limiter = RateLimiter(rate=1 / 3)
+# Same buckets for async clients, so sync and async code split a host's budget too
+async_rate_limiter = AsyncRateLimiter.sharing(rate_limiter)
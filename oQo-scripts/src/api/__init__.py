@@ -1,14 +1,24 @@
 from .clients.APIClient import APIClient
 from .clients.ArxivClient import ArxivClient
 from .clients.PaperlessClient import PaperlessClient
-from .Sleeper import Sleeper
+from .clients.AsyncAPIClient import AsyncAPIClient
+from .clients.AsyncArxivClient import AsyncArxivClient
+from .clients.AsyncPaperlessClient import AsyncPaperlessClient
+from .RateLimiter import TokenBucket, RateLimiter, AsyncRateLimiter, rate_limiter, async_rate_limiter
 from .utils import safe_file_prefix, create_tmp_import_file, europeanize, to_iso_date, safe_file_prefix
 
 __all__ = [
     "APIClient",
     "ArxivClient",
     "PaperlessClient",
-    "Sleeper",
+    "AsyncAPIClient",
+    "AsyncArxivClient",
+    "AsyncPaperlessClient",
+    "TokenBucket",
+    "RateLimiter",
+    "AsyncRateLimiter",
+    "rate_limiter",
+    "async_rate_limiter",
     "safe_file_prefix",
     "create_tmp_import_file",
     "to_iso_date",
@@ -1,9 +1,18 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Any, Mapping, MutableMapping, Optional, Union
-from urllib.parse import urlencode, urljoin
+from urllib.parse import urlencode, urljoin, urlsplit
+import random
+import re
+import threading
+import time
 import requests # type: ignore
+from requests.adapters import HTTPAdapter # type: ignore
+from urllib3.exceptions import NewConnectionError # type: ignore
 
 from config import get_logger
-from ..Sleeper import Sleeper
+from ..RateLimiter import RateLimiter, rate_limiter as shared_rate_limiter
 
 JSON = Union[dict[str, Any], list, str, int, float, bool, None]
 logger = get_logger("Logger4ScrappingoQo")
@@ -12,36 +21,168 @@ logger = get_logger("Logger4ScrappingoQo")
 # _http_client.HTTPConnection.debuglevel = 1    # dump brut des requêtes
 # logging.basicConfig(stream=sys.stderr, level=logging.DEBUG)
 
+# Methods a server may receive twice without a different outcome
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# Statuses telling the request was refused before being processed: safe to resend any method
+REFUSED_STATUSES = frozenset({429, 503})
 
-class APIClient(Sleeper):
+
+def _retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Seconds asked for by a Retry-After header (delay or HTTP date), if any."""
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _never_sent(exc: requests.exceptions.RequestException) -> bool:
+    """True when the connection failed before the request could reach the server."""
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def _endpoint_key(method: str, url: str) -> str:
+    """'GET /api/documents/{id}/' — numeric path segments are grouped together."""
+    return f"{method} " + re.sub(r"/\d+(?=/|$)", "/{id}", urlsplit(url).path)
+
+
+@dataclass
+class EndpointStats:
+    """Counters of the requests sent to one endpoint."""
+    requests: int = 0
+    retries: int = 0
+    errors: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.requests if self.requests else 0.0
+
+
+class BaseAPIClient:
+    """Configuration, rate limiting, retry rules and counters shared by APIClient and AsyncAPIClient."""
     base_url: str = ""
     default_headers: Mapping[str, str] = {}
+    # Requests per second the remote allows (None: the limiter's default) and burst size
+    rate: Optional[float] = None
+    burst: int = 1
+    # Raise once retries are exhausted instead of returning the error body
+    raise_for_status: bool = False
     
     def __init__(
         self,
         *,
         base_url: Optional[str] = None,
         headers: Optional[Mapping[str, str]] = None,
-        idle_time: float = 0.0,
-        random_idle_time: bool = False,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        jitter: Optional[float] = None,
+        rate_limiter: Optional[RateLimiter] = None,
         parse_json: bool = True,
         timeout: int = 30,
+        max_retries: int = 3,
+        retry_backoff: float = 1.0,
+        max_retry_delay: float = 120.0,
+        retry_statuses: frozenset[int] = frozenset({429, 500, 502, 503, 504}),
     ) -> None:
-        super().__init__(idle_time, random_idle_time)
-
         if base_url is not None:
             self.base_url = base_url.rstrip("/")
 
+        self.rate_limiter = rate_limiter or shared_rate_limiter
+        if rate is not None:
+            self.rate = rate
+        if burst is not None:
+            self.burst = burst
+        if self.rate is not None:
+            self.rate_limiter.limit(self.base_url, self.rate, self.burst, jitter)
+
         self.parse_json = parse_json
         self.timeout = timeout
 
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.max_retry_delay = max_retry_delay
+        self.retry_statuses = retry_statuses
+
+        self.stats: dict[str, EndpointStats] = {}
+        self._stats_lock = threading.Lock()
+
         self.headers: MutableMapping[str, str] = {
             **self.default_headers,
             **(headers or {}),
         }
 
+    def _url(self, endpoint: str) -> str:
+        return urljoin(f"{self.base_url}/", endpoint.lstrip("/"))
+
+    @staticmethod
+    def _can_resend(method: str, idempotent: Optional[bool]) -> bool:
+        return method in IDEMPOTENT_METHODS if idempotent is None else idempotent
+
+    def _retry_status(self, status: int, can_resend: bool) -> bool:
+        return status in self.retry_statuses and (can_resend or status in REFUSED_STATUSES)
+
+    def _retry_delay(
+        self, key: str, url: str, attempt: int, reason: str, retry_after: Optional[float] = None
+    ) -> float:
+        """Count a retry and return how long to wait before it."""
+        delay = self.retry_backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        delay = min(delay, self.max_retry_delay)
+
+        with self._stats_lock:
+            self.stats[key].retries += 1
+        logger.warning(
+            "%s/_request: %s on %s (attempt %d/%d), retrying in %.1fs",
+            type(self).__name__, reason, url, attempt, self.max_retries + 1, delay,
+        )
+        return delay
+
+    def _record(self, key: str, latency: float, error: bool) -> None:
+        with self._stats_lock:
+            stats = self.stats.setdefault(key, EndpointStats())
+            stats.requests += 1
+            stats.errors += error
+            stats.total_latency += latency
+            stats.max_latency = max(stats.max_latency, latency)
+
+    def get_stats(self) -> dict[str, dict[str, float]]:
+        """Per-endpoint request, retry and error counts with latencies in seconds."""
+        with self._stats_lock:
+            return {
+                key: {
+                    "requests": stats.requests,
+                    "retries": stats.retries,
+                    "errors": stats.errors,
+                    "mean_latency": round(stats.mean_latency, 3),
+                    "max_latency": round(stats.max_latency, 3),
+                }
+                for key, stats in self.stats.items()
+            }
+
+
+class APIClient(BaseAPIClient):
+    def __init__(self, *, pool_size: int = 10, **kwargs) -> None:
+        super().__init__(**kwargs)
+
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+
+        # One pool per host, sized for the worker threads sharing this client; retries are ours
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
             
     def _request(
         self,
@@ -54,34 +195,62 @@ class APIClient(Sleeper):
         files: Optional[Mapping[str, Any]] = None,
         headers: Optional[Mapping[str, str]] = None,
         parse_json: Optional[bool] = None,
+        idempotent: Optional[bool] = None,
     ) -> Any:
-        url   = urljoin(f"{self.base_url}/", endpoint.lstrip("/"))
+        """
+        Send a request, retrying transient failures.
+
+        Connection errors before the request was sent, 429 and 503 are retried for
+        every method; read timeouts, other connection errors and the remaining
+        retry_statuses only for idempotent methods (pass idempotent=True to allow
+        it for a POST the server deduplicates). Waits grow exponentially with
+        jitter and honour Retry-After. Once retries are exhausted an HTTP error is
+        logged and its body returned (raised if raise_for_status is set), network
+        errors are raised.
+        """
+        method = method.upper()
+        url   = self._url(endpoint)
         hdrs  = {**self.session.headers, **(headers or {})}
+        can_resend = self._can_resend(method, idempotent)
+        key = _endpoint_key(method, url)
 
-        self.time_action()
+        for attempt in range(1, self.max_retries + 2):
+            self.rate_limiter.acquire(url)
+            self._rewind(files)
 
-        resp  = self.session.request(
-            method=method.upper(),
-            url=url,
-            headers=hdrs,
-            params=params,
-            json=json, data=data, files=files,
-            timeout=self.timeout,
-            verify=getattr(self, "verify_ssl", True),
-        )
-        
-        try:
-            resp.raise_for_status()
-        except requests.exceptions.HTTPError as exception:
-            status = exception.response.status_code
-            body = exception.response.text.strip()
-            logger.error(f"HTTP {status} on {url} - Body:\n{body}")
-        
-        except requests.exceptions.RequestException as exc:
-            logger.error("Request failed on %s — %s", url, exc)
-            raise
+            started = time.monotonic()
+            try:
+                resp  = self.session.request(
+                    method=method,
+                    url=url,
+                    headers=hdrs,
+                    params=params,
+                    json=json, data=data, files=files,
+                    timeout=self.timeout,
+                    verify=getattr(self, "verify_ssl", True),
+                )
+            except requests.exceptions.RequestException as exc:
+                self._record(key, time.monotonic() - started, error=True)
+                retryable = isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+                if attempt > self.max_retries or not retryable or not (_never_sent(exc) or can_resend):
+                    logger.error("Request failed on %s — %s", url, exc)
+                    raise
+                time.sleep(self._retry_delay(key, url, attempt, str(exc)))
+                continue
+
+            failed = resp.status_code >= 400
+            self._record(key, time.monotonic() - started, error=failed)
+            if not failed:
+                break
+
+            if attempt > self.max_retries or not self._retry_status(resp.status_code, can_resend):
+                logger.error(f"HTTP {resp.status_code} on {url} - Body:\n{resp.text.strip()}")
+                if self.raise_for_status:
+                    resp.raise_for_status()
+                break
+            time.sleep(self._retry_delay(
+                key, url, attempt, f"HTTP {resp.status_code}", _retry_after(resp.headers)))
 
-        
         should_parse = self.parse_json if parse_json is None else parse_json
         
         if should_parse:
@@ -92,6 +261,14 @@ class APIClient(Sleeper):
 
         return resp.content
 
+    @staticmethod
+    def _rewind(files: Optional[Mapping[str, Any]]) -> None:
+        """Seek uploaded file objects back to the start so a retry sends them whole."""
+        for value in (files or {}).values():
+            handle = value[1] if isinstance(value, tuple) else value
+            if hasattr(handle, "seek"):
+                handle.seek(0)
+
     def get(self, endpoint: str, **kwargs):
         return self._request("GET", endpoint, **kwargs)
 
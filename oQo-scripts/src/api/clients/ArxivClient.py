@@ -5,9 +5,14 @@ from core import DocumentData
 
 class ArxivClient(APIClient):
     base_url = "https://export.arxiv.org"
+    # arXiv asks for no more than one request every 3 seconds; PDFs are served from arxiv.org
+    rate = 1 / 3
+    # A failed query must not look like an empty last page
+    raise_for_status = True
 
-    def __init__(self, idle_time=3, **kwargs):
-        super().__init__(idle_time=idle_time, parse_json=False, **kwargs)
+    def __init__(self, **kwargs):
+        super().__init__(parse_json=False, **kwargs)
+        self.rate_limiter.limit("arxiv.org", self.rate, self.burst, kwargs.get("jitter"))
 
     def search(
         self,
@@ -18,28 +23,39 @@ class ArxivClient(APIClient):
         sort_by: str = "submittedDate",
         sort_order: str = "descending",
     ) -> list[DocumentData]:
-        params = {
-            "search_query": query,
-            "start": start,
-            "max_results": max_results,
-            "sortBy": sort_by,
-            "sortOrder": sort_order,
-        }
-
+        params = search_params(query, max_results, start, sort_by, sort_order)
         feed_xml = self.get("/api/query", params=params)
-        parsed = feedparser.parse(feed_xml)
-        parsed_response: DocumentData = []
-
-        for entry in parsed.entries:
-            parsed_response.append(DocumentData(
-                title=entry.title.strip(),
-                created=entry.published[:10],
-                authors=[author.name for author in entry.authors],
-                download_url=next((l.href for l in entry.links if l.type == "application/pdf"), None),
-                import_query=query,
-                document_type="Scientific-Paper",
-                source="https://arxiv.org/"
-            ))
-            
-        return parsed_response
-    
\ No newline at end of file
+        return parse_feed(feed_xml, query)
+
+
+def search_params(query: str, max_results: int, start: int, sort_by: str, sort_order: str) -> dict:
+    return {
+        "search_query": query,
+        "start": start,
+        "max_results": max_results,
+        "sortBy": sort_by,
+        "sortOrder": sort_order,
+    }
+
+
+def parse_feed(feed_xml: str, query: str) -> list[DocumentData]:
+    parsed = feedparser.parse(feed_xml)
+    parsed_response: DocumentData = []
+
+    # arXiv reports a malformed query as a 200 feed holding a single error entry
+    for entry in parsed.entries:
+        if "/api/errors" in entry.get("id", ""):
+            raise ValueError(f"arXiv rejected '{query}': {entry.get('summary', '').strip()}")
+
+    for entry in parsed.entries:
+        parsed_response.append(DocumentData(
+            title=entry.title.strip(),
+            created=entry.published[:10],
+            authors=[author.name for author in entry.authors],
+            download_url=next((l.href for l in entry.links if l.type == "application/pdf"), None),
+            import_query=query,
+            document_type="Scientific-Paper",
+            source="https://arxiv.org/"
+        ))
+        
+    return parsed_response
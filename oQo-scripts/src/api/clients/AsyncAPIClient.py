@@ -0,0 +1,130 @@
+from typing import Any, Mapping, Optional
+import asyncio
+import time
+import httpx # type: ignore
+
+from config import get_logger
+from .APIClient import BaseAPIClient, JSON, _endpoint_key, _retry_after
+from ..RateLimiter import AsyncRateLimiter, async_rate_limiter
+
+logger = get_logger("Logger4ScrappingoQo")
+
+# The connection was never made, so the server cannot have seen the request
+_NOT_SENT = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class AsyncAPIClient(BaseAPIClient):
+    """
+    asyncio counterpart of APIClient, on an httpx.AsyncClient speaking HTTP/2.
+
+    Same retry rules, counters and method surface, awaited. One client keeps its
+    connections alive across requests, so hundreds of requests can be fanned
+    out with asyncio.gather; the rate limiter (an AsyncRateLimiter, or anything
+    with its limit() and awaitable acquire()) still spaces them per host. Use it
+    as an async context manager, or call aclose() when done.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate_limiter: Optional[AsyncRateLimiter] = None,
+        pool_size: int = 100,
+        http2: bool = True,
+        **kwargs,
+    ) -> None:
+        super().__init__(rate_limiter=rate_limiter or async_rate_limiter, **kwargs)
+
+        self.client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            http2=http2,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            verify=getattr(self, "verify_ssl", True),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        params: Optional[Mapping[str, Any]] = None,
+        json: Optional[JSON] = None,
+        data: Optional[Mapping[str, Any]] = None,
+        files: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        parse_json: Optional[bool] = None,
+        idempotent: Optional[bool] = None,
+    ) -> Any:
+        """Send a request, retrying transient failures like APIClient._request."""
+        method = method.upper()
+        url = self._url(endpoint)
+        can_resend = self._can_resend(method, idempotent)
+        key = _endpoint_key(method, url)
+
+        for attempt in range(1, self.max_retries + 2):
+            await self.rate_limiter.acquire(url)
+
+            started = time.monotonic()
+            try:
+                resp = await self.client.request(
+                    method,
+                    url,
+                    headers=headers,
+                    params=params,
+                    json=json, data=data, files=files,
+                )
+            except httpx.HTTPError as exc:
+                self._record(key, time.monotonic() - started, error=True)
+                retryable = isinstance(exc, httpx.TransportError)
+                if attempt > self.max_retries or not retryable or not (isinstance(exc, _NOT_SENT) or can_resend):
+                    logger.error("Request failed on %s — %r", url, exc)
+                    raise
+                await asyncio.sleep(self._retry_delay(key, url, attempt, repr(exc)))
+                continue
+
+            failed = resp.status_code >= 400
+            self._record(key, time.monotonic() - started, error=failed)
+            if not failed:
+                break
+
+            if attempt > self.max_retries or not self._retry_status(resp.status_code, can_resend):
+                logger.error(f"HTTP {resp.status_code} on {url} - Body:\n{resp.text.strip()}")
+                if self.raise_for_status:
+                    resp.raise_for_status()
+                break
+            await asyncio.sleep(self._retry_delay(
+                key, url, attempt, f"HTTP {resp.status_code}", _retry_after(resp.headers)))
+
+        should_parse = self.parse_json if parse_json is None else parse_json
+
+        if should_parse:
+            try:
+                return resp.json()
+            except ValueError:
+                return resp.text
+
+        return resp.content
+
+    async def get(self, endpoint: str, **kwargs):
+        return await self._request("GET", endpoint, **kwargs)
+
+    async def post(self, endpoint: str, **kwargs):
+        return await self._request("POST", endpoint, **kwargs)
+
+    async def put(self, endpoint: str, **kwargs):
+        return await self._request("PUT", endpoint, **kwargs)
+
+    async def patch(self, endpoint: str, **kwargs):
+        return await self._request("PATCH", endpoint, **kwargs)
+
+    async def delete(self, endpoint: str, **kwargs):
+        return await self._request("DELETE", endpoint, **kwargs)
@@ -0,0 +1,25 @@
+from .AsyncAPIClient import AsyncAPIClient
+from .ArxivClient import ArxivClient, search_params, parse_feed
+from core import DocumentData
+
+class AsyncArxivClient(AsyncAPIClient):
+    base_url = ArxivClient.base_url
+    rate = ArxivClient.rate
+    raise_for_status = ArxivClient.raise_for_status
+
+    def __init__(self, **kwargs):
+        super().__init__(parse_json=False, **kwargs)
+        self.rate_limiter.limit("arxiv.org", self.rate, self.burst, kwargs.get("jitter"))
+
+    async def search(
+        self,
+        query: str,
+        *,
+        max_results: int = 50,
+        start: int = 0,
+        sort_by: str = "submittedDate",
+        sort_order: str = "descending",
+    ) -> list[DocumentData]:
+        params = search_params(query, max_results, start, sort_by, sort_order)
+        feed_xml = await self.get("/api/query", params=params)
+        return parse_feed(feed_xml, query)
@@ -0,0 +1,121 @@
+from pathlib import Path
+from typing import Any
+import asyncio
+
+from .AsyncAPIClient import AsyncAPIClient
+from .PaperlessClient import PaperlessBase
+
+from config import get_logger
+from core import DocumentData
+
+logger = get_logger("Logger4ScrappingoQo")
+
+
+class AsyncPaperlessClient(PaperlessBase, AsyncAPIClient):
+    """
+    asyncio counterpart of PaperlessClient.
+
+    Tags, document types and custom fields are loaded on entering the client
+    (`async with AsyncPaperlessClient(...) as pp:`) or by awaiting init().
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        token: str,
+        verify_ssl: bool | str = True,
+        **kwargs,
+    ) -> None:
+        headers = {"Authorization": f"Token {token}"}
+        # Needed by AsyncAPIClient to build its connection pool
+        self.verify_ssl = verify_ssl
+        super().__init__(base_url=base_url, headers=headers, **kwargs)
+
+    async def __aenter__(self):
+        await self.init()
+        return self
+
+    async def init(self) -> None:
+        await asyncio.gather(self.init_custom_fields(), self.init_document_types(), self.init_tags())
+        logger.info("api/client/AsyncPaperlessClient: PP Init correctly.")
+
+    async def init_custom_fields(self):
+        self._load_custom_fields(await self.get_custom_fields())
+
+    async def init_document_types(self):
+        self._load_document_types(await self.get_document_types())
+
+    async def init_tags(self):
+        page = 1
+        response = await self.get_tags(page)
+        if not self._is_listing(response, "Tags"):
+            return
+
+        tags_list = response.get("results", [])
+        while isinstance(response.get("next", None), str):
+            page += 1
+            response = await self.get_tags(page)
+            if not self._is_listing(response, "Tags"):
+                break
+            tags_list += response.get("results", [])
+
+        self._load_tags(tags_list)
+
+    async def get_document_types(self, **filters) -> list[dict]:
+        return await self.get("/api/document_types/", params=filters)
+
+    async def get_documents(self, **filters) -> list[dict]:
+        return await self.get("/api/documents/", params=filters)
+
+    async def get_document(self, doc_id: int) -> dict:
+        return await self.get(f"/api/documents/{doc_id}/")
+
+    async def download_document(self, doc_id: int) -> bytes:
+        return await self.get(f"/api/documents/{doc_id}/download/", parse_json=False)
+
+    async def upload_document(
+        self,
+        file_path: str | Path,
+        doc_data: DocumentData,
+    ) -> dict:
+        file_path = Path(file_path)
+        data = self._upload_data(file_path, doc_data)
+        # Read in a thread so a large PDF does not stall the event loop
+        content = await asyncio.to_thread(file_path.read_bytes)
+
+        return await self.post(
+            "/api/documents/post_document/",
+            data=data,
+            files={"document": (file_path.name, content, "application/pdf")},
+        )
+
+    async def get_tags(self, page: int) -> list[dict]:
+        return await self.get(f"/api/tags/?page={page}&full_perms=true")
+
+    async def get_custom_fields(self) -> list[dict]:
+        return await self.get("/api/custom_fields/")
+
+    async def get_correspondents(self) -> list[dict]:
+        return await self.get("/api/correspondents/")
+
+    async def search_documents(self, query: str, **extra_filters) -> list[dict]:
+        return await self.get_documents(query=query, **extra_filters)
+
+    async def update_custom_fields(
+        self,
+        doc_id: int,
+        field_values: dict[int, Any],
+    ) -> dict:
+        payload = {"custom_fields": self.build_query_custom_fields(field_values)}
+
+        return await self.patch(f"/api/documents/{doc_id}/?full_perms=true", json=payload)
+
+    async def update_metadata(
+        self,
+        doc_id: int,
+        metadata: dict[str, Any],
+    ) -> dict:
+        payload = self._metadata_payload(metadata)
+
+        return await self.patch(f"/api/documents/{doc_id}/?full_perms=true", json=payload)
@@ -1,5 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, TypeVar
+import random
+import threading
+import time
+
+import requests # type: ignore
 
 from .APIClient import APIClient
 from ..utils import create_tmp_import_file, clean_author_string, get_id_select_custom_field
@@ -10,32 +17,83 @@ import json
 
 logger = get_logger("Logger4ScrappingoQo")
 
-class PaperlessClient(APIClient):
+T = TypeVar("T")
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """Network errors, timeouts, 429 and 5xx may succeed later; anything else will fail again."""
+    if isinstance(exc, requests.exceptions.HTTPError):
+        status = exc.response.status_code if exc.response is not None else None
+        return status is None or status == 429 or status >= 500
+    return isinstance(exc, (
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+        requests.exceptions.ChunkedEncodingError,
+    ))
+
+
+def _with_retries(
+    step: str,
+    title: str,
+    action: Callable[[], T],
+    *,
+    max_attempts: int,
+    retry_backoff: float,
+    on_retry: Callable[[], None] | None = None,
+) -> T:
+    """Run action, retrying retryable failures with exponential back-off and jitter."""
+    for attempt in range(1, max_attempts + 1):
+        try:
+            return action()
+        except Exception as exc:
+            if attempt == max_attempts or not _is_retryable(exc):
+                raise
+            delay = retry_backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+            logger.warning(
+                "PaperlessClient/import_entries: %s of '%s' failed (attempt %d/%d), "
+                "retrying in %.1fs — %s",
+                step, title, attempt, max_attempts, delay, exc,
+            )
+            if on_retry:
+                on_retry()
+            time.sleep(delay)
+
+
+@dataclass
+class ImportSummary:
+    """Counters of one import_entries run."""
+    total: int = 0
+    imported: int = 0
+    skipped: int = 0
+    retries: int = 0
+    failures: dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def papers_per_minute(self) -> float:
+        return self.imported / self.elapsed * 60 if self.elapsed else 0.0
+
+    def log(self) -> None:
+        logger.info(
+            "PaperlessClient/import_entries: %d/%d imported, %d already added, %d failed, "
+            "%d retries in %.1fs (%.1f papers/min)",
+            self.imported, self.total, self.skipped, len(self.failures),
+            self.retries, self.elapsed, self.papers_per_minute,
+        )
+        for title, error in self.failures.items():
+            logger.warning("PaperlessClient/import_entries: failed '%s' — %s", title, error)
+
+
+class PaperlessBase:
+    """Paperless metadata and payload building shared by PaperlessClient and AsyncPaperlessClient."""
     id_tags: dict[str: int] = {}
     id_document_types: dict[str: int] = {}
     custom_fields: dict[str: dict[str: Any]] = {}
+    # Our own server: a few requests per second is fine
+    rate = 2
+    burst = 4
 
-    def __init__(
-        self,
-        *,
-        base_url: str,
-        token: str,
-        idle_time: float = 3,
-        verify_ssl: bool | str = True,
-        **kwargs,
-    ) -> None:
-        headers = {"Authorization": f"Token {token}"}
-        super().__init__(base_url=base_url,idle_time=idle_time, headers=headers, **kwargs)
-        self.verify_ssl = verify_ssl
-        self.init_custom_fields()
-        self.init_document_types()
-        self.init_tags()
-
-        logger.info("api/client/PaperlessClient: PP Init correctly.")
-
-    def init_custom_fields(self):
-        response = self.get_custom_fields()
-        
+    def _load_custom_fields(self, response: Any) -> None:
         # Handle case where response might be a string (HTML error page)
         if isinstance(response, str):
             logger.error(f"Custom fields API returned string instead of JSON: {response[:200]}...")
@@ -59,10 +117,7 @@ class PaperlessClient(APIClient):
             
             self.custom_fields[field["name"]] = field_data
 
-
-    def init_document_types(self):
-        payload = self.get_document_types()
-        
+    def _load_document_types(self, payload: Any) -> None:
         # Handle case where response might be a string (HTML error page)
         if isinstance(payload, str):
             logger.error(f"Document types API returned string instead of JSON: {payload[:200]}...")
@@ -78,55 +133,25 @@ class PaperlessClient(APIClient):
             if name and isinstance(type_id, int):
                 self.id_document_types[name] = type_id
 
-    def init_tags(self):
-        page = 1
-        response = self.get_tags(page)
-        
+    def _is_listing(self, response: Any, name: str) -> bool:
         # Handle case where response might be a string (HTML error page)
         if isinstance(response, str):
-            logger.error(f"Tags API returned string instead of JSON: {response[:200]}...")
-            return
+            logger.error(f"{name} API returned string instead of JSON: {response[:200]}...")
+            return False
             
         if not isinstance(response, dict) or "results" not in response:
-            logger.error(f"Tags API returned unexpected format: {type(response)} - {response}")
-            return
-            
-        tags_list = []
-
-        while  isinstance(response.get("next", None), str):
-            response = self.get_tags(page)
-            if isinstance(response, dict) and "results" in response:
-                tags_list += response.get("results", [])
-            page += 1
-
-        if isinstance(response, dict) and "results" in response:
-            tags_list += response.get("results", [])
+            logger.error(f"{name} API returned unexpected format: {type(response)} - {response}")
+            return False
+        return True
 
+    def _load_tags(self, tags_list: list[dict]) -> None:
         for tag in tags_list:
             name = tag.get("name")
             tag_id = tag.get("id")
             if name and isinstance(tag_id, int):
                 self.id_tags[name] = tag_id
 
-    def get_document_types(self, **filters) -> list[dict]:
-        return self.get("/api/document_types/", params=filters)
-
-    def get_documents(self, **filters) -> list[dict]:
-        return self.get("/api/documents/", params=filters)
-
-    def get_document(self, doc_id: int) -> dict:
-        return self.get(f"/api/documents/{doc_id}/")
-
-    def download_document(self, doc_id: int) -> bytes:
-        return self.get(f"/api/documents/{doc_id}/download/", parse_json=False)
-
-    def upload_document(
-        self,
-        file_path: str | Path,
-        doc_data: DocumentData,
-    ) -> dict:
-        file_path = Path(file_path)
-
+    def _upload_data(self, file_path: Path, doc_data: DocumentData) -> dict:
         if not file_path.is_file():
             logger.error(f"PaperlessClient.py/upload_document: Path doesn't exist: {file_path}")
             raise FileNotFoundError(file_path)
@@ -138,28 +163,8 @@ class PaperlessClient(APIClient):
             raise ValueError("Wrong document_type")
 
         data["document_type"] = self.id_document_types[data["document_type"]]
+        return data
 
-        with file_path.open("rb") as fh:
-            files = {"document": (file_path.name, fh, "application/pdf")}
-            # logger.debug(f"PaperlessClient/upload: Data sended: {data}")
-            return self.post(
-                "/api/documents/post_document/",
-                data=data,
-                files=files,
-            )
-
-    def get_tags(self, page: int) -> list[dict]:
-        return self.get(f"/api/tags/?page={page}&full_perms=true")
-    
-    def get_custom_fields(self) -> list[dict]:
-        return self.get("/api/custom_fields/")
-
-    def get_correspondents(self) -> list[dict]:
-        return self.get("/api/correspondents/")
-
-    def search_documents(self, query: str, **extra_filters) -> list[dict]:
-        return self.list_documents(q=query, **extra_filters)
-    
     def build_query_custom_fields(self, custom_fields: dict[str, Any]) -> list[dict[str, Any]]:
         resolved: list[dict[int, Any]] = []
         unknown: list[str] = []
@@ -208,6 +213,101 @@ class PaperlessClient(APIClient):
             )
         return tags_id
 
+    def _metadata_payload(self, metadata: dict[str, Any]) -> dict:
+        payload = {}
+
+        if metadata["custom_fields"]:
+            payload["custom_fields"] = self.build_query_custom_fields(metadata["custom_fields"])
+        if metadata["tags"]:
+            payload["tags"] = self.prepare_tags_list(metadata["tags"])
+
+        return payload
+
+
+class PaperlessClient(PaperlessBase, APIClient):
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        token: str,
+        verify_ssl: bool | str = True,
+        **kwargs,
+    ) -> None:
+        headers = {"Authorization": f"Token {token}"}
+        super().__init__(base_url=base_url, headers=headers, **kwargs)
+        self.verify_ssl = verify_ssl
+        self.init_custom_fields()
+        self.init_document_types()
+        self.init_tags()
+
+        logger.info("api/client/PaperlessClient: PP Init correctly.")
+
+    def init_custom_fields(self):
+        self._load_custom_fields(self.get_custom_fields())
+
+    def init_document_types(self):
+        self._load_document_types(self.get_document_types())
+
+    def init_tags(self):
+        page = 1
+        response = self.get_tags(page)
+        if not self._is_listing(response, "Tags"):
+            return
+            
+        tags_list = []
+
+        while  isinstance(response.get("next", None), str):
+            response = self.get_tags(page)
+            if isinstance(response, dict) and "results" in response:
+                tags_list += response.get("results", [])
+            page += 1
+
+        if isinstance(response, dict) and "results" in response:
+            tags_list += response.get("results", [])
+
+        self._load_tags(tags_list)
+
+    def get_document_types(self, **filters) -> list[dict]:
+        return self.get("/api/document_types/", params=filters)
+
+    def get_documents(self, **filters) -> list[dict]:
+        return self.get("/api/documents/", params=filters)
+
+    def get_document(self, doc_id: int) -> dict:
+        return self.get(f"/api/documents/{doc_id}/")
+
+    def download_document(self, doc_id: int) -> bytes:
+        return self.get(f"/api/documents/{doc_id}/download/", parse_json=False)
+
+    def upload_document(
+        self,
+        file_path: str | Path,
+        doc_data: DocumentData,
+    ) -> dict:
+        file_path = Path(file_path)
+        data = self._upload_data(file_path, doc_data)
+
+        with file_path.open("rb") as fh:
+            files = {"document": (file_path.name, fh, "application/pdf")}
+            # logger.debug(f"PaperlessClient/upload: Data sended: {data}")
+            return self.post(
+                "/api/documents/post_document/",
+                data=data,
+                files=files,
+            )
+
+    def get_tags(self, page: int) -> list[dict]:
+        return self.get(f"/api/tags/?page={page}&full_perms=true")
+    
+    def get_custom_fields(self) -> list[dict]:
+        return self.get("/api/custom_fields/")
+
+    def get_correspondents(self) -> list[dict]:
+        return self.get("/api/correspondents/")
+
+    def search_documents(self, query: str, **extra_filters) -> list[dict]:
+        return self.list_documents(q=query, **extra_filters)
+    
     def update_custom_fields(
         self,
         doc_id: int,
@@ -222,53 +322,134 @@ class PaperlessClient(APIClient):
         doc_id: int,
         metadata: dict[str, Any],
     ) -> dict:
-        payload = {}
-
-        if metadata["custom_fields"]:
-            payload["custom_fields"] = self.build_query_custom_fields(metadata["custom_fields"])
-        if metadata["tags"]:
-            payload["tags"] = self.prepare_tags_list(metadata["tags"])
+        payload = self._metadata_payload(metadata)
 
         return self.patch(f"/api/documents/{doc_id}/?full_perms=true", json=payload) # TO TEST WIWITHOUT full_perm
 
+    def import_entry(
+        self,
+        entry: DocumentData,
+        *,
+        max_attempts: int = 3,
+        retry_backoff: float = 2,
+        on_retry: Callable[[], None] | None = None,
+    ) -> dict | None:
+        """
+        Download, remember and upload one entry, retrying failed downloads.
+        Returns the upload response, or None if the entry is already in the DB.
+        """
+        retry = dict(max_attempts=max_attempts, retry_backoff=retry_backoff, on_retry=on_retry)
+
+        tmp_path = self._download_entry(entry, **retry)
+        if tmp_path is None:
+            return None
+        return self._upload_entry(entry, tmp_path)
+
+    def _download_entry(self, entry: DocumentData, **retry) -> Path | None:
+        if entry.already_seen():
+            return None
+
+        def fetch() -> Path:
+            if entry.download_url:
+                self.rate_limiter.acquire(entry.download_url)
+            return create_tmp_import_file(
+                pdf_url = entry.download_url,
+                content = entry.content,
+                title = entry.title,
+                creation_date = entry.created,
+            )
+
+        tmp_path = _with_retries("download", entry.title, fetch, **retry)
+        try:
+            entry.save_to_db()
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return tmp_path
+
+    def _upload_entry(self, entry: DocumentData, tmp_path: Path) -> dict:
+        # Not retried here: a resent POST whose response was lost would consume the PDF twice.
+        # APIClient already resends it when the request never reached Paperless.
+        try:
+            return self.upload_document(tmp_path, entry)
+        finally:
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except Exception:
+                pass
+
     def import_entries(
         self,
         entries: list[DocumentData],
+        *,
+        download_workers: int = 1,
+        upload_workers: int = 1,
+        max_attempts: int = 3,
+        retry_backoff: float = 2,
     ) -> list[dict]:
-        results: list[dict] = []
-
-        for entry in entries:
-            try:
-                if not entry.already_seen():
-                    self.time_action(3)
-
-                    tmp_path = create_tmp_import_file(
-                        pdf_url = entry.download_url,
-                        content = entry.content,
-                        title = entry.title,
-                        creation_date = entry.created,
+        """
+        Download, remember and upload every entry not already in the DB.
+
+        Downloads and uploads run in separate worker pools, each request paced by
+        the rate limit of the host it goes to (the PDF host for downloads, this
+        client's rate for uploads). A slow download holds a download worker, never
+        an upload slot. Failed downloads are retried with exponential back-off
+        (uploads only by APIClient, when they never reached Paperless) and a
+        summary is logged at the end. Returns the upload responses in entry order.
+        """
+        summary = ImportSummary(total=len(entries))
+        started = time.monotonic()
+        retries_lock = threading.Lock()
+
+        def count_retry() -> None:
+            with retries_lock:
+                summary.retries += 1
+
+        retry = dict(max_attempts=max_attempts, retry_backoff=retry_backoff, on_retry=count_retry)
+
+        results: dict[int, dict] = {}
+        with ThreadPoolExecutor(download_workers, thread_name_prefix="pp-download") as downloads, \
+                ThreadPoolExecutor(upload_workers, thread_name_prefix="pp-upload") as uploads:
+            pending_downloads = {
+                downloads.submit(self._download_entry, entry, **retry): index for index, entry in enumerate(entries)
+            }
+            pending_uploads = {}
+
+            # Hand each file to the upload pool as soon as its download finishes
+            for future in as_completed(pending_downloads):
+                index = pending_downloads[future]
+                entry = entries[index]
+                try:
+                    tmp_path = future.result()
+                except Exception as exc:
+                    logger.error(
+                        "PaperlessClient/import_entries: failed to create temp doc for "
+                        "'%s' — %s",
+                        entry.title, exc,
+                        exc_info=True,
                     )
+                    summary.failures[entry.title] = str(exc)
+                    continue
 
-                    entry.save_to_db()
-
-                    try:
-                        results.append(self.upload_document(tmp_path, entry))
-                    finally:
-                        try:
-                            tmp_path.unlink(missing_ok=True)
-                        except Exception:
-                            pass
-                else:
+                if tmp_path is None:
                     logger.info("PaperlessClient/import_entries: Entry already added.")
+                    summary.skipped += 1
+                    continue
+                pending_uploads[uploads.submit(self._upload_entry, entry, tmp_path)] = index
+
+            for future in as_completed(pending_uploads):
+                index = pending_uploads[future]
+                try:
+                    results[index] = future.result()
+                    summary.imported += 1
+                except Exception as exc:
+                    logger.error(
+                        "PaperlessClient/import_entries: failed to upload '%s' — %s",
+                        entries[index].title, exc,
+                        exc_info=True,
+                    )
+                    summary.failures[entries[index].title] = str(exc)
 
-            except Exception as exc:
-                logger.error(
-                    "PaperlessClient/import_entries: failed to create temp doc for "
-                    "'%s' — %s",
-                    entry.title, exc,
-                    exc_info=True,
-                )
-                continue
-
-
-        return results
+        summary.elapsed = time.monotonic() - started
+        summary.log()
+        return [results[index] for index in sorted(results)]
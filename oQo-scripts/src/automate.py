@@ -1,45 +1,192 @@
 from api import PaperlessClient, ArxivClient
+from core import DocumentData
 
+from dataclasses import dataclass, field
 import logging
 import os
+import queue
+import threading
+import time
 from dotenv import load_dotenv
 
 logger = logging.getLogger("Logger4ScrappingoQo")
-MAX_RESULTS = 10
+PAGE_SIZE = 100
+# arXiv serves at most 2000 results per request
+ARXIV_MAX_PAGE_SIZE = 2000
 
-def automate_arxiv(tags: list[str]) -> None:
+
+@dataclass
+class HarvestProgress:
+    """Counters shared by the producer and upload threads of automate_arxiv."""
+    pages: int = 0
+    found: int = 0
+    duplicates: int = 0
+    already_added: int = 0
+    imported: int = 0
+    retries: int = 0
+    failures: dict[str, str] = field(default_factory=dict)
+    failed_tags: dict[str, str] = field(default_factory=dict)
+    started: float = field(default_factory=time.monotonic)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self.lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    @property
+    def papers_per_minute(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.imported / elapsed * 60 if elapsed else 0.0
+
+    def log(self, pending: int = 0) -> None:
+        logger.info(
+            "automate_arxiv: %d pages, %d papers found, %d duplicates, %d already added, "
+            "%d queued, %d imported, %d failed, %d retries, %d tags failed (%.1f papers/min)",
+            self.pages, self.found, self.duplicates, self.already_added,
+            pending, self.imported, len(self.failures), self.retries, len(self.failed_tags),
+            self.papers_per_minute,
+        )
+
+
+def automate_arxiv(
+    tags: list[str],
+    *,
+    page_size: int = PAGE_SIZE,
+    producers: int = 2,
+    upload_workers: int = 4,
+    queue_size: int = 200,
+    progress_interval: float = 30,
+) -> HarvestProgress:
+    """
+    Import every arXiv result of `tags` into Paperless as a pipeline.
+
+    Producer threads page through the queries (ArxivClient keeps them under
+    arXiv's rate limit), drop titles already harvested from another tag or
+    already in the DB, and feed a bounded queue. Upload workers drain it, each
+    downloading, remembering and uploading one paper at a time, so paging and
+    uploading overlap. A full queue holds the producers back. Progress is logged
+    every progress_interval seconds.
+    """
     logger.debug("Start automate_arxiv")
 
-    sent_titles: set[str] = set()
+    if page_size < 1:
+        raise ValueError(f"page_size must be at least 1, got {page_size}")
+    if page_size > ARXIV_MAX_PAGE_SIZE:
+        logger.warning("automate_arxiv: page_size %d capped to %d", page_size, ARXIV_MAX_PAGE_SIZE)
+        page_size = ARXIV_MAX_PAGE_SIZE
 
     load_dotenv()
     paperless_url   = os.getenv("PAPERLESS_URL")
     paperless_token = os.getenv("PAPERLESS_TOKEN")
 
-    arxiv = ArxivClient(idle_time=1)
-    pp    = PaperlessClient(base_url=paperless_url, token=paperless_token)
+    arxiv = ArxivClient()
+    pp    = PaperlessClient(base_url=paperless_url, token=paperless_token, pool_size=upload_workers)
 
-    total_imported = 0
+    progress = HarvestProgress()
+    sent_titles: set[str] = set()
+    pending_tags: queue.Queue[str] = queue.Queue()
+    for tag in tags:
+        pending_tags.put(tag)
+    entries: queue.Queue[DocumentData | None] = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def is_new(doc: DocumentData) -> bool:
+        with progress.lock:
+            if doc.title in sent_titles:
+                progress.duplicates += 1
+                return False
+            sent_titles.add(doc.title)
+        if doc.already_seen():
+            progress.count("already_added")
+            return False
+        return True
+
+    def produce() -> None:
+        while not stop.is_set():
+            try:
+                tag = pending_tags.get_nowait()
+            except queue.Empty:
+                return
 
-    try:
-        for tag in tags:
             start = 0
-            while True:
-                response = arxiv.search(tag, max_results=MAX_RESULTS, start=start)
-                if not response:
-                    break
+            try:
+                while not stop.is_set():
+                    response = arxiv.search(tag, max_results=page_size, start=start)
+                    progress.count("pages")
+                    progress.count("found", len(response))
+
+                    for doc in response:
+                        if is_new(doc):
+                            entries.put(doc)
 
-                fresh = [doc for doc in response if doc.title not in sent_titles]
-                if fresh:
-                    pp.import_entries(fresh)
-                    sent_titles.update(doc.title for doc in fresh)
-                    total_imported += len(fresh)
+                    # A short page is the last one
+                    if len(response) < page_size:
+                        break
+                    start += page_size
+            except Exception as exc:
+                # Failed requests raise, so a tag never ends early as if it were exhausted
+                logger.error("automate_arxiv: stopped paging '%s' at %d — %s", tag, start, exc)
+                with progress.lock:
+                    progress.failed_tags[tag] = f"at {start}: {exc}"
 
-                start += MAX_RESULTS
+    def upload() -> None:
+        while (doc := entries.get()) is not None:
+            if stop.is_set():
+                continue
+            try:
+                response = pp.import_entry(doc, on_retry=lambda: progress.count("retries"))
+            except Exception as exc:
+                logger.error("automate_arxiv: failed to import '%s' — %s", doc.title, exc)
+                with progress.lock:
+                    progress.failures[doc.title] = str(exc)
+                continue
+            progress.count("imported" if response is not None else "already_added")
+
+    def wait(threads: list[threading.Thread], deadline: float) -> float:
+        """Join threads, logging progress every progress_interval seconds"""
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(timeout=max(0.1, deadline - time.monotonic()))
+                if time.monotonic() >= deadline:
+                    progress.log(entries.qsize())
+                    deadline += progress_interval
+        return deadline
+
+    producer_threads = [
+        threading.Thread(target=produce, name=f"arxiv-producer-{i}", daemon=True)
+        for i in range(producers)
+    ]
+    upload_threads = [
+        threading.Thread(target=upload, name=f"arxiv-upload-{i}", daemon=True)
+        for i in range(upload_workers)
+    ]
+    for thread in producer_threads + upload_threads:
+        thread.start()
+
+    try:
+        deadline = wait(producer_threads, time.monotonic() + progress_interval)
+        for _ in upload_threads:
+            entries.put(None)
+        wait(upload_threads, deadline)
 
     except KeyboardInterrupt:
         logger.info("Stopped automate_arxiv")
+        # Producers stop paging and workers skip what is still queued
+        stop.set()
+        for _ in upload_threads:
+            try:
+                entries.put_nowait(None)
+            except queue.Full:
+                pass
 
-    logger.info("Imported %d new documents from arXiv", total_imported)
+    progress.log()
+    for title, error in progress.failures.items():
+        logger.warning("automate_arxiv: failed '%s' — %s", title, error)
+    for tag, error in progress.failed_tags.items():
+        logger.warning("automate_arxiv: paging '%s' failed %s", tag, error)
+    logger.info("Imported %d new documents from arXiv", progress.imported)
     logger.info("Unique titles in memory: %d", len(sent_titles))
+    logger.info("arXiv requests: %s", arxiv.get_stats())
+    logger.info("Paperless requests: %s", pp.get_stats())
 
+    return progress
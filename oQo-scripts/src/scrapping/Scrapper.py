@@ -6,25 +6,26 @@ from playwright.sync_api import sync_playwright
 
 from config import get_logger
 from core import DocumentData
-from api import Sleeper
+from api import RateLimiter, rate_limiter as shared_rate_limiter
 
 logger = get_logger("Logger4ScrappingoQo")
 
-class Scrapper(Sleeper):
+class Scrapper:
     categories_data: dict[str, any]
+    # One page every 4 seconds plus up to 2 seconds of jitter, so we do not look like a bot
+    rate: float = 1 / 4
+    jitter: float = 2
 
-    def __init__(self, min_page: int, max_page:int, base_url:str, **kwargs):
-        super().__init__(
-            idle_time=5,
-            random_idle_time=True
-        )
-        
+    def __init__(self, min_page: int, max_page:int, base_url:str, rate_limiter: Optional[RateLimiter] = None, **kwargs):
         self.min_page = min_page
         self.max_page = max_page
         self.base_url = base_url
 
+        self.rate_limiter = rate_limiter or shared_rate_limiter
+        self.rate_limiter.limit(base_url, self.rate, jitter=self.jitter)
+
     def get_html(self, url: str, timeout: float = 20_000)-> str:
-        self.time_action()
+        self.rate_limiter.acquire(url)
 
         logger.info(f"Scrapper: Opening {url}")
 
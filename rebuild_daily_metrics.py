@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Rebuild daily_metrics and the analytics rollups from the raw event tables
+Repairs drift or backfills a date range. Defaults to the last 30 days.
+
+Usage:
+    python rebuild_daily_metrics.py [--start YYYY-MM-DD] [--end YYYY-MM-DD]
+"""
+import os
+import sys
+import argparse
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "KDB-importer", "backend"))
+
+from arxiv_importer.core.metrics_tracker import metrics_tracker  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild daily_metrics and analytics rollups for a date range")
+    parser.add_argument("--start", type=date.fromisoformat,
+                        default=date.today() - timedelta(days=30), help="Start date (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat,
+                        default=date.today(), help="End date (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    if args.start > args.end:
+        parser.error("--start must be before --end")
+
+    try:
+        rebuilt = metrics_tracker.rebuild_daily_metrics(args.start, args.end)
+        print(f"✅ Rebuilt {rebuilt} day(s) of metrics from {args.start} to {args.end}")
+        rebuilt = metrics_tracker.rebuild_analytics_rollups(args.start, args.end)
+        print(f"✅ Rebuilt {rebuilt} day(s) of analytics rollups from {args.start} to {args.end}")
+    finally:
+        metrics_tracker.close()
+
+
+if __name__ == "__main__":
+    main()
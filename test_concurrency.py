@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Concurrency Load Test
+Checks that concurrent /search and /keywords/extract calls overlap instead of
+being serialized behind one another on the backend event loop.
+"""
+
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor
+
+# Configuration
+KDB_BACKEND_URL = "http://localhost:8000/api"
+CONCURRENT_REQUESTS = 8
+
+SEARCH_PAYLOAD = {
+    "query": "quantum error correction",
+    "sort_by": "relevance",
+    "max_results": 5
+}
+
+SAMPLE_PAPER = {
+    "id": "2301.12345v1",
+    "title": "Surface Code Quantum Error Correction on Superconducting Qubits",
+    "authors": ["Test Author"],
+    "summary": "We study quantum error correction with surface codes on a quantum processor "
+               "and benchmark decoherence, entanglement and quantum gate fidelities.",
+    "pdf_url": "https://arxiv.org/pdf/2301.12345v1",
+    "published": "2023-01-29T00:00:00",
+    "updated": "2023-01-29T00:00:00"
+}
+
+
+def _timed_post(endpoint, payload):
+    """POST to an endpoint and return (status_code, elapsed_seconds)"""
+    start = time.perf_counter()
+    response = requests.post(
+        f"{KDB_BACKEND_URL}{endpoint}", json=payload, timeout=300)
+    return response.status_code, time.perf_counter() - start
+
+
+def _build_jobs():
+    jobs = []
+    for i in range(CONCURRENT_REQUESTS):
+        if i % 2 == 0:
+            jobs.append(("/search", SEARCH_PAYLOAD))
+        else:
+            jobs.append(("/keywords/extract", {"paper_data": SAMPLE_PAPER}))
+    return jobs
+
+
+def test_requests_do_not_serialize():
+    """Fire mixed /search and /keywords/extract calls at once and compare wall time"""
+    print("⚡ Testing concurrent /search and /keywords/extract...")
+
+    jobs = _build_jobs()
+
+    # Baseline: the same calls one after another
+    sequential_start = time.perf_counter()
+    sequential = [_timed_post(endpoint, payload) for endpoint, payload in jobs]
+    sequential_wall = time.perf_counter() - sequential_start
+
+    # Concurrent: all calls in flight together
+    concurrent_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CONCURRENT_REQUESTS) as executor:
+        concurrent = list(executor.map(lambda job: _timed_post(*job), jobs))
+    concurrent_wall = time.perf_counter() - concurrent_start
+
+    failures = [status for status, _ in sequential +
+                concurrent if status != 200]
+    if failures:
+        print(f"❌ {len(failures)} requests failed: {failures}")
+        return False
+
+    slowest = max(elapsed for _, elapsed in concurrent)
+    speedup = sequential_wall / concurrent_wall if concurrent_wall else 0.0
+
+    print(f"   Sequential wall time: {sequential_wall:.2f}s")
+    print(f"   Concurrent wall time: {concurrent_wall:.2f}s")
+    print(f"   Slowest concurrent request: {slowest:.2f}s")
+    print(f"   Speedup: {speedup:.1f}x")
+
+    # Serialized handling would make the concurrent run as slow as the sequential one
+    if concurrent_wall < sequential_wall * 0.6:
+        print("✅ Requests overlap — the event loop is not blocked")
+        return True
+
+    print("❌ Requests appear to be serialized")
+    return False
+
+
+def main():
+    """Run the concurrency load test"""
+    print("🚀 Backend Concurrency Load Test")
+    print("=" * 50)
+
+    ok = test_requests_do_not_serialize()
+
+    print("\n" + "=" * 50)
+    print("🎉 Concurrency test passed!" if ok else "⚠️ Concurrency test failed")
+
+
+if __name__ == "__main__":
+    main()
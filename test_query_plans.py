@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Metrics Query Plan Regression Test
+Seeds synthetic metrics into a scratch schema and runs every MetricsTracker
+read query under EXPLAIN, failing if any metrics table is read without an index.
+
+Sequential scans are disabled for the session, so the planner falls back to a
+sequential scan only when no usable index exists; the check is therefore stable
+regardless of how much data is seeded. Queries bounded by date must also prune
+the monthly partitions down to the months they cover.
+
+Uses the PG_* environment variables (see env.template). The scratch schema is
+dropped afterwards.
+"""
+
+import os
+import re
+import sys
+import random
+from contextlib import contextmanager
+from datetime import datetime, timedelta, date
+
+import psycopg2
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "KDB-importer", "backend"))
+
+from arxiv_importer.core.metrics_tracker import (  # noqa: E402
+    metrics_tracker, ActivityEvent, KeywordExtraction, PaperlessUpload
+)
+
+# Configuration
+SCHEMA = "query_plan_test"
+EVENTS = int(os.getenv("PLAN_TEST_EVENTS", "20000"))
+DAYS = 90
+SEED = 42
+
+CHECKED_TABLES = {
+    "activity_events", "keyword_extractions", "paperless_uploads", "daily_metrics",
+    "keyword_daily_counts", "domain_daily_counts", "upload_daily_stats",
+}
+
+KEYWORDS = [f"keyword-{i}" for i in range(500)]
+DOMAINS = ["quantum_computing", "quantum_cryptography", "quantum_communication",
+           "quantum_algorithms", "quantum_hardware", "quantum_ml"]
+
+
+class ExplainingCursor:
+    """Cursor wrapper that records the EXPLAIN plan of every SELECT before running it"""
+
+    def __init__(self, cursor, plans):
+        self._cursor = cursor
+        self._plans = plans
+
+    def execute(self, sql, params=None):
+        # execute_values() sends pre-rendered bytes; those are writes, never SELECTs
+        if isinstance(sql, str) and sql.lstrip().upper().startswith("SELECT"):
+            self._cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+            row = self._cursor.fetchone()
+            plan = row["QUERY PLAN"] if isinstance(row, dict) else row[0]
+            self._plans.append((" ".join(sql.split()), plan[0]["Plan"]))
+        return self._cursor.execute(sql, params)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+        return False
+
+
+class ExplainingConnection:
+    def __init__(self, conn, plans):
+        self._conn = conn
+        self._plans = plans
+
+    def cursor(self, *args, **kwargs):
+        return ExplainingCursor(self._conn.cursor(*args, **kwargs), self._plans)
+
+
+def _scans(node):
+    """Yield (node type, table, relation) for every scan node in a plan tree"""
+    if "Relation Name" in node:
+        # Monthly partitions (<table>_YYYY_MM) count as their parent table
+        relation = node["Relation Name"]
+        yield node["Node Type"], re.sub(r"_\d{4}_\d{2}$", "", relation), relation
+    for child in node.get("Plans", []):
+        yield from _scans(child)
+
+
+def _seed(conn):
+    """Create the schema objects and write synthetic events through MetricsTracker"""
+    # Partitions known to exist in the public schema do not exist here
+    metrics_tracker._partition_months.clear()
+    with conn.cursor() as cur:
+        cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        cur.execute(f"CREATE SCHEMA {SCHEMA}")
+        cur.execute(f"SET search_path TO {SCHEMA}, public")
+        metrics_tracker._create_tables(cur)
+        metrics_tracker._apply_migrations(cur)
+    conn.commit()
+
+    rng = random.Random(SEED)
+    now = datetime.now()
+    records = []
+    for i in range(EVENTS):
+        timestamp = (now - timedelta(seconds=rng.randint(0, DAYS * 86400))).isoformat()
+        records.append(ActivityEvent(
+            timestamp=timestamp,
+            event_type=rng.choice(["import", "search", "paperless_upload"]),
+            title=f"Plan test event {i}",
+            status=rng.choice(["success", "success", "error"]),
+            details={"paper_title": f"Plan test paper {i % 2000}"}
+        ))
+        records.append(KeywordExtraction(
+            timestamp=timestamp,
+            paper_title=f"Plan test paper {i % 2000}",
+            primary_keywords=rng.sample(KEYWORDS, 5),
+            secondary_keywords=[],
+            technical_terms=[],
+            domain_tags=rng.sample(DOMAINS, 2),
+            confidence_score=round(rng.random(), 2),
+            extraction_method="plan_test"
+        ))
+        if i % 4 == 0:
+            records.append(PaperlessUpload(
+                timestamp=timestamp,
+                paper_title=f"Plan test paper {i % 2000}",
+                task_id=f"plan-test-{i}",
+                status="success",
+                metadata={}
+            ))
+
+    for start in range(0, len(records), 1000):
+        metrics_tracker._write_batch(records[start:start + 1000])
+
+    metrics_tracker.resolve_paperless_tasks([
+        {"task_id": f"plan-test-{i}", "task_status": "SUCCESS", "document_id": i,
+         "processing_seconds": rng.uniform(2, 60)}
+        for i in range(0, EVENTS // 2, 4)
+    ])
+
+    with conn.cursor() as cur:
+        for table in CHECKED_TABLES:
+            cur.execute(f"ANALYZE {table}")
+    conn.commit()
+
+
+def _cases():
+    today = date.today()
+    first_page = metrics_tracker.get_history_page("activities", today - timedelta(days=7), today, 50)
+    # (label, call, most partitions per table a query may read; None for unbounded queries)
+    return [
+        ("get_dashboard_stats", metrics_tracker.get_dashboard_stats, None),
+        ("get_dashboard_analytics", metrics_tracker.get_dashboard_analytics, None),
+        ("get_import_trends (monthly, 1 year)",
+         lambda: metrics_tracker.get_import_trends("monthly", today - timedelta(days=365)), None),
+        ("get_document_history_by_date",
+         lambda: metrics_tracker.get_document_history_by_date(today - timedelta(days=3), 50), 1),
+        ("get_history_page (second page)",
+         lambda: metrics_tracker.get_history_page(
+             "activities", today - timedelta(days=7), today, 50, first_page["next_cursor"]), 2),
+        ("get_available_dates", metrics_tracker.get_available_dates, None),
+        ("get_document_summary_by_date_range",
+         lambda: metrics_tracker.get_document_summary_by_date_range(today - timedelta(days=7), today, 100), 2),
+        ("get_pending_paperless_tasks", metrics_tracker.get_pending_paperless_tasks, None),
+        ("search_keyword_extractions (one keyword)",
+         lambda: metrics_tracker.search_keyword_extractions([KEYWORDS[7]]), None),
+        ("search_keyword_extractions (all keywords, last 30 days)",
+         lambda: metrics_tracker.search_keyword_extractions(
+             KEYWORDS[3:5], "all", start_date=today - timedelta(days=30), end_date=today), 2),
+        ("search_keyword_extractions (any keyword, domain)",
+         lambda: metrics_tracker.search_keyword_extractions(KEYWORDS[3:6], "any", domains=DOMAINS[:1]), None),
+        ("search_keyword_extractions (title)",
+         lambda: metrics_tracker.search_keyword_extractions(title="paper 123"), None),
+    ]
+
+
+def main():
+    """Seed the scratch schema and check every query plan"""
+    print("🧪 Metrics Query Plan Regression Test")
+    print("=" * 60)
+
+    conn = psycopg2.connect(**metrics_tracker.db_config)
+    plans = []
+
+    @contextmanager
+    def scratch_connection():
+        try:
+            yield ExplainingConnection(conn, plans)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    # Route every MetricsTracker query through the scratch schema
+    original_get_connection = metrics_tracker._get_connection
+    metrics_tracker._get_connection = scratch_connection
+    failures = 0
+    try:
+        print(f"🌱 Seeding {EVENTS} events of each kind over {DAYS} days...")
+        _seed(conn)
+        with conn.cursor() as cur:
+            cur.execute("SET enable_seqscan = off")
+        metrics_tracker._trend_cache.clear()
+
+        for label, run, max_partitions in _cases():
+            plans.clear()
+            run()
+            problems = []
+            if not plans:
+                problems.append("no queries were captured")
+            for sql, plan in plans:
+                scans = [scan for scan in _scans(plan) if scan[1] in CHECKED_TABLES]
+                if not scans:
+                    problems.append(f"no metrics table scanned: {sql[:80]}")
+                for node, table, relation in scans:
+                    if node == "Seq Scan":
+                        problems.append(f"sequential scan on {relation}: {sql[:80]}")
+                # Date-bounded queries must prune to the months they cover
+                months = {relation for _, table, relation in scans if table != relation}
+                if max_partitions is not None and len(months) > max_partitions:
+                    problems.append(f"{len(months)} partitions scanned, expected at most "
+                                    f"{max_partitions}: {sql[:80]}")
+
+            if problems:
+                failures += 1
+                print(f"❌ {label}")
+                for problem in problems:
+                    print(f"   {problem}")
+            else:
+                print(f"✅ {label} ({len(plans)} queries, all indexed)")
+    finally:
+        metrics_tracker._get_connection = original_get_connection
+        metrics_tracker._partition_months.clear()
+        conn.rollback()
+        with conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.commit()
+        conn.close()
+        metrics_tracker.close()
+
+    print("=" * 60)
+    if failures:
+        print(f"❌ {failures} quer{'y' if failures == 1 else 'ies'} without index support")
+        sys.exit(1)
+    print("🎉 Every MetricsTracker query uses an index")
+
+
+if __name__ == "__main__":
+    main()
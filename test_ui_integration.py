@@ -72,6 +72,30 @@ def test_frontend_accessibility():
         return False
 
 
+def test_dashboard_stats_etag():
+    """Two /dashboard/stats calls with no data change must revalidate to a 304"""
+    print("🏷️  Testing Dashboard Stats ETag...")
+
+    first = requests.get(f"{KDB_BACKEND_URL}/dashboard/stats", timeout=10)
+    second = requests.get(f"{KDB_BACKEND_URL}/dashboard/stats", timeout=10)
+    etag = first.headers.get("ETag")
+    if first.status_code != 200 or not etag:
+        print(f"❌ Dashboard stats failed: {first.status_code}")
+        return False
+    if second.headers.get("ETag") != etag:
+        print(f"❌ ETag changed without a data change: {etag} -> {second.headers.get('ETag')}")
+        return False
+
+    revalidated = requests.get(f"{KDB_BACKEND_URL}/dashboard/stats",
+                               headers={"If-None-Match": etag}, timeout=10)
+    if revalidated.status_code != 304:
+        print(f"❌ Revalidation returned {revalidated.status_code}, expected 304")
+        return False
+
+    print(f"✅ Dashboard stats ETag is stable: {etag}")
+    return True
+
+
 def verify_paperless_document(task_id):
     """Verify the document was uploaded to Paperless"""
     print("🔍 Verifying Paperless Document...")
@@ -88,6 +112,9 @@ def main():
     print("🚀 Starting UI Integration Tests")
     print("=" * 50)
 
+    # Run before the import below, which changes the data and so the ETag
+    etag_ok = test_dashboard_stats_etag()
+
     # Test 1: Backend API
     paper_data = test_backend_api()
     if not paper_data:
@@ -114,6 +141,7 @@ def main():
     print("✅ Backend API: Working")
     print("✅ Paperless Upload: Working")
     print("✅ Frontend: Accessible" if frontend_ok else "⚠️  Frontend: Not accessible")
+    print("✅ Dashboard ETag: Stable" if etag_ok else "❌ Dashboard ETag: Changes between calls")
     print("✅ End-to-End Flow: Complete")
 
     print("\n🌐 Access Points:")